@@ -0,0 +1,211 @@
+"""
+Concurrent abstract fetching for Google Scholar publication pages.
+
+Publication pages are opened through a small pool of reusable Playwright
+pages (or concurrent slots of one HTTP client for `--engine http`), so N
+detail pages are in flight at once instead of one after another.
+Requests to the same host are paced by a shared AdaptiveRateController
+(rate_control) rather than by fixed sleeps before every row.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urljoin
+
+
+NO_ABSTRACT = "(No abstract found)"
+CAPTCHA_BLOCKED = "(CAPTCHA blocked - solve manually)"
+FETCH_FAILED = "(Abstract fetch failed)"
+
+
+class PagePool:
+    """
+    Pool of at most `size` Playwright pages that are reused between fetches.
+
+    Pages are created on first demand, so a pool that is never used (e.g.
+    every abstract came from the cache) never opens a page. A page (and its
+    browser context) is recycled after `max_uses` fetches, and a page whose
+    fetch failed is health-checked before it is handed out again. How long
+    callers waited for a free page is recorded for `stats()`.
+    """
+
+    def __init__(self, page_factory, size=4, max_uses=50, health_timeout=5):
+        self.page_factory = page_factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.health_timeout = health_timeout
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle = []
+        self._live = set()
+        self._uses = {}       # page -> number of fetches done with it
+        self._suspect = set()  # pages whose last fetch raised
+
+        self.acquires = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.created = 0
+        self.recycled = 0
+        self.unhealthy = 0
+
+    async def is_healthy(self, page):
+        """Cheap liveness probe: page still open and able to run a script"""
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), self.health_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _get(self):
+        while self._idle:
+            page = self._idle.pop()
+            if page not in self._suspect or await self.is_healthy(page):
+                self._suspect.discard(page)
+                return page
+            self.unhealthy += 1
+            await self._discard(page)
+
+        page = await self.page_factory()
+        self.created += 1
+        self._live.add(page)
+        self._uses[page] = 0
+        return page
+
+    async def _discard(self, page):
+        self._live.discard(page)
+        self._uses.pop(page, None)
+        self._suspect.discard(page)
+        # Every pooled page owns its browser context, so close that as well
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page from the pool for the duration of the block"""
+        start = time.monotonic()
+        await self._slots.acquire()
+        waited = time.monotonic() - start
+        self.acquires += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+        page = None
+        try:
+            page = await self._get()
+            yield page
+        except Exception:
+            if page is not None:
+                self._suspect.add(page)
+            raise
+        finally:
+            if page is not None:
+                await self._release(page)
+            self._slots.release()
+
+    async def _release(self, page):
+        self._uses[page] = self._uses.get(page, 0) + 1
+        if self.max_uses and self._uses[page] >= self.max_uses:
+            # Start over with a fresh context before the old one piles up cookies and state
+            self.recycled += 1
+            await self._discard(page)
+        else:
+            self._idle.append(page)
+
+    def stats(self):
+        return {
+            "acquires": self.acquires,
+            "wait_avg_ms": round(1000 * self.wait_total / self.acquires, 1) if self.acquires else 0.0,
+            "wait_max_ms": round(1000 * self.wait_max, 1),
+            "created": self.created,
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy,
+        }
+
+    def report(self):
+        if not self.acquires:
+            return
+        stats = self.stats()
+        print(
+            f"🧰 Page pool: {stats['acquires']} fetches on {stats['created']} pages "
+            f"({stats['recycled']} recycled, {stats['unhealthy']} unhealthy replaced), "
+            f"wait for a free page avg {stats['wait_avg_ms']} ms / max {stats['wait_max_ms']} ms"
+        )
+
+    async def close(self):
+        for page in list(self._live):
+            await self._discard(page)
+        self._idle = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def publication_url(pub_href, base_url):
+    """Resolve a (usually relative) view_citation href against the profile URL"""
+    if not pub_href:
+        return None
+    return urljoin(base_url, pub_href)
+
+
+async def fetch_abstracts(pool, hrefs, extract, base_url, rate_limiter=None, cache=None, on_result=None):
+    """
+    Fetch abstracts for every href using all pages of the pool at once.
+
+    `extract(page, url, pub_num)` navigates the given page and returns the
+    abstract text. Results are returned in the same order as `hrefs`.
+    When a `PageCache` is given, cached hrefs are answered without opening
+    a page and freshly extracted abstracts are stored for the next run.
+    Pages that raised come back as FETCH_FAILED. Errors and CAPTCHA blocks
+    are reported to the `rate_limiter` (an AdaptiveRateController); only
+    `extract` knows when the page was read, so it records the latency of
+    successful fetches itself.
+    `on_result(index, abstract)` is called as soon as each abstract is done
+    (failed fetches excluded), e.g. to checkpoint it.
+    """
+    async def fetch_one(pub_num, href):
+        abstract, done = await fetch_abstract(pub_num, href)
+        if on_result and done:
+            on_result(pub_num - 1, abstract)
+        return abstract
+
+    async def fetch_abstract(pub_num, href):
+        """Return (abstract text, whether the page was actually read)"""
+        url = publication_url(href, base_url)
+        if not url:
+            return NO_ABSTRACT, True
+
+        if cache:
+            cached = cache.get(url)
+            if cached is not None:
+                return cached, True
+
+        # Errors propagate out of the borrow so the pool can health-check the page
+        try:
+            async with pool.page() as page:
+                if rate_limiter:
+                    await rate_limiter.wait(url)
+                abstract = await extract(page, url, pub_num)
+        except Exception as e:
+            print(f"    ⚠️  Could not fetch abstract {pub_num}: {str(e)[:100]}")
+            if rate_limiter:
+                rate_limiter.record(url, outcome="error")
+            return FETCH_FAILED, False
+
+        # Blocked pages say nothing about the publication, so never keep them
+        if abstract == CAPTCHA_BLOCKED:
+            if rate_limiter:
+                rate_limiter.record(url, outcome="blocked")
+            return abstract, False
+        if cache:
+            cache.put(url, abstract)
+        return abstract, True
+
+    return await asyncio.gather(
+        *(fetch_one(i, href) for i, href in enumerate(hrefs, 1))
+    )
@@ -0,0 +1,254 @@
+"""
+HTTP API serving the publication store to the React DataExplorer.
+
+A small aiohttp application over the PublicationStore that the scrapers
+write to. Publication lists are filtered, sorted and paginated by SQLite,
+so the frontend only downloads the page it shows. Every JSON response
+carries an ETag derived from the store version and the request (and the
+date, for metrics and gains), and a request with a matching If-None-Match
+gets `304 Not Modified` after one cheap version query instead of running
+the request's own query.
+
+SQLite calls block, so they run in a small thread pool (StoreThreads) whose
+threads each have their own connection; a slow metrics request does not
+hold up the event loop or the other clients.
+
+Endpoints:
+    GET /api/authors                   every author with totals and metrics
+    GET /api/authors/{author}          profile, metrics, per-year counts
+    GET /api/publications              ?author=&year=&year_from=&year_to=&q=&syntax=&sort=&page=&page_size=
+    GET /api/gains                     ?weeks=&author=&limit= citations gained per author and publication
+
+Usage:
+    python api_server.py --port 8080
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+
+from config import __version__
+from snapshots import day_number
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+STORE_THREADS = 4
+
+
+class StoreThreads:
+    """
+    Thread pool that runs store queries off the event loop. Every thread
+    opens its own PublicationStore on the same file (SQLite connections must
+    stay in the thread that made them; WAL lets them read concurrently).
+    """
+
+    def __init__(self, path, workers=STORE_THREADS):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.path = path
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="store")
+
+    def _store(self):
+        from store import PublicationStore
+
+        if getattr(self._local, "store", None) is None:
+            self._local.store = PublicationStore(self.path)
+        return self._local.store
+
+    async def run(self, fn):
+        """Result of fn(store), computed in a pool thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: fn(self._store()))
+
+    def close(self):
+        # A thread's connection is closed with its thread-local data when the thread exits
+        self._executor.shutdown(wait=True)
+
+
+def int_param(request, name, default=None, minimum=None, maximum=None):
+    """Integer query parameter; raises 400 Bad Request for anything else"""
+    from aiohttp import web
+
+    value = request.query.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{name} must be an integer") from None
+    if minimum is not None:
+        number = max(minimum, number)
+    if maximum is not None:
+        number = min(maximum, number)
+    return number
+
+
+def etag_for(version, request, daily=False):
+    """
+    ETag of a response: the store's `version` plus the request path and query,
+    and with `daily` today's day number for responses that change with the date
+    """
+    key = f"{version}|{request.path_qs}"
+    if daily:
+        key += f"|{day_number()}"
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+async def conditional_json(request, compute, daily=False):
+    """JSON response of compute(store), or 304 if the client's If-None-Match is current"""
+    from aiohttp import web
+
+    def respond(store):
+        """(ETag, JSON body or None for 304), computed in a store thread"""
+        etag = etag_for(store.version(), request, daily)
+        if etag in request.headers.get("If-None-Match", ""):
+            return etag, None
+        return etag, json.dumps(compute(store), ensure_ascii=False, separators=(",", ":"))
+
+    etag, body = await request.app["store_threads"].run(respond)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if body is None:
+        return web.Response(status=304, headers=headers)
+    return web.Response(text=body, content_type="application/json", headers=headers)
+
+
+# Author metrics (m-quotient) depend on the current year and gains on today, so their ETags change daily
+async def list_authors(request):
+    return await conditional_json(request, lambda store: {"authors": store.authors()}, daily=True)
+
+
+async def get_author(request):
+    from aiohttp import web
+
+    def compute(store):
+        summary = store.author_summary(request.match_info["author"])
+        if summary is None:
+            raise web.HTTPNotFound(text="Unknown author")
+        return summary
+
+    return await conditional_json(request, compute, daily=True)
+
+
+async def list_publications(request):
+    from aiohttp import web
+
+    page = int_param(request, "page", 1, minimum=1)
+    page_size = int_param(request, "page_size", DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+    filters = {
+        "author": request.query.get("author") or None,
+        "year": int_param(request, "year"),
+        "year_from": int_param(request, "year_from"),
+        "year_to": int_param(request, "year_to"),
+        "search": request.query.get("q") or None,
+        "sort": request.query.get("sort", "-citations"),
+        # `q` is plain text unless FTS5 query syntax is asked for explicitly
+        "raw_search": request.query.get("syntax") == "fts",
+    }
+
+    def compute(store):
+        try:
+            total, publications = store.query_publications(
+                **filters, limit=page_size, offset=(page - 1) * page_size
+            )
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e)) from None
+        except sqlite3.OperationalError as e:
+            # Malformed FTS5 query in `q` with syntax=fts
+            raise web.HTTPBadRequest(text=f"Invalid search: {e}") from None
+        return {
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": (total + page_size - 1) // page_size,
+            "items": [dict(pub.to_dict(), author_name=pub.author_name) for pub in publications],
+        }
+
+    return await conditional_json(request, compute)
+
+
+async def citation_gains(request):
+    weeks = int_param(request, "weeks", 4, minimum=1)
+    limit = int_param(request, "limit", 10, minimum=1, maximum=MAX_PAGE_SIZE)
+    author = request.query.get("author") or None
+    return await conditional_json(request, lambda store: {
+        "weeks": weeks,
+        "authors": store.citation_gains(weeks, author),
+        "publications": store.publication_gains(weeks, author, limit),
+    }, daily=True)
+
+
+def create_app(store, cors_origin="*"):
+    """aiohttp application serving `store`"""
+    from aiohttp import web
+
+    @web.middleware
+    async def cors(request, handler):
+        if request.method == "OPTIONS":
+            response = web.Response()
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                response = e
+        if cors_origin:
+            response.headers["Access-Control-Allow-Origin"] = cors_origin
+            response.headers["Access-Control-Allow-Headers"] = "If-None-Match"
+            response.headers["Access-Control-Expose-Headers"] = "ETag"
+        return response
+
+    app = web.Application(middlewares=[cors])
+    app["store"] = store
+    app["store_threads"] = StoreThreads(store.path)
+
+    async def close_threads(app):
+        app["store_threads"].close()
+
+    app.on_cleanup.append(close_threads)
+    app.router.add_get("/api/authors", list_authors)
+    app.router.add_get("/api/authors/{author}", get_author)
+    app.router.add_get("/api/publications", list_publications)
+    app.router.add_get("/api/gains", citation_gains)
+    return app
+
+
+# ---------------- Main Entry Point ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the publication store to the DataExplorer")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="SQLite publication store to serve (default: <state-dir>/publications.sqlite3)"
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=str,
+        default="results",
+        help="Directory of the scrapers' results (default: results)"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument(
+        "--cors-origin",
+        type=str,
+        default="*",
+        help="Access-Control-Allow-Origin sent to the frontend; empty to disable (default: *)"
+    )
+    args = parser.parse_args(argv)
+
+    from aiohttp import web
+    from store import PublicationStore, store_path
+
+    store = PublicationStore(args.db or store_path(args.state_dir))
+    try:
+        web.run_app(create_app(store, args.cors_origin), host=args.host, port=args.port)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
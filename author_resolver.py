@@ -0,0 +1,145 @@
+"""
+Author disambiguation: pick the right profile among everyone with the name.
+
+A name search on Scholar or Scopus returns every person with a similar
+name. Instead of taking the first result, all candidates are ranked by
+
+- name similarity: accents, punctuation, word order and initials
+  ("J. A. Smith" / "John Smith") are tolerated, and the surname must match
+- affiliation: share of the affiliation hint's words in the candidate's
+  affiliation
+- topics: share of the topic hints found in the candidate's interests
+  (Scholar) or subject areas (Scopus)
+
+with the candidate's citation or document count as a small tie-breaker.
+Affiliation and topic hints come from the command line, from the author
+list (`Name | Affiliation | topic, topic`) or, for Scopus, from the Scholar
+profile chosen before. Candidates whose name is not similar enough are
+never chosen.
+
+The chosen mapping (name -> Scholar profile -> Scopus author ID) is cached
+in the PublicationStore, so later runs skip both searches.
+"""
+import math
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+
+MIN_NAME_SIMILARITY = 0.8
+AMBIGUITY_MARGIN = 0.05
+WEIGHTS = {"name": 0.6, "affiliation": 0.25, "topics": 0.15}
+POPULARITY_WEIGHT = 0.05
+
+# Words that say nothing about which institution or topic is meant
+STOPWORDS = {
+    "of", "the", "and", "for", "in", "at", "de", "la", "der", "und", "di",
+    "university", "universidad", "universite", "universitat", "universita", "institute", "department",
+    "dept", "school", "college", "faculty", "professor", "associate", "assistant", "lecturer",
+}
+
+
+def plain_text(text):
+    """Lowercase ASCII words: accents and punctuation removed"""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def name_tokens(name):
+    return plain_text(name).split()
+
+
+def content_words(text):
+    return {word for word in plain_text(text).split() if len(word) > 2 and word not in STOPWORDS}
+
+
+def _token_similarity(a, b):
+    if a == b:
+        return 1.0
+    if len(a) == 1 or len(b) == 1:
+        # An initial matches any name starting with it
+        return 0.9 if a[0] == b[0] else 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def name_similarity(query, name):
+    """0..1 similarity of two person names"""
+    query_tokens, tokens = name_tokens(query), name_tokens(name)
+    if not query_tokens or not tokens:
+        return 0.0
+    short, long = sorted((query_tokens, tokens), key=len)
+    best = [max(_token_similarity(a, b) for b in long) for a in short]
+    score = sum(best) / len(best) * (0.8 + 0.2 * len(short) / len(long))
+    # The surname is the last word of the query and has to be (nearly) present
+    surname = max(_token_similarity(query_tokens[-1], b) for b in tokens)
+    return score if surname >= 0.85 else score * 0.5
+
+
+def affiliation_similarity(hint, affiliation):
+    """Share of the hint's words found in the affiliation"""
+    wanted = content_words(hint)
+    if not wanted:
+        return 0.0
+    return len(wanted & content_words(affiliation)) / len(wanted)
+
+
+def topic_overlap(topics, interests):
+    """Share of the topics that match one of the interests"""
+    topics = [content_words(topic) for topic in topics]
+    topics = [words for words in topics if words]
+    if not topics:
+        return 0.0
+    known = set().union(*(content_words(interest) for interest in interests)) if interests else set()
+    return sum(1 for words in topics if words & known) / len(topics)
+
+
+def score_candidate(query, candidate, affiliation=None, topics=()):
+    """Score of an AuthorCandidate, with the part of every signal"""
+    parts = {"name": name_similarity(query, candidate.name)}
+    if affiliation:
+        parts["affiliation"] = affiliation_similarity(affiliation, candidate.affiliation)
+    if topics:
+        parts["topics"] = topic_overlap(topics, candidate.interests)
+    score = sum(WEIGHTS[part] * value for part, value in parts.items()) / sum(WEIGHTS[part] for part in parts)
+    # Among equally good matches, the more cited profile is the more likely one
+    popularity = min(1.0, math.log10((candidate.cited_by or 0) + 1) / 5)
+    return (1 - POPULARITY_WEIGHT) * score + POPULARITY_WEIGHT * popularity, parts
+
+
+def rank_candidates(query, candidates, affiliation=None, topics=()):
+    """[(score, parts, candidate)] best first"""
+    ranked = [(*score_candidate(query, c, affiliation, topics), c) for c in candidates]
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return ranked
+
+
+def choose_candidate(query, candidates, affiliation=None, topics=(), label="Scholar"):
+    """
+    Best AuthorCandidate for `query`, or None if no candidate's name is
+    similar enough. Prints the ranking and warns about close calls.
+    """
+    ranked = rank_candidates(query, candidates, affiliation, topics)
+    eligible = [item for item in ranked if item[1]["name"] >= MIN_NAME_SIMILARITY]
+    if len(ranked) > 1:
+        print(f"  👥 {len(ranked)} {label} candidates for '{query}':")
+        for score, parts, candidate in ranked[:5]:
+            details = ", ".join(f"{part} {value:.2f}" for part, value in parts.items())
+            print(f"     {score:.2f}  {candidate.name} — {candidate.affiliation or 'no affiliation'} ({details})")
+    if not eligible:
+        return None
+    if len(eligible) > 1 and eligible[0][0] - eligible[1][0] < AMBIGUITY_MARGIN:
+        print(f"  ⚠️  '{eligible[0][2].name}' and '{eligible[1][2].name}' are close; "
+              f"pass an affiliation or topics to tell them apart")
+    return eligible[0][2]
+
+
+def parse_author_entry(entry):
+    """(name or URL, affiliation, topics) of an author list line `Name | Affiliation | topic, topic`"""
+    parts = [part.strip() for part in entry.split("|")]
+    topics = [topic.strip() for topic in parts[2].split(",") if topic.strip()] if len(parts) > 2 else []
+    return parts[0], (parts[1] if len(parts) > 1 else None) or None, topics
+
+
+def mapping_key(name, affiliation=None):
+    """Cache key of a name search: the plain name plus the affiliation hint"""
+    return f"{plain_text(name)}|{plain_text(affiliation or '')}"
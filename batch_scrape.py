@@ -0,0 +1,220 @@
+"""
+Batch scraping of many Google Scholar authors in one process.
+
+Author names or profile URLs are read from a text file (one per line, lines
+starting with '#' are ignored). A name can be followed by the author's
+affiliation and topics, `Name | Affiliation | topic, topic`, to pick the
+right profile among people with the same name. All authors share one long-lived Chromium,
+one pool of stealth pages for publication pages, one pooled HTTP client for
+profile listings and one per-host rate budget, and up to
+--author-concurrency authors are scraped at the same time. Every author gets
+their own Excel file and one combined file is written at the end. With
+--engine http the authors share one set of --concurrency HTTP slots, and
+Chromium is only launched, once for the whole batch, if Scholar blocks
+some pages. Papers that several authors list are fetched and matched to
+Scopus once (see dedup.py) unless --no-dedup is given.
+
+Usage:
+    python batch_scrape.py authors.txt --author-concurrency 2 --concurrency 4
+"""
+import argparse
+
+from cli_options import add_scrape_options
+from config import __version__, get_key
+
+
+def read_author_list(path):
+    """Read author names / profile URLs, skipping blank lines and comments"""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and line not in entries:
+                entries.append(line)
+    return entries
+
+
+async def scrape_authors_batch(entries, author_concurrency=2, concurrency=4, rate=0.5, cache=None,
+                               incremental=False, state_dir="results", scopus=False, scopus_mode="index",
+                               resume=False, engine="browser", recycle_after=50, rate_limiter=None, store=None,
+                               dedup=None, refresh_author=False):
+    """Scrape every entry with one shared browser; returns (Author by entry, failed entries)"""
+    import asyncio
+    
+    from abstract_fetcher import PagePool
+    from author_resolver import parse_author_entry
+    from rate_control import AdaptiveRateController
+    from http_client import HttpClient
+    from scopus_client import ScopusClient
+    from http_engine import HttpSlots
+    from scholar_scraper import FallbackBrowser, scrape_google_scholar_playwright, launch_browser, new_stealth_page
+    
+    results = {}
+    failed = []
+    semaphore = asyncio.Semaphore(max(1, author_concurrency))
+    rate_limiter = rate_limiter or AdaptiveRateController(rate)
+    
+    async def scrape_all(http_client, browser=None, pool=None, fallback=None):
+        scopus_api_key = get_key("scopus_key") if scopus else None
+        scopus_client = ScopusClient(scopus_api_key, http_client) if scopus_api_key else None
+        
+        async def scrape_one(entry):
+            name, affiliation, topics = parse_author_entry(entry)
+            async with semaphore:
+                try:
+                    results[entry] = await scrape_google_scholar_playwright(
+                        name, concurrency=concurrency, rate=rate, cache=cache, incremental=incremental,
+                        state_dir=state_dir, browser=browser, pool=pool, rate_limiter=rate_limiter,
+                        http_client=http_client, scopus_client=scopus_client, scopus_mode=scopus_mode,
+                        resume=resume, engine=engine, recycle_after=recycle_after, store=store, dedup=dedup,
+                        affiliation=affiliation, topics=topics, refresh_author=refresh_author, fallback=fallback
+                    )
+                except (Exception, SystemExit) as e:
+                    print(f"❌ Failed to scrape {entry}: {e}")
+                    failed.append(entry)
+        
+        await asyncio.gather(*(scrape_one(entry) for entry in entries))
+    
+    async with HttpClient() as http_client:
+        if engine == "http":
+            # One set of HTTP slots and one lazily launched browser for blocked pages, shared by every author
+            async with FallbackBrowser(concurrency, recycle_after) as fallback:
+                await scrape_all(http_client, pool=HttpSlots(http_client, concurrency), fallback=fallback)
+        else:
+            from playwright.async_api import async_playwright
+            
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
+                try:
+                    async with PagePool(lambda: new_stealth_page(browser), concurrency, recycle_after) as pool:
+                        await scrape_all(http_client, browser, pool)
+                        pool.report()
+                finally:
+                    await browser.close()
+    
+    return results, failed
+
+
+async def scrape_into_store(entries, args, store):
+    """Scrape the entries with the options of build_parser() into `store`; returns (Author by entry, failed)"""
+    from page_cache import PageCache
+    from dedup import DedupIndex
+    from resource_blocker import blocker_for_run, parse_resource_types
+    from rate_control import AdaptiveRateController
+    from scholar_scraper import configure_browser, report_abstract_selectors
+    
+    blocker = blocker_for_run(args.block_resources, args.headless, parse_resource_types(args.allow_resources))
+    configure_browser(args.headless, blocker)
+    
+    rate_limiter = AdaptiveRateController(args.rate, args.max_rate, log_path=args.pacing_log)
+    cache = None if args.no_cache else PageCache(args.cache_dir)
+    try:
+        # One index of unique papers for the whole batch, seeded with the authors already stored
+        dedup = None if args.no_dedup else DedupIndex.from_store(store)
+        results, failed = await scrape_authors_batch(
+            entries, author_concurrency=args.author_concurrency, concurrency=args.concurrency, rate=args.rate,
+            cache=cache, incremental=args.incremental, state_dir=args.state_dir, scopus=args.scopus,
+            scopus_mode=args.scopus_mode, resume=args.resume, engine=args.engine,
+            recycle_after=args.recycle_after, rate_limiter=rate_limiter, store=store, dedup=dedup,
+            refresh_author=args.refresh_author
+        )
+        if dedup is not None:
+            dedup.report()
+    finally:
+        if cache:
+            cache.close()
+        if blocker:
+            blocker.report()
+        rate_limiter.report()
+        report_abstract_selectors()
+    return results, failed
+
+
+async def run(entries, args):
+    """Scrape the batch and export the combined workbook from the store"""
+    from store import PublicationStore, author_key, store_path
+    
+    print(f"👥 Batch scraping {len(entries)} authors ({args.author_concurrency} at a time)...")
+    
+    store = PublicationStore(args.db or store_path(args.state_dir))
+    try:
+        results, failed = await scrape_into_store(entries, args, store)
+        
+        # Stream every author's rows from the store into the combined workbook
+        keys = [author_key(results[entry]) for entry in entries if entry in results]
+        filename = store.export_excel(keys, "batch")
+    finally:
+        store.close()
+    
+    total = sum(len(author.publications) for author in results.values())
+    
+    print(f"\n{'='*60}")
+    print(f"✅ Batch finished: {len(results)}/{len(entries)} authors, {total} publications")
+    print(f"📁 Combined results saved to: {filename}")
+    if failed:
+        print(f"⚠️  Failed authors: {', '.join(failed)}")
+    print(f"{'='*60}\n")
+
+
+# ---------------- Main Entry Point ----------------
+def build_parser(description="Scrape many Google Scholar authors in one process with a shared browser"):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument(
+        "author_file",
+        type=str,
+        help="Text file with one author name or Scholar profile URL per line"
+    )
+    parser.add_argument(
+        "--author-concurrency",
+        type=int,
+        default=2,
+        help="Number of authors scraped at the same time (default: 2)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Publication pages fetched in parallel across all authors (default: 4)"
+    )
+    parser.add_argument(
+        "--refresh-author",
+        action="store_true",
+        help="Search for every author again instead of using the profiles chosen by earlier runs"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse previous results and only fetch new or changed publications"
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=str,
+        default="results",
+        help="Directory where each author's results are kept for --incremental (default: results)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted batch, skipping publications already checkpointed"
+    )
+    return add_scrape_options(parser)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    if args.scopus:
+        get_key("scopus_key", required=True)
+    
+    entries = read_author_list(args.author_file)
+    if not entries:
+        raise SystemExit(f"❌ No authors found in {args.author_file}")
+    
+    import asyncio
+    
+    asyncio.run(run(entries, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark of the vectorized metrics against a per-author Python loop.
+
+Generates a synthetic faculty (a skewed number of publications per author
+and long-tailed citation counts), checks that metrics.compute_metrics
+agrees with a straightforward per-author implementation and reports the
+time of both.
+
+Usage:
+    python bench_metrics.py --authors 5000 --mean-publications 80 --runs 5
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from metrics import compute_metrics, year_histograms
+
+
+def synthetic_faculty(authors, mean_publications, seed=0):
+    """Flat (author_ids, citations, years) arrays of a random faculty"""
+    rng = np.random.default_rng(seed)
+    counts = rng.geometric(1 / mean_publications, authors)
+    author_ids = np.repeat(np.arange(authors), counts)
+    citations = np.floor(rng.lognormal(1.5, 1.4, len(author_ids))).astype(np.int64)
+    years = rng.integers(1985, 2026, len(author_ids))
+    years[rng.random(len(author_ids)) < 0.05] = 0
+    return author_ids, citations, years
+
+
+def loop_metrics(author_ids, citations, years, n_authors, current_year):
+    """Reference implementation: one Python loop per author"""
+    per_author = [[] for _ in range(n_authors)]
+    for author, cited, year in zip(author_ids.tolist(), citations.tolist(), years.tolist()):
+        per_author[author].append((cited, year))
+
+    h_index, g_index, i10_index, m_quotient = [], [], [], []
+    for pubs in per_author:
+        ranked = sorted((cited for cited, _ in pubs), reverse=True)
+        h = sum(1 for rank, cited in enumerate(ranked, 1) if cited >= rank)
+        total, g = 0, 0
+        for rank, cited in enumerate(ranked, 1):
+            total += cited
+            if total >= rank * rank:
+                g = rank
+        known_years = [year for _, year in pubs if year]
+        h_index.append(h)
+        g_index.append(g)
+        i10_index.append(sum(1 for cited in ranked if cited >= 10))
+        m_quotient.append(h / (current_year - min(known_years) + 1) if known_years else float("nan"))
+    return {"h_index": h_index, "g_index": g_index, "i10_index": i10_index, "m_quotient": m_quotient}
+
+
+def best_and_median(function, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, min(times), statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized bibliometric metrics")
+    parser.add_argument("--authors", type=int, default=5000, help="Number of authors (default: 5000)")
+    parser.add_argument("--mean-publications", type=float, default=80,
+                        help="Mean publications per author (default: 80)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per implementation (default: 5)")
+    args = parser.parse_args()
+
+    current_year = 2026
+    author_ids, citations, years = synthetic_faculty(args.authors, args.mean_publications)
+    print(f"{args.authors} authors, {len(author_ids)} publications")
+
+    vectorized, best, median = best_and_median(
+        lambda: compute_metrics(author_ids, citations, years, args.authors, current_year), args.runs
+    )
+    print(f"{'compute_metrics (NumPy)':32} median {median:9.1f} ms  best {best:9.1f} ms")
+
+    _, best_hist, median_hist = best_and_median(
+        lambda: year_histograms(author_ids, citations, years, args.authors), args.runs
+    )
+    print(f"{'year_histograms (NumPy)':32} median {median_hist:9.1f} ms  best {best_hist:9.1f} ms")
+
+    reference, best_loop, median_loop = best_and_median(
+        lambda: loop_metrics(author_ids, citations, years, args.authors, current_year), args.runs
+    )
+    print(f"{'per-author Python loop':32} median {median_loop:9.1f} ms  best {best_loop:9.1f} ms")
+    print(f"Speed-up: {median_loop / median:.1f}x")
+
+    for name in ("h_index", "g_index", "i10_index"):
+        if not np.array_equal(vectorized[name], reference[name]):
+            raise SystemExit(f"❌ {name} differs from the reference implementation")
+    if not np.allclose(vectorized["m_quotient"], reference["m_quotient"], equal_nan=True):
+        raise SystemExit("❌ m_quotient differs from the reference implementation")
+    print("✅ Results match the reference implementation")
+
+
+if __name__ == "__main__":
+    main()
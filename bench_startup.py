@@ -0,0 +1,88 @@
+"""
+Startup time benchmark for the command-line tools.
+
+Runs `--version` and `--help` of each script in fresh interpreters and
+reports the best and median wall time, then checks that importing the
+scripts does not load any of the heavy optional dependencies. Exits with
+status 1 when a median is over the budget or a heavy module is imported,
+so it can guard against startup regressions.
+
+Usage:
+    python bench_startup.py --runs 20 --budget-ms 100
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+SCRIPTS = ["main_improved.py", "batch_scrape.py", "sharded_scrape.py"]
+FAST_ARGS = [["--version"], ["--help"]]
+
+# Importing these must not pull in HEAVY_MODULES
+LIGHT_MODULES = ["main_improved", "batch_scrape", "cli_options", "scholar_scraper", "store", "api_server", "dedup", "sharded_scrape"]
+
+# Modules that must only be imported once a run actually needs them
+HEAVY_MODULES = ["playwright", "aiohttp", "openpyxl", "dotenv", "requests", "numpy"]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_command(command, runs):
+    """Wall times in milliseconds of `runs` fresh runs of the command"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def heavy_imports(module):
+    """Heavy modules loaded as a side effect of importing `module`"""
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="Maximum median startup time in ms (default: 100)")
+    args = parser.parse_args()
+
+    ok = True
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.runs))
+    print(f"{'python -c pass':40} median {baseline:7.1f} ms")
+
+    for script in SCRIPTS:
+        for extra in FAST_ARGS:
+            times = time_command([sys.executable, script] + extra, args.runs)
+            median = statistics.median(times)
+            over = median > args.budget_ms
+            ok = ok and not over
+            label = " ".join([script] + extra)
+            print(f"{label:40} median {median:7.1f} ms  best {min(times):7.1f} ms"
+                  f"{'  ❌ over budget' if over else ''}")
+
+    for module in LIGHT_MODULES:
+        loaded = heavy_imports(module)
+        if loaded:
+            ok = False
+            print(f"❌ import {module} loads {', '.join(loaded)}")
+        else:
+            print(f"✅ import {module} loads no heavy dependencies")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Append-only checkpoint journal for interrupted scrapes.
+
+Every finished publication is appended to `<state_dir>/<author>.checkpoint.jsonl`
+as one compact JSON line (Publication.to_dict) and flushed to disk straight away. When a run dies part way
+(CAPTCHA wall, crash, Ctrl+C), `--resume` reads the journal back and only the
+publications that are not in it are fetched again. The journal is removed
+once the run has saved its results.
+"""
+import json
+import os
+
+from incremental import author_state_key
+from models import Publication
+
+
+def checkpoint_path(state_dir, author_link, author_name):
+    return os.path.join(state_dir, f"{author_state_key(author_link, author_name)}.checkpoint.jsonl")
+
+
+class CheckpointJournal:
+    """JSONL journal of finished Publications for one author"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = self._load() if resume else []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # A run without --resume starts a fresh journal
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._ends_mid_line():
+            self._file.write("\n")
+
+    def _ends_mid_line(self):
+        if not os.path.getsize(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _load(self):
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(Publication.from_dict(json.loads(line)))
+                except ValueError:
+                    # Torn last line from a crash mid-write
+                    continue
+        return records
+
+    def append(self, pub):
+        self._file.write(json.dumps(pub.to_dict(), ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def finish(self):
+        """The run's results are saved, so the journal is no longer needed"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
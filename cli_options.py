@@ -0,0 +1,95 @@
+"""
+Command-line options shared by main_improved.py and batch_scrape.py.
+
+sharded_scrape.py reuses batch_scrape's parser, so every scrape command
+takes the same pacing, cache, store, Scopus and browser options with the
+same defaults. Only argparse is involved, which keeps `--help` fast.
+"""
+
+
+def add_scrape_options(parser):
+    """Add the options every scrape command understands to an ArgumentParser"""
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Starting publication page requests per second per host, adapted to how Scholar responds (default: 0.5)"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Fastest request rate per host the pacing may speed up to (default: 4x --rate)"
+    )
+    parser.add_argument(
+        "--pacing-log",
+        type=str,
+        default=None,
+        help="Append every change of a host's request interval (host, old and new interval, reason, latency) "
+             "to this JSONL file"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".scholar_cache",
+        help="Directory for the publication page cache (default: .scholar_cache)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch every publication page again instead of using the cache"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Fetch papers shared with already scraped co-authors again instead of reusing them"
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="SQLite publication store every run is saved to (default: <state-dir>/publications.sqlite3)"
+    )
+    parser.add_argument(
+        "--scopus",
+        action="store_true",
+        help="Enrich publications with Scopus data (needs scopus_key in .env)"
+    )
+    parser.add_argument(
+        "--scopus-mode",
+        choices=["index", "batch"],
+        default="index",
+        help="index: fetch each author's Scopus documents once and match locally; "
+             "batch: batched title queries (default: index)"
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=50,
+        help="Replace a pooled browser page and its context after this many publications (default: 50)"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run Chromium without a window (CAPTCHAs cannot be solved by hand)"
+    )
+    parser.add_argument(
+        "--block-resources",
+        choices=["auto", "on", "off"],
+        default="auto",
+        help="Abort image, font and stylesheet requests; auto = only when --headless (default: auto)"
+    )
+    parser.add_argument(
+        "--allow-resources",
+        type=str,
+        default="document,script,xhr,fetch",
+        help="Resource types still loaded when blocking (default: document,script,xhr,fetch)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["browser", "http"],
+        default="browser",
+        help="browser: drive Chromium with Playwright; http: plain HTTP requests, "
+             "Chromium only as a fallback when blocked (default: browser)"
+    )
+    return parser
@@ -0,0 +1,38 @@
+"""
+Version and API key settings of the command-line tools.
+
+The `.env` file is only read when a command first asks for a key, and each
+command checks just the keys its options need, so `--help`, `--version` and
+runs that never call ScraperAPI or Scopus start without touching python-dotenv.
+"""
+import os
+
+
+__version__ = "1.0.0"
+
+# Environment variable -> what it is, for error messages
+API_KEYS = {
+    "key": "ScraperAPI key",
+    "scopus_key": "Scopus API key",
+}
+
+_env_loaded = False
+
+
+def load_env():
+    """Load `.env` into the environment once"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_key(name, required=False):
+    """Return the API key `name` from the environment, or None if it is not set"""
+    load_env()
+    value = os.getenv(name)
+    if required and not value:
+        raise SystemExit(f"❌ No {API_KEYS[name]} found in .env file. Add '{name}=your_api_key'")
+    return value
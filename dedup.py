@@ -0,0 +1,296 @@
+"""
+Cross-author publication deduplication.
+
+Co-authors from the same group list the same paper on each of their
+profiles, under a different `citation_for_view` id each time. A
+DedupIndex shared by every author of a run maps each publication to one
+Paper, so its publication page is opened and its Scopus record looked up
+once, and every other copy reuses the result.
+
+A publication matches a known Paper by, in order:
+
+- DOI (once Scopus enrichment found one)
+- Scholar cluster id (the `cluster=`/`cites=` id, when known)
+- a hash of the normalized title and year (and the store's copies with
+  the same normalized title and year)
+- MinHash/LSH over character 3-grams of the titles of this run, for
+  near-duplicate titles (punctuation, typos, subtitles). Candidates must
+  have a title Jaccard similarity of at least `threshold`, the same
+  numbers in the title and no conflicting years.
+
+Papers that another author is still fetching carry a future that resolves
+to the abstract, so concurrent co-authors wait for it instead of opening
+the same page. Papers of co-authors scraped earlier are looked up in the
+PublicationStore on first use, so a run also reuses them.
+"""
+import asyncio
+import hashlib
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+
+from abstract_fetcher import CAPTCHA_BLOCKED, FETCH_FAILED
+from scopus_client import normalize_title
+
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16        # 16 bands of 4 rows: candidates from about 0.5 estimated Jaccard
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Titles that many unrelated papers share; such publications are never matched to each other
+GENERIC_TITLES = {
+    "introduction", "editorial", "guest editorial", "preface", "foreword", "conclusion", "conclusions",
+    "erratum", "corrigendum", "correction", "book review", "reply", "response", "commentary", "discussion",
+    "letter to the editor", "editorial board", "front matter", "back matter", "contents", "index",
+    "abstracts", "acknowledgments", "acknowledgements", "keynote", "obituary", "in memoriam",
+}
+MIN_TITLE_WORDS = 3
+# Two authors are related once they list this many of the same papers
+RELATED_AUTHOR_PAPERS = 2
+
+
+def title_shingles(title):
+    """Character 3-grams of the normalized title"""
+    text = normalize_title(title)
+    return {text[i:i + 3] for i in range(max(1, len(text) - 2))}
+
+
+def title_hash(title, year=None):
+    key = f"{normalize_title(title)}|{year or ''}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def title_numbers(title):
+    """Numbers in a title ("Part 2", "COVID-19"), which near-duplicates must share"""
+    return set(re.findall(r"\d+", title))
+
+
+def is_generic_title(title):
+    """Too short or too common ("Editorial", "Preface") to tell papers apart by title"""
+    words = normalize_title(title).split()
+    return len(words) < MIN_TITLE_WORDS or " ".join(words) in GENERIC_TITLES
+
+
+@dataclass(eq=False)
+class Paper:
+    """One unique publication and what is known about it"""
+    paper_id: str
+    title: str
+    year: int | None = None
+    shingles: set = field(default_factory=set, repr=False)
+    abstract: str | None = None
+    has_abstract: bool = False     # the publication page was read (abstract may be NO_ABSTRACT)
+    source: str | None = None      # key of the author whose page gave the abstract
+    scopus: dict | None = None     # details in the form of scopus_client.entry_details
+    scopus_source: str | None = None   # key of the author whose own Scopus lookup found `scopus`
+    pending: asyncio.Future | None = field(default=None, repr=False)
+    authors: set = field(default_factory=set)   # keys of the authors listing this paper
+
+
+class DedupIndex:
+    """Index of unique papers by DOI, cluster id, title hash and title MinHash"""
+
+    def __init__(self, threshold=0.8, permutations=MINHASH_PERMUTATIONS, bands=LSH_BANDS, store=None):
+        import numpy as np
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = permutations // bands
+        rng = np.random.default_rng(1)
+        self._a = rng.integers(1, MERSENNE_PRIME, permutations, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, permutations, dtype=np.uint64)
+        self.store = store
+        self._stored_keys = set()    # (normalized title, year, DOI) already looked up in the store
+        self.by_doi = {}
+        self.by_cluster = {}
+        self.by_title = {}
+        self.buckets = {}            # (band, band hash) -> [Paper]
+        self.shared_counts = Counter()   # {author, author} -> papers both list
+        self.abstracts_shared = 0
+        self.scopus_shared = 0
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """
+        Index backed by the publications already in `store`. Stored copies of
+        a publication are looked up by exact normalized title and year or DOI
+        (indexed SQL queries) the first time it is matched, so opening the
+        index costs nothing; only titles of this run go into the MinHash/LSH
+        buckets.
+        """
+        return cls(store=store, **kwargs)
+
+    def _load_stored(self, title, year=None, doi=None):
+        """Paper seeded with the store's copies of a publication, or None if there are none"""
+        title_norm = normalize_title(title)
+        key = (title_norm, year, doi and doi.lower())
+        if self.store is None or key in self._stored_keys:
+            return None
+        self._stored_keys.add(key)
+
+        paper = None
+        for author, stored_title, stored_year, abstract, status, scopus in self.store.dedup_rows(title_norm, year, doi):
+            if paper is None:
+                paper = self.add(title, year, doi)
+            self._add_author(paper, author)
+            # Only real abstracts are reused; blocked and failed pages are fetched again
+            if status == "ok" and not paper.has_abstract:
+                paper.abstract, paper.has_abstract, paper.source = abstract, True, author
+            if scopus and paper.scopus is None:
+                paper.scopus, paper.scopus_source = scopus, author
+                self.link(paper, scopus["doi"])
+        return paper
+
+    def _add_author(self, paper, author):
+        if author and author not in paper.authors:
+            for other in paper.authors:
+                self.shared_counts[frozenset((author, other))] += 1
+            paper.authors.add(author)
+
+    def related(self, author, other):
+        """Whether two authors list enough of the same papers to be co-authors"""
+        return author == other or self.shared_counts[frozenset((author, other))] >= RELATED_AUTHOR_PAPERS
+
+    def _minhash(self, shingles):
+        import numpy as np
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % MERSENNE_PRIME for s in shingles), np.uint64, len(shingles)
+        )
+        # (a*x + b) mod p for every permutation and shingle; a, x < 2^31 keeps it within uint64
+        return ((self._a[:, None] * hashes + self._b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, shingles):
+        signature = self._minhash(shingles)
+        rows = self.rows_per_band
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def _similar(self, paper, shingles, title, year):
+        if paper.year and year and paper.year != year:
+            return False
+        if title_numbers(paper.title) != title_numbers(title):
+            return False
+        union = len(paper.shingles | shingles)
+        return bool(union) and len(paper.shingles & shingles) / union >= self.threshold
+
+    def match(self, title, year=None, doi=None, cluster_id=None):
+        """The known Paper this publication is a copy of, or None"""
+        if doi and doi.lower() in self.by_doi:
+            return self.by_doi[doi.lower()]
+        if cluster_id and cluster_id in self.by_cluster:
+            return self.by_cluster[cluster_id]
+        paper = self.by_title.get(title_hash(title, year)) or self._load_stored(title, year, doi)
+        if paper is not None:
+            return paper
+
+        shingles = title_shingles(title)
+        candidates = {id(p): p for key in self._band_keys(shingles) for p in self.buckets.get(key, ())}
+        for paper in candidates.values():
+            if self._similar(paper, shingles, title, year):
+                return paper
+        return None
+
+    def add(self, title, year=None, doi=None, cluster_id=None):
+        """Register a new Paper under all of its keys"""
+        paper = Paper(paper_id=f"t:{title_hash(title, year)}", title=title, year=year,
+                      shingles=title_shingles(title))
+        self.by_title[title_hash(title, year)] = paper
+        for key in self._band_keys(paper.shingles):
+            self.buckets.setdefault(key, []).append(paper)
+        self.link(paper, doi, cluster_id)
+        return paper
+
+    def link(self, paper, doi=None, cluster_id=None):
+        """Add a DOI or cluster id that was learned later to a Paper"""
+        if doi:
+            self.by_doi.setdefault(doi.lower(), paper)
+        if cluster_id:
+            self.by_cluster.setdefault(cluster_id, paper)
+
+    def paper_for(self, pub, author=None):
+        """
+        The Paper of a Publication, registering a new one if needed and linking
+        it to `author`. Publications with a generic title get a Paper of their own
+        that is not indexed.
+        """
+        if is_generic_title(pub.title):
+            return Paper(paper_id=f"t:{title_hash(pub.title, pub.year)}", title=pub.title, year=pub.year)
+        paper = self.match(pub.title, pub.year, pub.scopus_doi)
+        if paper is None:
+            paper = self.add(pub.title, pub.year, pub.scopus_doi)
+        self._add_author(paper, author)
+        return paper
+
+    # ---------------- Abstracts ----------------
+    def claim(self, title, year=None, author=None):
+        """
+        Decide who fetches a publication page, linking the paper to `author`.
+
+        Returns ("shared", abstract) if the paper's page was already read,
+        ("wait", future) if another author is fetching it right now, or
+        ("fetch", paper) if the caller should fetch it and then call `resolve`.
+        """
+        if is_generic_title(title):
+            return "fetch", Paper(paper_id=f"t:{title_hash(title, year)}", title=title, year=year)
+        paper = self.match(title, year) or self.add(title, year)
+        self._add_author(paper, author)
+        # An author's own abstract from an earlier run is fetched again; --incremental decides about those
+        if paper.has_abstract and (paper.source != author or author is None):
+            self.abstracts_shared += 1
+            return "shared", paper.abstract
+        if paper.pending is not None and not paper.pending.done():
+            return "wait", paper.pending
+        paper.pending = asyncio.get_running_loop().create_future()
+        paper.source = author
+        return "fetch", paper
+
+    def resolve(self, paper, abstract):
+        """Record a fetched abstract (None, a CAPTCHA page or FETCH_FAILED if the fetch failed) and wake waiters"""
+        if abstract is not None and abstract not in (CAPTCHA_BLOCKED, FETCH_FAILED):
+            paper.abstract, paper.has_abstract = abstract, True
+        if paper.pending is not None and not paper.pending.done():
+            paper.pending.set_result(abstract if paper.has_abstract else None)
+
+    # ---------------- Scopus ----------------
+    def scopus_for(self, pub, author=None, own_index=None):
+        """
+        Scopus details another copy of this publication was matched to, or None.
+
+        A title match alone does not show that the Scopus document belongs to
+        `author`, so a match is only reused if the document is in the author's
+        own AuthorDocumentIndex `own_index`, or if it was found by the Scopus
+        lookup of a related author (see `related`) who lists the same paper.
+        """
+        if is_generic_title(pub.title):
+            return None
+        paper = self.match(pub.title, pub.year, pub.scopus_doi)
+        if paper is None or not paper.scopus:
+            return None
+        if own_index is not None and own_index.find(paper.scopus) is not None:
+            self.scopus_shared += 1
+            return paper.scopus
+        source = paper.scopus_source
+        if author and source in paper.authors and self.related(author, source):
+            self.scopus_shared += 1
+            return paper.scopus
+        return None
+
+    def add_scopus(self, pub, details, author=None):
+        """Record the Scopus match of a publication; `author` if their own lookup found it"""
+        if is_generic_title(pub.title):
+            return
+        paper = self.paper_for(pub, author)
+        if paper.scopus is None or author:
+            paper.scopus, paper.scopus_source = details, author or paper.scopus_source
+        self.link(paper, details.get("doi"))
+
+    def shared_papers(self):
+        """Papers listed by more than one author"""
+        return [paper for paper in self.by_title.values() if len(paper.authors) > 1]
+
+    def report(self):
+        print(
+            f"🔗 Dedup: {len(self.by_title)} unique papers, {len(self.shared_papers())} listed by several "
+            f"authors; reused {self.abstracts_shared} publication pages and {self.scopus_shared} Scopus matches"
+        )
@@ -0,0 +1,134 @@
+"""
+Streaming Excel export for scraped publications.
+
+Uses openpyxl's write-only mode, which appends rows to the sheet as they
+arrive instead of keeping every cell in memory, so exports of hundreds of
+thousands of rows stay flat in memory. Style objects are created once and
+shared by every cell. openpyxl is imported on the first export only.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+from abstract_fetcher import NO_ABSTRACT, CAPTCHA_BLOCKED, FETCH_FAILED
+
+
+ABSTRACT_PLACEHOLDERS = {"blocked": CAPTCHA_BLOCKED, "failed": FETCH_FAILED}
+
+
+HEADERS = [
+    "No.",
+    "Author Name",
+    "Scopus Author ID",
+    "Publication Title",
+    "Abstract",
+    "Publication Year (Scholar)",
+    "Publication Year (Scopus)",
+    "Citations (Scholar)",
+    "Scopus Document ID",
+    "Scopus EID",
+    "DOI"
+]
+
+COLUMN_WIDTHS = {
+    'A': 5, 'B': 25, 'C': 20, 'D': 50, 'E': 80, 'F': 15,
+    'G': 15, 'H': 12, 'I': 20, 'J': 30, 'K': 25,
+}
+
+
+@lru_cache(maxsize=None)
+def shared_styles():
+    """Header fill, header font, header alignment and row alignment (one object each instead of one per cell)"""
+    from openpyxl.styles import Font, Alignment, PatternFill
+
+    return (
+        PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        Font(bold=True, color="FFFFFF", size=12),
+        Alignment(horizontal="center", vertical="center", wrap_text=True),
+        Alignment(vertical="top", wrap_text=True),
+    )
+
+
+def excel_filename(author_name):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"publications_{author_name.replace(' ', '_')}_{timestamp}.xlsx"
+
+
+class StreamingExcelWriter:
+    """
+    Write publications to an .xlsx file one row at a time.
+    Used as a context manager, the rows written so far are saved even if
+    the block raises.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.rows_written = 0
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+
+        self._cell_class = WriteOnlyCell
+        self.header_fill, self.header_font, self.header_alignment, self.row_alignment = shared_styles()
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet("Publications")
+
+        # Column widths must be set before the first row is appended
+        for column, width in COLUMN_WIDTHS.items():
+            self.ws.column_dimensions[column].width = width
+
+        self.ws.append([
+            self._cell(header, self.header_alignment, self.header_font, self.header_fill) for header in HEADERS
+        ])
+
+    def _cell(self, value, alignment=None, font=None, fill=None):
+        cell = self._cell_class(self.ws, value=value)
+        cell.alignment = alignment or self.row_alignment
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        return cell
+
+    def write(self, pub, author_name, scopus_author_id=None):
+        """Append one Publication; missing values are shown as placeholder text"""
+        self.rows_written += 1
+        abstract = pub.abstract or ABSTRACT_PLACEHOLDERS.get(pub.abstract_status, NO_ABSTRACT)
+        self.ws.append([self._cell(value) for value in (
+            self.rows_written,
+            pub.author_name or author_name,
+            scopus_author_id or "N/A",
+            pub.title,
+            abstract,
+            pub.year or "N/A",
+            pub.scopus_year or "N/A",
+            pub.citations,
+            pub.scopus_id or "N/A",
+            pub.scopus_eid or "N/A",
+            pub.scopus_doi or "N/A",
+        )])
+
+    def close(self):
+        self.wb.save(self.filename)
+        return self.filename
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+            return
+        # Keep the rows streamed so far instead of losing the whole export
+        try:
+            self.close()
+            print(f"⚠️  Export interrupted; {self.rows_written} rows saved to {self.filename}")
+        except Exception as e:
+            print(f"⚠️  Could not save the partial export {self.filename}: {e}")
+
+
+def save_to_excel(publications, author_name, scopus_author_id, filename=None):
+    """Save Publications (any iterable, e.g. a generator) to an Excel file with formatting"""
+    filename = filename or excel_filename(author_name)
+    with StreamingExcelWriter(filename) as writer:
+        for pub in publications:
+            writer.write(pub, author_name, scopus_author_id)
+    return filename
@@ -0,0 +1,102 @@
+"""
+Shared async HTTP client with a pooled keep-alive connection pool.
+
+One aiohttp session is reused for every plain-HTTP request of a run, so
+repeated requests to the same host ride on already open connections.
+aiohttp is the slowest import of the tools, so it is only loaded once a
+client is created; network failures surface as `HttpError`.
+"""
+import asyncio
+from contextlib import contextmanager
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpError(Exception):
+    """A request failed at the network level (wraps aiohttp.ClientError)"""
+
+
+def _aiohttp():
+    import aiohttp
+
+    return aiohttp
+
+
+@contextmanager
+def _wrap_errors():
+    try:
+        yield
+    except _aiohttp().ClientError as e:
+        raise HttpError(str(e) or type(e).__name__) from e
+
+
+class HttpClient:
+    """Thin wrapper around one aiohttp.ClientSession with bounded connections"""
+
+    def __init__(self, limit=20, limit_per_host=4, timeout=20, headers=None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = _aiohttp().ClientTimeout(total=timeout)
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.session = None
+
+    async def start(self):
+        aiohttp = _aiohttp()
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=30,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=self.timeout, headers=self.headers
+        )
+        return self
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def get_text(self, url, params=None, headers=None):
+        """GET a URL and return (status, body text)"""
+        with _wrap_errors():
+            async with self.session.get(url, params=params, headers=headers) as response:
+                return response.status, await response.text()
+
+    async def get_page(self, url, params=None, headers=None):
+        """GET a web page and return (status, body text, final URL after redirects)"""
+        with _wrap_errors():
+            async with self.session.get(url, params=params, headers=headers) as response:
+                return response.status, await response.text(), str(response.url)
+
+    async def post_text(self, url, data=None, headers=None):
+        """POST form data to a URL and return (status, body text)"""
+        with _wrap_errors():
+            async with self.session.post(url, data=data, headers=headers) as response:
+                return response.status, await response.text()
+
+    async def get_json(self, url, params=None, headers=None):
+        """GET a JSON API and return (status, response headers, parsed body or None)"""
+        with _wrap_errors():
+            async with self.session.get(url, params=params, headers=headers) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                return response.status, dict(response.headers), data
+
+
+# Errors worth falling back on (network trouble, timeouts)
+HTTP_ERRORS = (HttpError, asyncio.TimeoutError)
@@ -0,0 +1,112 @@
+"""
+Pure-HTTP scraping engine (`--engine http`).
+
+Author search, profile listing and publication pages are fetched with the
+pooled HttpClient and read with the scholar_parser HTML parsers, so no
+browser has to be started. Callers only fall back to Playwright (loaded
+lazily) for the parts that get blocked.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode, urljoin
+
+from abstract_fetcher import NO_ABSTRACT, CAPTCHA_BLOCKED
+from author_resolver import choose_candidate
+from profile_loader import looks_blocked
+from scholar_parser import parse_author_search, parse_publication_abstract
+from serp_client import SerpError
+
+
+SCHOLAR_URL = "https://scholar.google.com"
+
+
+class HttpSlots:
+    """Drop-in for PagePool: `size` concurrent slots sharing one HttpClient"""
+
+    def __init__(self, client, size=4):
+        self.client = client
+        self.size = max(1, size)
+        self._semaphore = asyncio.Semaphore(self.size)
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._semaphore:
+            yield self.client
+
+
+def author_search_url(author_name, base_url=SCHOLAR_URL):
+    query = urlencode({"view_op": "search_authors", "hl": "en", "mauthors": author_name})
+    return f"{base_url}/citations?{query}"
+
+
+async def fetch_scholar_page(client, url, pacer=None):
+    """
+    GET a Scholar page through the AdaptiveRateController `pacer`.
+    Returns (status, html, blocked); network errors are reported and re-raised.
+    """
+    if pacer:
+        await pacer.wait(url)
+    start = time.monotonic()
+    try:
+        status, html, final_url = await client.get_page(url)
+    except Exception:
+        if pacer:
+            pacer.record(url, outcome="error")
+        raise
+
+    blocked = status in (403, 429) or looks_blocked(html, final_url)
+    if pacer:
+        outcome = "blocked" if blocked else "error" if status >= 500 else "ok"
+        pacer.record(url, time.monotonic() - start, outcome)
+    return status, html, blocked
+
+
+async def search_author_candidates(client, author_name, base_url=SCHOLAR_URL, pacer=None):
+    """Author cards of a Scholar author search, or None when the search was blocked"""
+    status, html, blocked = await fetch_scholar_page(client, author_search_url(author_name, base_url), pacer)
+    if status != 200 or blocked:
+        return None
+    return parse_author_search(html)
+
+
+async def search_author_http(client, author_name, serp_client=None, base_url=SCHOLAR_URL, pacer=None,
+                             affiliation=None, topics=()):
+    """
+    AuthorCandidate (with an absolute profile link) that best matches the
+    name and hints, searched over plain HTTP (ScraperAPI as backup)
+    """
+    candidates = await search_author_candidates(client, author_name, base_url, pacer)
+    if not candidates and serp_client:
+        try:
+            candidates = await serp_client.find_author_candidates(author_name)
+        except SerpError as e:
+            print(f"⚠️  ScraperAPI author search failed: {e}")
+
+    chosen = choose_candidate(author_name, candidates or [], affiliation, topics)
+    return chosen and chosen._replace(href=urljoin(base_url, chosen.href))
+
+
+async def get_abstract_over_http(client, full_url, pub_num, pacer=None):
+    """
+    Download a publication page and parse its abstract. fetch_abstracts has
+    already waited for the request token, so `pacer` only gets the outcome.
+    """
+    start = time.monotonic()
+    status, html, final_url = await client.get_page(full_url)
+    blocked = status in (403, 429) or looks_blocked(html, final_url)
+    # Blocked pages and errors are reported by fetch_abstracts
+    if pacer and status == 200 and not blocked:
+        pacer.record(full_url, time.monotonic() - start)
+
+    if blocked:
+        print(f"    🚫 [{pub_num}] Blocked by Scholar")
+        return CAPTCHA_BLOCKED
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}")
+
+    abstract = parse_publication_abstract(html)
+    if not abstract:
+        return NO_ABSTRACT
+    print(f"    ✅ [{pub_num}] Abstract extracted ({len(abstract)} chars)")
+    return abstract
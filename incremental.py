@@ -0,0 +1,97 @@
+"""
+Incremental re-scrape support.
+
+After every run the publications of an author are saved to a JSON state
+file named after the Scholar user id: the Author fields plus the
+publications stored column by column (models.to_columns). The next `--incremental` run loads it,
+matches the freshly listed profile rows against it by title, year and
+citation href, and only opens publication pages for rows that are new or
+changed. Citation counts of unchanged rows are updated in place.
+"""
+import json
+import os
+import re
+from urllib.parse import urlparse, parse_qsl
+
+from models import Publication, from_columns, to_columns
+from page_cache import normalize_citation_url
+
+
+def author_state_key(author_link, author_name):
+    """Scholar user id of the profile, falling back to the author name"""
+    user_id = dict(parse_qsl(urlparse(author_link or "").query)).get("user")
+    return user_id or re.sub(r"\W+", "_", author_name).strip("_")
+
+
+def state_path(state_dir, author_link, author_name):
+    return os.path.join(state_dir, f"{author_state_key(author_link, author_name)}.json")
+
+
+def load_previous_results(path):
+    """Return the Publications saved by the previous run, or [] if there is none"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if "columns" in state:
+            return from_columns(state["columns"])
+        # State files of older versions hold a list of publication dicts
+        return [Publication.from_dict(pub) for pub in state.get("publications", [])]
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️  Could not read previous results {path}: {e}")
+        return []
+
+
+def save_results(path, author):
+    """Write an Author and its publications as the state file of the next run"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"author": author.to_dict(), "columns": to_columns(author.publications)},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    os.replace(tmp_path, path)
+
+
+def row_key(title, year, href):
+    normalized_title = " ".join(title.lower().split())
+    normalized_href = normalize_citation_url(href) if href else ""
+    return (normalized_title, year, normalized_href)
+
+
+class IncrementalPlan:
+    """Split freshly listed profile rows into reusable and to-be-fetched rows"""
+
+    def __init__(self, rows, previous):
+        known = {
+            row_key(pub.title, pub.year, pub.link): pub
+            for pub in previous
+            # Pages that were blocked by a CAPTCHA or failed to load are fetched again
+            if not pub.needs_refetch
+        }
+        self.reused = {}      # row index -> previous publication
+        self.to_fetch = []    # row indexes that need their detail page
+        self.citations_updated = 0
+
+        for i, (title, href, year, citations) in enumerate(rows):
+            pub = known.get(row_key(title, year, href))
+            if pub is None:
+                self.to_fetch.append(i)
+                continue
+            self.reused[i] = pub
+            if pub.citations != citations:
+                self.citations_updated += 1
+
+        self.removed = len(known) - len(self.reused)
+
+    def report(self):
+        print(
+            f"♻️  Skipped {len(self.reused)} already known publications "
+            f"({self.citations_updated} citation counts updated), "
+            f"{len(self.to_fetch)} new or changed to fetch, "
+            f"{max(self.removed, 0)} no longer on the profile"
+        )
@@ -1,17 +1,23 @@
 
-import json
-import http.client
-from urllib.parse import urlencode
 import asyncio
 import argparse
 import os
 import re
-from datetime import datetime
+import time
+from functools import partial
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
 import requests
 from dotenv import load_dotenv
+from abstract_fetcher import PagePool, fetch_abstracts, NO_ABSTRACT
+from rate_control import AdaptiveRateController
+from page_cache import PageCache
+from excel_export import save_to_excel
+from models import Publication
+from http_client import HttpClient
+from serp_client import SerpClient, SerpError
+from scholar_parser import parse_profile_rows
+from scopus_client import author_candidate
+from author_resolver import choose_candidate
 
 
 
@@ -38,7 +44,7 @@ def get_scopus_author_id(author_name):
         }
         params = {
             "query": f"AUTHLAST({author_name.split()[-1]}) AND AUTHFIRST({author_name.split()[0]})",
-            "count": 5
+            "count": 25
         }
         
         response = requests.get(url, headers=headers, params=params, timeout=10)
@@ -47,13 +53,12 @@ def get_scopus_author_id(author_name):
             data = response.json()
             results = data.get("search-results", {}).get("entry", [])
             
-            if results and len(results) > 0:
-              
-                author_id = results[0].get("dc:identifier", "").replace("AUTHOR_ID:", "")
-                author_full_name = results[0].get("preferred-name", {}).get("given-name", "") + " " + \
-                                 results[0].get("preferred-name", {}).get("surname", "")
-                print(f"✅ Found Scopus Author: {author_full_name} (ID: {author_id})")
-                return author_id
+            # Rank every candidate instead of trusting the first result
+            candidates = [author_candidate(entry) for entry in results if "error" not in entry]
+            chosen = choose_candidate(author_name, candidates, label="Scopus")
+            if chosen:
+                print(f"✅ Found Scopus Author: {chosen.name} (ID: {chosen.href})")
+                return chosen.href
         else:
             print(f"⚠️  Scopus API returned status {response.status_code}")
             
@@ -106,7 +111,7 @@ def get_scopus_publication_details(author_id, publication_title):
 
 
 
-async def scrape_google_scholar_playwright(author_name):
+async def scrape_google_scholar_playwright(author_name, concurrency=4, rate=1.0, cache=None):
     """
     Main function to scrape Google Scholar using Playwright
     """
@@ -115,8 +120,11 @@ async def scrape_google_scholar_playwright(author_name):
     print(f"{'='*60}\n")
     
    
+    # One controller paces every stage: search, profile listing and publication pages
+    rate_limiter = AdaptiveRateController(rate)
+    
     print("📡 Step 1: Searching for author on Google Scholar...")
-    author_link = await search_author_with_playwright(author_name)
+    author_link = await search_author_with_playwright(author_name, rate_limiter)
     
     if not author_link:
         raise SystemExit("❌ Could not find author profile link.")
@@ -128,7 +136,7 @@ async def scrape_google_scholar_playwright(author_name):
     
 
     print("🌐 Step 3: Scraping publications with Playwright...")
-    publications = await scrape_publications_with_playwright(author_link)
+    publications = await scrape_publications_with_playwright(author_link, concurrency, rate, cache, rate_limiter)
     
 
     print(f"\n💾 Step 5: Saving to Excel...")
@@ -137,27 +145,47 @@ async def scrape_google_scholar_playwright(author_name):
     print(f"\n{'='*60}")
     print(f"✅ SUCCESS! Scraped {len(publications)} publications")
     print(f"📁 Saved to: {filename}")
+    if cache:
+        stats = cache.stats()
+        print(f"🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+    rate_limiter.report()
     print(f"{'='*60}\n")
     
     return publications
 
 
-async def search_author_with_playwright(author_name):
+async def paced_goto(page, url, rate_limiter):
+    """Navigate once the host has a request token, and report the latency"""
+    await rate_limiter.wait(url)
+    start = time.monotonic()
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+    except Exception:
+        rate_limiter.record(url, outcome="error")
+        raise
+    rate_limiter.record(url, time.monotonic() - start)
+
+
+async def search_author_with_playwright(author_name, rate_limiter=None):
     """Search for author on Google Scholar using Playwright and return profile link"""
+    rate_limiter = rate_limiter or AdaptiveRateController()
+    scholar_url = "https://scholar.google.com"
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
         page = await browser.new_page()
         
         try:
            
-            await page.goto("https://scholar.google.com", wait_until="domcontentloaded")
-            await asyncio.sleep(2)
+            await paced_goto(page, scholar_url, rate_limiter)
+            await rate_limiter.pause(1.5, 2.5, scholar_url)
             
            
             search_box = page.locator('input[name="q"]')
             await search_box.fill(author_name)
+            # Submitting the search is a request to Scholar too
+            await rate_limiter.wait(scholar_url)
             await search_box.press("Enter")
-            await asyncio.sleep(3)
+            await rate_limiter.pause(2.5, 3.5, scholar_url)
             
 
             profile_links = await page.locator('a[href*="/citations?user="]').all()
@@ -196,52 +224,23 @@ async def search_author_with_playwright(author_name):
             return None
 
 
-async def get_author_profile_link(author_name):
+async def get_author_profile_link(author_name, http_client=None):
     """Use ScraperAPI to get author profile link from Google Scholar"""
     try:
-        conn = http.client.HTTPSConnection("scraperapi.thordata.com")
-        params = {
-            "engine": "google_scholar",
-            "q": author_name,
-            "json": "1",
-            "start": "0"
-        }
-        payload = urlencode(params)
-        headers = {
-            'Authorization': f'Bearer {SCRAPER_API_KEY}',
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        
-        conn.request("POST", "/request", payload, headers)
-        res = conn.getresponse()
-        raw = res.read().decode("utf-8")
-        
-        data = json.loads(raw)
-        if isinstance(data, str):
-            data = json.loads(data)
-        
-        organic = data.get("organic_results", [])
-        if not organic:
-            return None
-        
-       
-        for result in organic:
-            authors = result.get("publication_info", {}).get("authors", [])
-            if authors:
-                author_link = authors[0].get("link")
-                if author_link:
-                    return "https://scholar.google.com" + author_link
-        
-        return None
+        if http_client:
+            return await SerpClient(SCRAPER_API_KEY, http_client).find_author_profile_link(author_name)
+        async with HttpClient() as client:
+            return await SerpClient(SCRAPER_API_KEY, client).find_author_profile_link(author_name)
         
-    except Exception as e:
+    except SerpError as e:
         print(f"❌ Error fetching author profile: {e}")
         return None
 
 
-async def scrape_publications_with_playwright(author_link):
+async def scrape_publications_with_playwright(author_link, concurrency=4, rate=1.0, cache=None, rate_limiter=None):
     """Scrape all publications from Google Scholar profile using Playwright"""
     publications = []
+    rate_limiter = rate_limiter or AdaptiveRateController(rate)
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
@@ -249,7 +248,7 @@ async def scrape_publications_with_playwright(author_link):
         
         try:
             # Navigate to author profile
-            await page.goto(author_link, wait_until="domcontentloaded")
+            await paced_goto(page, author_link, rate_limiter)
             
             # Wait for publications table
             await page.wait_for_selector(".gsc_a_at", timeout=10000)
@@ -260,16 +259,18 @@ async def scrape_publications_with_playwright(author_link):
                 try:
                     # Scroll to bottom
                     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(1)
+                    await rate_limiter.pause(0.5, 1.5, author_link)
                     
                     # Try to find and click "Show more" button
                     show_more = page.locator("button:has-text('Show more')")
                     
                     if await show_more.count() > 0 and await show_more.is_enabled():
+                        # Each click loads the next page of rows from Scholar
+                        await rate_limiter.wait(author_link)
                         await show_more.click()
                         click_count += 1
                         print(f"  📄 Clicked 'Show more' ({click_count} times)...")
-                        await asyncio.sleep(2)
+                        await rate_limiter.pause(1.5, 2.5, author_link)
                     else:
                         break
                         
@@ -281,44 +282,28 @@ async def scrape_publications_with_playwright(author_link):
             
             print(f"✅ All publications loaded.\n")
             
-            # Get all publication links - need to do this before browser closes
-            pub_elements = await page.locator(".gsc_a_tr").all()
-            print(f"📚 Found {len(pub_elements)} publications. Extracting details...\n")
+            # Parse every row from one HTML snapshot instead of per-cell locator calls
+            rows = parse_profile_rows(await page.content())
+            print(f"📚 Found {len(rows)} publications. Extracting details...\n")
             
-            # Extract publication data
-            for i, pub_row in enumerate(pub_elements, 1):
-                try:
-                    title_elem = pub_row.locator(".gsc_a_at")
-                    title = await title_elem.inner_text()
-                    href = await title_elem.get_attribute("href")
-                    
-                    # Get year and citations from the row
-                    year_elem = pub_row.locator(".gsc_a_y span")
-                    year = await year_elem.inner_text() if await year_elem.count() > 0 else "N/A"
-                    
-                    citations_elem = pub_row.locator(".gsc_a_c a")
-                    citations = await citations_elem.inner_text() if await citations_elem.count() > 0 else "0"
-                    citations = citations if citations else "0"
-                    
-                    print(f"{i}. {title[:60]}... (Year: {year}, Citations: {citations})")
-                    
-                    # Get abstract by opening publication page
-                    abstract = await get_abstract_from_publication_page(browser, href)
-                    
-                    publications.append({
-                        "title": title.strip(),
-                        "year": year,
-                        "citations": citations,
-                        "abstract": abstract,
-                        "scopus_id": None,
-                        "scopus_eid": None,
-                        "scopus_doi": None,
-                        "scopus_year": None
-                    })
-                    
-                except Exception as e:
-                    print(f"  ⚠️  Error extracting publication {i}: {e}")
-                    continue
+            for i, (title, href, year, citations) in enumerate(rows, 1):
+                print(f"{i}. {title[:60]}... (Year: {year or 'N/A'}, Citations: {citations})")
+            
+            # Get abstracts by opening publication pages, `concurrency` at a time
+            print(f"\n📖 Fetching {len(rows)} abstracts ({concurrency} pages in parallel)...")
+            async with PagePool(browser.new_page, concurrency) as pool:
+                abstracts = await fetch_abstracts(
+                    pool,
+                    [href for _, href, _, _ in rows],
+                    partial(get_abstract_from_publication_page, pacer=rate_limiter),
+                    author_link,
+                    rate_limiter,
+                    cache,
+                )
+                pool.report()
+            
+            for row, abstract in zip(rows, abstracts):
+                publications.append(Publication.from_row(row, abstract))
             
         finally:
             await browser.close()
@@ -326,43 +311,36 @@ async def scrape_publications_with_playwright(author_link):
     return publications
 
 
-async def get_abstract_from_publication_page(browser, pub_href):
-    """Navigate to publication page and extract abstract"""
-    if not pub_href:
-        return "(No abstract found)"
+async def get_abstract_from_publication_page(page, full_url, pub_num=None, pacer=None):
+    """
+    Navigate a pooled page to the publication page and extract abstract.
+    fetch_abstracts has already waited for the request token; `pacer` gets the latency and sets the dwells.
+    """
+    abstract_text = NO_ABSTRACT
+    pacer = pacer or AdaptiveRateController()
     
-    abstract_text = "(No abstract found)"
+    start = time.monotonic()
+    await page.goto(full_url, wait_until="domcontentloaded", timeout=10000)
+    pacer.record(full_url, time.monotonic() - start)
+    await pacer.pause(0.5, 1.5, full_url)
     
-    try:
-        # Open in new page
-        new_page = await browser.new_page()
-        full_url = f"https://scholar.google.com{pub_href}" if pub_href.startswith("/") else pub_href
-        
-        await new_page.goto(full_url, wait_until="domcontentloaded", timeout=10000)
-        await asyncio.sleep(1)
-        
-        # Scroll to trigger lazy loading
-        await new_page.evaluate("window.scrollTo(0, 300)")
-        await asyncio.sleep(1)
-        
-        # Try multiple selectors
-        selectors = [".gsh_csp", ".gsh_csp_ab", ".gsh_small", "#gsc_oci_value", ".gsc_oci_value"]
-        
-        for selector in selectors:
-            try:
-                elem = new_page.locator(selector).first
-                if await elem.count() > 0:
-                    text = await elem.inner_text()
-                    if text and len(text.strip()) > 10:
-                        abstract_text = text.strip()
-                        break
-            except:
-                continue
-        
-        await new_page.close()
-        
-    except Exception as e:
-        print(f"    ⚠️  Could not fetch abstract: {str(e)[:50]}")
+    # Scroll to trigger lazy loading
+    await page.evaluate("window.scrollTo(0, 300)")
+    await pacer.pause(0.5, 1.5, full_url)
+    
+    # Try multiple selectors
+    selectors = [".gsh_csp", ".gsh_csp_ab", ".gsh_small", "#gsc_oci_value", ".gsc_oci_value"]
+    
+    for selector in selectors:
+        try:
+            elem = page.locator(selector).first
+            if await elem.count() > 0:
+                text = await elem.inner_text()
+                if text and len(text.strip()) > 10:
+                    abstract_text = text.strip()
+                    break
+        except:
+            continue
     
     return abstract_text
 
@@ -370,95 +348,19 @@ async def get_abstract_from_publication_page(browser, pub_href):
 def enrich_with_scopus_data(publications, scopus_author_id):
     """Enrich publications with Scopus data"""
     for i, pub in enumerate(publications, 1):
-        print(f"  {i}/{len(publications)} Checking Scopus for: {pub['title'][:50]}...")
+        print(f"  {i}/{len(publications)} Checking Scopus for: {pub.title[:50]}...")
         
-        scopus_data = get_scopus_publication_details(scopus_author_id, pub["title"])
+        scopus_data = get_scopus_publication_details(scopus_author_id, pub.title)
         
         if scopus_data:
-            pub["scopus_id"] = scopus_data.get("scopus_id", "N/A")
-            pub["scopus_eid"] = scopus_data.get("eid", "N/A")
-            pub["scopus_doi"] = scopus_data.get("doi", "N/A")
-            pub["scopus_year"] = scopus_data.get("publication_year", "N/A")
-            print(f"    ✅ Found in Scopus (Year: {pub['scopus_year']})")
+            pub.apply_scopus(scopus_data)
+            print(f"    ✅ Found in Scopus (Year: {pub.scopus_year or 'N/A'})")
         else:
             print(f"    ⚠️  Not found in Scopus")
     
     return publications
 
 
-def save_to_excel(publications, author_name, scopus_author_id):
-    """Save publications to Excel file with formatting"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Publications"
-    
-    # Header styling
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    
-    # Headers
-    headers = [
-        "No.",
-        "Author Name",
-        "Scopus Author ID",
-        "Publication Title",
-        "Abstract",
-        "Publication Year (Scholar)",
-        "Publication Year (Scopus)",
-        "Citations (Scholar)",
-        "Scopus Document ID",
-        "Scopus EID",
-        "DOI"
-    ]
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Set column widths
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 20
-    ws.column_dimensions['D'].width = 50
-    ws.column_dimensions['E'].width = 80
-    ws.column_dimensions['F'].width = 15
-    ws.column_dimensions['G'].width = 15
-    ws.column_dimensions['H'].width = 12
-    ws.column_dimensions['I'].width = 20
-    ws.column_dimensions['J'].width = 30
-    ws.column_dimensions['K'].width = 25
-    
-    # Add data
-    for i, pub in enumerate(publications, 1):
-        row = i + 1
-        ws.cell(row, 1, i)
-        ws.cell(row, 2, author_name)
-        ws.cell(row, 3, scopus_author_id or "N/A")
-        ws.cell(row, 4, pub["title"])
-        ws.cell(row, 5, pub["abstract"])
-        ws.cell(row, 6, pub["year"])
-        ws.cell(row, 7, pub.get("scopus_year", "N/A"))
-        ws.cell(row, 8, pub["citations"])
-        ws.cell(row, 9, pub.get("scopus_id", "N/A"))
-        ws.cell(row, 10, pub.get("scopus_eid", "N/A"))
-        ws.cell(row, 11, pub.get("scopus_doi", "N/A"))
-        
-        # Apply alignment
-        for col in range(1, 12):
-            ws.cell(row, col).alignment = Alignment(vertical="top", wrap_text=True)
-    
-    # Save file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"publications_{author_name.replace(' ', '_')}_{timestamp}.xlsx"
-    wb.save(filename)
-    
-    return filename
-
-
 # ---------------- Main Entry Point ----------------
 async def main():
     parser = argparse.ArgumentParser(
@@ -470,6 +372,29 @@ async def main():
         nargs="?",
         help="Author name to search for (e.g., 'John Smith')"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of publication pages to fetch in parallel (default: 4)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Maximum publication page requests per second per host (default: 1.0)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".scholar_cache",
+        help="Directory for the publication page cache (default: .scholar_cache)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch every publication page again instead of using the cache"
+    )
     
     args = parser.parse_args()
     
@@ -481,7 +406,12 @@ async def main():
     else:
         author_name = args.author_name
     
-    await scrape_google_scholar_playwright(author_name)
+    cache = None if args.no_cache else PageCache(args.cache_dir)
+    try:
+        await scrape_google_scholar_playwright(author_name, args.concurrency, args.rate, cache)
+    finally:
+        if cache:
+            cache.close()
 
 
 if __name__ == "__main__":
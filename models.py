@@ -0,0 +1,191 @@
+"""
+Typed result model shared by every stage of a scrape.
+
+Publications are `__slots__` dataclasses with real ints and None for
+missing values instead of 8-key dicts full of "N/A", "0" and
+"(No abstract found)" strings. Placeholder text is only produced by the
+Excel export. `to_dict` drops empty fields for compact JSONL records;
+`to_columns` stores a list of publications column by column (one list per
+field), which is how the per-author result files are written.
+"""
+import hashlib
+from dataclasses import dataclass, field, fields
+from urllib.parse import urlparse, parse_qsl
+
+from abstract_fetcher import NO_ABSTRACT, CAPTCHA_BLOCKED, FETCH_FAILED
+
+
+# Placeholder strings of older result files and the fetch layer
+PLACEHOLDERS = {"", "N/A", NO_ABSTRACT, CAPTCHA_BLOCKED, FETCH_FAILED}
+
+# Outcome of reading a publication page: abstract found, page without an
+# abstract, CAPTCHA page, or fetch error (timeout, network error, 5xx).
+# Blocked and failed pages say nothing about the publication and are fetched again.
+ABSTRACT_STATUSES = ("ok", "none", "blocked", "failed")
+RETRY_STATUSES = {"blocked", "failed"}
+
+
+def parse_int(value):
+    """Int from 2020, "2020", "1,234" or "2020-05-01"; None for placeholders"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    # Dates such as Scopus' "2020-05-01" count by their year
+    digits = str(value).strip().replace(",", "").split("-")[0]
+    return int(digits) if digits.isdigit() else None
+
+
+def optional_text(value):
+    """Stripped text, or None for empty values and placeholders"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value in PLACEHOLDERS else value
+
+
+def abstract_status(abstract):
+    """Status of an abstract text from the fetch layer (see ABSTRACT_STATUSES)"""
+    if abstract == CAPTCHA_BLOCKED:
+        return "blocked"
+    if abstract == FETCH_FAILED:
+        return "failed"
+    return "ok" if optional_text(abstract) else "none"
+
+
+@dataclass(slots=True)
+class Publication:
+    title: str
+    year: int | None = None
+    citations: int = 0
+    abstract: str | None = None
+    link: str | None = None
+    abstract_status: str = "none"    # one of ABSTRACT_STATUSES
+    scopus_id: str | None = None
+    scopus_eid: str | None = None
+    scopus_doi: str | None = None
+    scopus_year: int | None = None
+    author_name: str | None = None   # set on combined batch results
+
+    @property
+    def pub_id(self):
+        """Stable ID: Scholar's citation_for_view id, else a hash of title and year"""
+        if self.link:
+            citation_id = dict(parse_qsl(urlparse(self.link).query)).get("citation_for_view")
+            if citation_id:
+                return citation_id
+        key = f"{' '.join(self.title.lower().split())}|{self.year or ''}"
+        return "t:" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_row(cls, row, abstract=None):
+        """Publication for a ProfileRow and the abstract text from the fetch layer"""
+        title, href, year, citations = row
+        return cls(
+            title=title.strip(),
+            year=parse_int(year),
+            citations=parse_int(citations) or 0,
+            abstract=optional_text(abstract),
+            link=href,
+            abstract_status=abstract_status(abstract),
+        )
+
+    @property
+    def needs_refetch(self):
+        """The publication page was blocked or failed, so its abstract is unknown"""
+        return self.abstract_status in RETRY_STATUSES
+
+    def set_abstract(self, abstract):
+        """Store an abstract from the fetch layer (placeholders become None)"""
+        self.abstract = optional_text(abstract)
+        self.abstract_status = abstract_status(abstract)
+
+    def apply_scopus(self, details):
+        """Copy the fields of a Scopus document (see scopus_client.entry_details)"""
+        self.scopus_id = optional_text(details.get("scopus_id"))
+        self.scopus_eid = optional_text(details.get("eid"))
+        self.scopus_doi = optional_text(details.get("doi"))
+        self.scopus_year = parse_int(details.get("publication_year"))
+
+    def to_dict(self):
+        """Compact dict: the stable id plus every field that is not empty"""
+        record = {"id": self.pub_id}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is not None and value is not False:
+                record[f.name] = value
+        return record
+
+    @classmethod
+    def from_dict(cls, record):
+        """Publication from `to_dict` output or a dict written by older versions"""
+        abstract = record.get("abstract")
+        status = record.get("abstract_status")
+        if status not in ABSTRACT_STATUSES:
+            status = "blocked" if record.get("abstract_blocked") else abstract_status(abstract)
+        return cls(
+            title=(record.get("title") or "").strip(),
+            year=parse_int(record.get("year")),
+            citations=parse_int(record.get("citations")) or 0,
+            abstract=optional_text(abstract),
+            link=record.get("link"),
+            abstract_status=status,
+            scopus_id=optional_text(record.get("scopus_id")),
+            scopus_eid=optional_text(record.get("scopus_eid")),
+            scopus_doi=optional_text(record.get("scopus_doi")),
+            scopus_year=parse_int(record.get("scopus_year")),
+            author_name=record.get("author_name"),
+        )
+
+
+FIELD_NAMES = [f.name for f in fields(Publication)]
+
+
+def to_columns(publications):
+    """Column-oriented form of a publication list: {field: [value per publication]}"""
+    columns = {name: [] for name in FIELD_NAMES}
+    for pub in publications:
+        for name in FIELD_NAMES:
+            columns[name].append(getattr(pub, name))
+    # Columns that are empty for every publication are left out
+    return {name: values for name, values in columns.items()
+            if any(value is not None and value is not False for value in values)}
+
+
+def from_columns(columns):
+    """Publication list from `to_columns` output"""
+    count = max((len(values) for values in columns.values()), default=0)
+    known = {name: values for name, values in columns.items() if name in FIELD_NAMES}
+    # Result files written before abstract_status have an abstract_blocked column
+    if "abstract_status" not in known and "abstract_blocked" in columns:
+        abstracts = columns.get("abstract") or [None] * count
+        known["abstract_status"] = [
+            "blocked" if blocked else abstract_status(abstract)
+            for blocked, abstract in zip(columns["abstract_blocked"], abstracts)
+        ]
+    return [
+        Publication(**{name: values[i] for name, values in known.items()})
+        for i in range(count)
+    ]
+
+
+@dataclass(slots=True)
+class Author:
+    name: str
+    scholar_link: str | None = None
+    scopus_author_id: str | None = None
+    publications: list = field(default_factory=list)
+
+    @property
+    def scholar_id(self):
+        """Scholar user id from the profile link"""
+        return dict(parse_qsl(urlparse(self.scholar_link or "").query)).get("user")
+
+    def to_dict(self):
+        """Author fields without the publications"""
+        return {
+            "name": self.name,
+            "scholar_link": self.scholar_link,
+            "scholar_id": self.scholar_id,
+            "scopus_author_id": self.scopus_author_id,
+        }
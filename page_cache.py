@@ -0,0 +1,146 @@
+"""
+Persistent on-disk cache for Google Scholar publication detail pages.
+
+Extracted page content is stored in a small SQLite database keyed by the
+normalized `view_citation` href, so re-running an author only has to open
+publication pages that were not seen before (or whose entry has expired).
+"""
+import os
+import sqlite3
+import time
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+
+# Eviction frees space down to this fraction of max_bytes, so it runs once per batch of puts
+EVICT_TO = 0.9
+
+# Query parameters that do not change which publication a link points to
+VOLATILE_PARAMS = {"hl", "oi", "oe", "as_sdt", "sortby", "cstart", "pagesize"}
+
+
+def normalize_citation_url(pub_href):
+    """Build a stable cache key for a publication link (host and UI params ignored)"""
+    parsed = urlparse(pub_href)
+    params = dict(parse_qsl(parsed.query))
+
+    # citation_for_view ("USER_ID:PUB_ID") uniquely identifies a Scholar publication
+    if params.get("citation_for_view"):
+        return f"citation_for_view={params['citation_for_view']}"
+
+    kept = sorted((k, v) for k, v in params.items() if k not in VOLATILE_PARAMS)
+    return f"{parsed.path}?{urlencode(kept)}"
+
+
+class PageCache:
+    """
+    SQLite content cache with TTL expiry and size-based LRU eviction.
+    The total size is kept up to date by triggers in a one-row table, so
+    a put does not have to sum the whole cache (and the worker processes
+    sharing the file see each other's writes).
+    """
+
+    def __init__(self, cache_dir=".scholar_cache", ttl_days=30, max_bytes=200 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "pages.sqlite3")
+        self.ttl = ttl_days * 24 * 3600
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # The worker processes of sharded_scrape.py share one cache file
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at)")
+        self.conn.executescript(
+            """CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+            INSERT OR IGNORE INTO cache_size SELECT 0, COALESCE(SUM(size), 0) FROM pages;
+            CREATE TRIGGER IF NOT EXISTS pages_size_insert AFTER INSERT ON pages BEGIN
+                UPDATE cache_size SET bytes = bytes + new.size;
+            END;
+            CREATE TRIGGER IF NOT EXISTS pages_size_delete AFTER DELETE ON pages BEGIN
+                UPDATE cache_size SET bytes = bytes - old.size;
+            END;
+            CREATE TRIGGER IF NOT EXISTS pages_size_update AFTER UPDATE OF size ON pages BEGIN
+                UPDATE cache_size SET bytes = bytes + new.size - old.size;
+            END;"""
+        )
+        self.conn.commit()
+
+    def get(self, url):
+        """Return cached content for the URL, or None on a miss or expired entry"""
+        key = normalize_citation_url(url)
+        row = self.conn.execute(
+            "SELECT content, created_at FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+
+        if row is None or (self.ttl and now - row[1] > self.ttl):
+            if row is not None:
+                self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self.conn.commit()
+            self.misses += 1
+            return None
+
+        self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+        self.hits += 1
+        return row[0]
+
+    def put(self, url, content):
+        key = normalize_citation_url(url)
+        now = time.time()
+        # An upsert rather than INSERT OR REPLACE, whose implicit delete would skip the size trigger
+        self.conn.execute(
+            "INSERT INTO pages (key, url, content, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET url = excluded.url, content = excluded.content, "
+            "size = excluded.size, created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+            (key, url, content, len(content.encode("utf-8")), now, now),
+        )
+        self.conn.commit()
+        self._evict()
+
+    def size(self):
+        """Total size of the cached content in bytes"""
+        return self.conn.execute("SELECT bytes FROM cache_size").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used entries once the cache outgrows max_bytes"""
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+
+        # Walk the accessed_at index only as far as needed, then delete
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            victims.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM pages WHERE key = ?", victims)
+        self.conn.commit()
+        self.evictions += len(victims)
+
+    def stats(self):
+        entries = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        size = self.size()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        self.conn.close()
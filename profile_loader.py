@@ -0,0 +1,94 @@
+"""
+Load a Google Scholar profile's publication list over plain HTTP.
+
+The citations list is requested page by page with `cstart`/`pagesize=100`
+instead of clicking "Show more" in a browser, so a 300-paper profile takes
+four requests. Callers fall back to the browser when this raises.
+"""
+import re
+import time
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+from http_client import HTTP_ERRORS
+from scholar_parser import parse_profile_rows
+
+
+PAGE_SIZE = 100
+MAX_PAGES = 50
+# Listings are cut off after this many rows (here and in SerpClient.list_author_publications)
+MAX_ROWS = PAGE_SIZE * MAX_PAGES
+
+# The CAPTCHA form of Scholar's "unusual traffic" page, or a form posting to Google's /sorry/ page
+CAPTCHA_FORM = re.compile(r"""<form\b[^>]*\b(?:id=["']?gs_captcha_f\b|action=["']?[^"'\s>]*/sorry/)""", re.I)
+
+
+class ProfileFetchError(Exception):
+    """The profile could not be loaded over plain HTTP"""
+
+
+def profile_page_url(author_link, cstart, pagesize=PAGE_SIZE):
+    """Profile URL for one page of the publication list"""
+    parsed = urlparse(author_link)
+    params = dict(parse_qsl(parsed.query))
+    params.update({"cstart": str(cstart), "pagesize": str(pagesize)})
+    params.setdefault("hl", "en")
+    return urlunparse(parsed._replace(query=urlencode(params)))
+
+
+def listing_complete(rows):
+    """Whether a profile listing can hold every publication: one that reached MAX_ROWS may be cut short"""
+    return len(rows) < MAX_ROWS
+
+
+def looks_blocked(html, url=None):
+    """
+    Whether a response is a CAPTCHA page instead of the requested one: its
+    final `url` is Google's /sorry/ page or it holds the CAPTCHA form. Pages
+    that merely mention reCAPTCHA or unusual traffic (e.g. in an abstract)
+    are not blocked.
+    """
+    if url and "/sorry/" in urlparse(url).path:
+        return True
+    return bool(CAPTCHA_FORM.search(html))
+
+
+async def fetch_profile_rows(client, author_link, max_pages=MAX_PAGES, pacer=None):
+    """
+    Fetch every publication row of the profile with a pooled HttpClient.
+    Requests are paced and reported through the AdaptiveRateController `pacer`.
+    """
+    rows = []
+    for page_num in range(max_pages):
+        url = profile_page_url(author_link, page_num * PAGE_SIZE)
+        if pacer:
+            await pacer.wait(url)
+        start = time.monotonic()
+        try:
+            status, html, final_url = await client.get_page(url)
+        except HTTP_ERRORS as e:
+            if pacer:
+                pacer.record(url, outcome="error")
+            raise ProfileFetchError(f"request failed: {e}") from e
+
+        blocked = status in (403, 429) or looks_blocked(html, final_url)
+        if pacer:
+            outcome = "blocked" if blocked else "error" if status != 200 else "ok"
+            pacer.record(url, time.monotonic() - start, outcome)
+
+        if blocked:
+            raise ProfileFetchError("blocked by CAPTCHA / unusual traffic page")
+        if status != 200:
+            raise ProfileFetchError(f"HTTP {status} for {url}")
+        if "gsc_a_t" not in html:
+            raise ProfileFetchError("response has no publication table")
+
+        page_rows = parse_profile_rows(html)
+        rows.extend(page_rows)
+        print(f"  📄 Loaded publications {page_num * PAGE_SIZE + 1}-{len(rows)} over HTTP")
+
+        if len(page_rows) < PAGE_SIZE:
+            break
+    else:
+        print(f"  ⚠️  Stopped after {max_pages} pages; publications beyond them are not listed")
+
+    return rows
@@ -0,0 +1,154 @@
+"""
+Adaptive pacing of requests to Google Scholar.
+
+One AdaptiveRateController is shared by every stage of a run. Before each
+request a stage takes a token from the host's bucket (`wait`), afterwards it
+reports how the request went (`record`):
+
+- blocked (CAPTCHA, 429): interval doubles and the bucket is emptied
+- error (exception, 5xx): interval grows by half
+- slow (latency EWMA above 2x the target): interval grows by a quarter
+- every `speedup_after` fast successes in a row: interval shrinks by a fifth
+
+The interval stays between 1/max_rate and `max_interval`. The human-like
+dwells between page actions (`pause`) shrink with it while the host answers
+quickly. Every interval change is printed and, with `log_path`, appended
+to a JSONL file for tuning throughput per host.
+"""
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlparse
+
+
+class HostPace:
+    """Token bucket and response statistics of one host"""
+
+    def __init__(self, interval, burst):
+        self.interval = interval
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.latency = None       # EWMA of response latency in seconds
+        self.streak = 0           # fast successes since the last change
+        self.requests = 0
+        self.errors = 0
+        self.blocks = 0
+
+    def refill(self, now):
+        if self.interval:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) / self.interval)
+        else:
+            self.tokens = float(self.burst)
+        self.refilled_at = now
+
+
+class AdaptiveRateController:
+    """Per-host token bucket whose interval adapts to latency, errors and blocks"""
+
+    def __init__(self, rate=0.5, max_rate=None, max_interval=60.0, burst=1, target_latency=2.0,
+                 speedup_after=5, log_path=None, verbose=True):
+        self.base_interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.min_interval = 1.0 / max_rate if max_rate else self.base_interval / 4
+        self.max_interval = max(max_interval, self.base_interval)
+        self.burst = max(1, burst)
+        self.target_latency = target_latency
+        self.speedup_after = speedup_after
+        self.log_path = log_path
+        self.verbose = verbose
+        self.hosts = {}
+
+    def _host(self, url):
+        host = urlparse(url).netloc or url
+        if host not in self.hosts:
+            self.hosts[host] = HostPace(self.base_interval, self.burst)
+        return host, self.hosts[host]
+
+    async def wait(self, url):
+        """Sleep until the URL's host has a request token to spend"""
+        _, pace = self._host(url)
+        while True:
+            now = time.monotonic()
+            pace.refill(now)
+            if pace.tokens >= 1:
+                pace.tokens -= 1
+                pace.requests += 1
+                return
+            await asyncio.sleep((1 - pace.tokens) * pace.interval)
+
+    def record(self, url, latency=None, outcome="ok"):
+        """Report a finished request: outcome is "ok", "error" or "blocked"; latency in seconds"""
+        host, pace = self._host(url)
+        if not self.base_interval:
+            return
+
+        if outcome == "blocked":
+            pace.blocks += 1
+            pace.tokens = 0.0
+            self._change(host, pace, pace.interval * 2, "blocked", latency)
+            return
+        if outcome == "error":
+            pace.errors += 1
+            self._change(host, pace, pace.interval * 1.5, "error", latency)
+            return
+
+        if latency is not None:
+            pace.latency = latency if pace.latency is None else 0.7 * pace.latency + 0.3 * latency
+        if pace.latency is not None and pace.latency > 2 * self.target_latency:
+            self._change(host, pace, pace.interval * 1.25, "slow", pace.latency)
+            return
+
+        pace.streak += 1
+        if pace.streak >= self.speedup_after:
+            self._change(host, pace, pace.interval * 0.8, "fast", pace.latency)
+
+    def _change(self, host, pace, interval, reason, latency):
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        pace.streak = 0
+        if abs(interval - pace.interval) < 1e-9:
+            return
+        old, pace.interval = pace.interval, interval
+
+        if self.verbose:
+            print(f"    ⏱️  {host}: {old:.2f}s → {interval:.2f}s between requests ({reason})")
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "time": round(time.time(), 3),
+                    "host": host,
+                    "reason": reason,
+                    "old_interval": round(old, 3),
+                    "interval": round(interval, 3),
+                    "latency": round(latency, 3) if latency is not None else None,
+                }) + "\n")
+
+    def dwell_scale(self, url=None):
+        """Factor for human-like dwells: below 1 while the host's interval is narrowed"""
+        if not url or not self.base_interval:
+            return 1.0
+        _, pace = self._host(url)
+        return min(1.0, pace.interval / self.base_interval)
+
+    async def pause(self, low, high, url=None):
+        """Human-like dwell of low..high seconds, shortened while `url`'s host answers quickly"""
+        await asyncio.sleep(random.uniform(low, high) * self.dwell_scale(url))
+
+    async def wait_until(self, condition, timeout, poll=1.0):
+        """Poll the async `condition` until it holds or `timeout` seconds passed"""
+        deadline = time.monotonic() + timeout
+        while not await condition():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll)
+        return True
+
+    def report(self):
+        for host, pace in self.hosts.items():
+            if not pace.requests:
+                continue
+            latency = f", avg latency {pace.latency:.2f}s" if pace.latency is not None else ""
+            print(
+                f"⏱️  {host}: {pace.requests} requests, {pace.errors} errors, {pace.blocks} blocks, "
+                f"final interval {pace.interval:.2f}s{latency}"
+            )
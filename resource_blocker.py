@@ -0,0 +1,85 @@
+"""
+Request interception that keeps browser pages from downloading assets.
+
+We only read text from Scholar pages (`.gsc_a_tr`, `#gsc_oci_*`), so images,
+fonts, stylesheets and media are aborted through `context.route` before
+they hit the network. Only the resource types on the allow-list get
+through. Playwright cannot tell how large an aborted response would have
+been, so the bytes saved are estimated from typical sizes per resource type.
+"""
+from collections import Counter
+
+
+DEFAULT_ALLOWED_TYPES = ("document", "script", "xhr", "fetch")
+
+# Rough transfer size of one Scholar asset of each type, for the savings estimate
+TYPICAL_BYTES = {
+    "image": 15_000,
+    "font": 40_000,
+    "stylesheet": 20_000,
+    "media": 200_000,
+}
+DEFAULT_TYPICAL_BYTES = 5_000
+
+
+def parse_resource_types(value):
+    """Parse a comma-separated list of Playwright resource types"""
+    return tuple(t.strip().lower() for t in value.split(",") if t.strip())
+
+
+def blocker_for_run(mode, headless, allowed_types=DEFAULT_ALLOWED_TYPES):
+    """
+    ResourceBlocker for `--block-resources auto|on|off`, or None.
+
+    `auto` only blocks in headless runs: a visible browser may have to show
+    a CAPTCHA, whose images must load for it to be solved by hand.
+    """
+    if mode == "on" or (mode == "auto" and headless):
+        return ResourceBlocker(allowed_types)
+    return None
+
+
+class ResourceBlocker:
+    """Abort every request whose resource type is not in `allowed_types`"""
+
+    def __init__(self, allowed_types=DEFAULT_ALLOWED_TYPES):
+        self.allowed_types = set(allowed_types)
+        self.blocked = Counter()   # resource type -> requests blocked
+        self.allowed = 0
+
+    async def install(self, context):
+        """Route all requests of a browser context through the blocker"""
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        resource_type = route.request.resource_type
+        if resource_type in self.allowed_types:
+            self.allowed += 1
+            await route.continue_()
+        else:
+            self.blocked[resource_type] += 1
+            await route.abort("blockedbyclient")
+
+    def bytes_saved(self):
+        return sum(
+            count * TYPICAL_BYTES.get(resource_type, DEFAULT_TYPICAL_BYTES)
+            for resource_type, count in self.blocked.items()
+        )
+
+    def stats(self):
+        return {
+            "requests_blocked": sum(self.blocked.values()),
+            "requests_allowed": self.allowed,
+            "blocked_by_type": dict(self.blocked),
+            "bytes_saved": self.bytes_saved(),
+        }
+
+    def report(self):
+        stats = self.stats()
+        if not stats["requests_blocked"]:
+            return
+        by_type = ", ".join(f"{count} {t}" for t, count in self.blocked.most_common())
+        print(
+            f"🚫 Blocked {stats['requests_blocked']} requests ({by_type}), "
+            f"≈{stats['bytes_saved'] / 1024 / 1024:.1f} MB not downloaded"
+        )
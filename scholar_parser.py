@@ -0,0 +1,244 @@
+"""
+Pure-Python parsers for saved Google Scholar HTML.
+
+The profile table is read from one `page.content()` snapshot instead of
+several locator round-trips per row, which also lets the parsing be run
+offline against saved pages. The same parsers read author search results
+and publication detail pages fetched over plain HTTP (`--engine http`).
+"""
+from collections import namedtuple
+from html.parser import HTMLParser
+
+from models import parse_int
+
+
+# year is an int or None, citations an int
+ProfileRow = namedtuple("ProfileRow", ["title", "href", "year", "citations"])
+AuthorCandidate = namedtuple("AuthorCandidate", ["name", "href", "affiliation", "cited_by", "interests"])
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+class _ProfileTableParser(HTMLParser):
+    """Collect title, link, year and citation count of every `tr.gsc_a_tr` row"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._row = None
+        self._stack = []   # (tag, classes, field) for elements open inside the current row
+
+    def _in_cell(self, cell_class):
+        return any(tag == "td" and cell_class in classes for tag, classes, _ in self._stack)
+
+    def _field(self):
+        for _, _, field in reversed(self._stack):
+            if field:
+                return field
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if tag == "tr" and "gsc_a_tr" in classes:
+            self._row = {"title": "", "href": None, "year": "", "citations": "", "_cited": False}
+            self._stack = []
+            return
+        if self._row is None:
+            return
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.handle_data(" ")
+            return
+
+        field = None
+        if tag == "a" and "gsc_a_at" in classes:
+            field = "title"
+            self._row["href"] = attrs.get("href")
+        elif tag == "span" and self._in_cell("gsc_a_y"):
+            field = "year"
+        elif tag == "a" and self._in_cell("gsc_a_c") and not self._row["_cited"]:
+            field = "citations"
+            self._row["_cited"] = True
+        self._stack.append((tag, classes, field))
+
+    def handle_endtag(self, tag):
+        if self._row is None:
+            return
+        if tag == "tr":
+            self._finish_row()
+            return
+        # Pop up to and including the matching open tag (tolerates unclosed children)
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        if self._row is None:
+            return
+        field = self._field()
+        if field:
+            self._row[field] += data
+
+    def _finish_row(self):
+        row = self._row
+        self._row = None
+        self._stack = []
+
+        title = " ".join(row["title"].split())
+        if not title:
+            return
+        self.rows.append(ProfileRow(
+            title=title,
+            href=row["href"],
+            year=parse_int(row["year"]),
+            citations=parse_int(row["citations"]) or 0,
+        ))
+
+
+def parse_profile_rows(html):
+    """Parse every publication row of a Scholar profile page"""
+    parser = _ProfileTableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+class _TextCollector(HTMLParser):
+    """
+    Collect the text of every element matching one of `selectors`
+    ('.class' or '#id'). Text of nested matches is added to all open ones.
+    """
+
+    def __init__(self, selectors):
+        super().__init__(convert_charrefs=True)
+        self.selectors = set(selectors)
+        self.texts = {selector: [] for selector in selectors}
+        self._stack = []   # (tag, [selectors opened by this element], [text buffers])
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.handle_data("\n")
+            return
+        attrs = dict(attrs)
+        keys = ["." + c for c in (attrs.get("class") or "").split()]
+        if attrs.get("id"):
+            keys.append("#" + attrs["id"])
+        opened = [key for key in keys if key in self.selectors]
+        self._stack.append((tag, opened, [[] for _ in opened]))
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                for _, opened, buffers in reversed(self._stack[i:]):
+                    for key, buffer in zip(opened, buffers):
+                        self.texts[key].append(" ".join("".join(buffer).split()))
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        for _, _, buffers in self._stack:
+            for buffer in buffers:
+                buffer.append(data)
+
+
+# Abstract containers on a publication page, in order of preference
+ABSTRACT_SELECTORS = ["#gsc_oci_descr", ".gsh_csp", ".gsh_csp_ab", ".gsh_small", ".gs_rs"]
+
+
+def parse_publication_abstract(html, min_length=20):
+    """Abstract text of a publication detail page, or None if there is none"""
+    collector = _TextCollector(ABSTRACT_SELECTORS + [".gsc_oci_field", ".gsc_oci_value"])
+    collector.feed(html)
+    collector.close()
+
+    for selector in ABSTRACT_SELECTORS:
+        for text in collector.texts[selector]:
+            if len(text) > min_length:
+                return text
+
+    # Fall back to the value next to the "Description" field of the details table
+    fields = collector.texts[".gsc_oci_field"]
+    values = collector.texts[".gsc_oci_value"]
+    for field, value in zip(fields, values):
+        if field.lower() == "description" and len(value) > min_length:
+            return value
+    return None
+
+
+class _AuthorSearchParser(HTMLParser):
+    """Collect the author cards (`div.gs_ai`) of a Scholar author search page"""
+
+    FIELDS = {"gs_ai_name": "name", "gs_ai_aff": "affiliation", "gs_ai_cby": "cited_by", "gs_ai_one_int": "interest"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.candidates = []
+        self._card = None
+        self._depth = 0
+        self._fields = []   # (depth, field) of open field elements
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if self._card is None:
+            if tag == "div" and "gs_ai" in classes:
+                self._card = {"name": "", "href": None, "affiliation": "", "cited_by": "", "interests": []}
+                self._depth = 1
+            return
+        if tag in VOID_TAGS:
+            return
+
+        self._depth += 1
+        href = attrs.get("href") or ""
+        if tag == "a" and self._card["href"] is None and "user=" in href:
+            self._card["href"] = href
+        for cls in classes:
+            if cls in self.FIELDS:
+                self._fields.append((self._depth, self.FIELDS[cls]))
+                if cls == "gs_ai_one_int":
+                    self._card["interests"].append("")
+
+    def handle_endtag(self, tag):
+        if self._card is None or tag in VOID_TAGS:
+            return
+        while self._fields and self._fields[-1][0] >= self._depth:
+            self._fields.pop()
+        self._depth -= 1
+        if self._depth == 0:
+            self._finish_card()
+
+    def handle_data(self, data):
+        if self._card is None or not self._fields:
+            return
+        field = self._fields[-1][1]
+        if field == "interest":
+            self._card["interests"][-1] += data
+        else:
+            self._card[field] += data
+
+    def _finish_card(self):
+        card = self._card
+        self._card = None
+        self._fields = []
+        if not card["href"]:
+            return
+        self.candidates.append(AuthorCandidate(
+            name=" ".join(card["name"].split()),
+            href=card["href"],
+            affiliation=" ".join(card["affiliation"].split()),
+            cited_by=int("".join(ch for ch in card["cited_by"] if ch.isdigit()) or 0),
+            interests=[" ".join(i.split()) for i in card["interests"] if i.strip()],
+        ))
+
+
+def parse_author_search(html):
+    """Author candidates listed on a Scholar author search results page"""
+    parser = _AuthorSearchParser()
+    parser.feed(html)
+    parser.close()
+    return parser.candidates
@@ -0,0 +1,844 @@
+"""
+Google Scholar scraping pipeline behind main_improved.py and batch_scrape.py.
+
+Kept apart from the command-line entry points so that `--help` and
+`--version` can answer before asyncio, aiohttp or Playwright are imported.
+"""
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import partial
+from urllib.parse import urljoin
+from config import get_key
+from abstract_fetcher import PagePool, fetch_abstracts, NO_ABSTRACT, CAPTCHA_BLOCKED
+from rate_control import AdaptiveRateController
+from scholar_parser import AuthorCandidate, parse_author_search, parse_profile_rows
+from http_client import HttpClient
+from profile_loader import fetch_profile_rows, listing_complete, ProfileFetchError
+from serp_client import SerpClient, SerpError
+from http_engine import HttpSlots, author_search_url, search_author_http, get_abstract_over_http
+from incremental import IncrementalPlan, author_state_key, state_path, load_previous_results, save_results
+from checkpoint import CheckpointJournal, checkpoint_path
+from models import Publication, Author
+from author_resolver import choose_candidate, mapping_key
+from store import open_store
+
+
+# ---------------- Configuration ----------------
+# API keys are read through config.get_key() by the steps that use them
+
+# Browser settings of this run, set by the entry points through configure_browser()
+HEADLESS = False
+RESOURCE_BLOCKER = None
+
+# User agents to rotate (anti-detection)
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+]
+
+
+# ---------------- Google Scholar Scraping Functions ----------------
+async def scrape_google_scholar_playwright(author_name_or_url, *, concurrency=3, rate=0.5, cache=None,
+                                          incremental=False, state_dir="results",
+                                          browser=None, pool=None, rate_limiter=None, http_client=None,
+                                          scopus_client=None, scopus_mode="index", resume=False,
+                                          engine="browser", recycle_after=50, store=None, dedup=None,
+                                          affiliation=None, topics=(), refresh_author=False, fallback=None):
+    """
+    Main function to scrape Google Scholar; returns the scraped Author.
+    All options are keyword-only.
+    
+    engine="browser" drives Playwright; engine="http" uses plain HTTP
+    requests (needs `http_client`) and only falls back to the browser when
+    blocked. A batch run passes the HttpSlots `pool` and the FallbackBrowser
+    `fallback` shared by all of its authors.
+    A name is resolved to a profile with resolve_author (`affiliation` and
+    `topics` tell people with the same name apart).
+    The author is saved to the PublicationStore `store` (by default the
+    one in `state_dir`), and the Excel file is exported from it. A batch
+    run shares one DedupIndex `dedup` between its authors, so papers of
+    co-authors are fetched and matched to Scopus once.
+    """
+    if engine == "http" and http_client is None:
+        raise ValueError("The http engine needs an HttpClient")
+    rate_limiter = rate_limiter or AdaptiveRateController(rate)
+    if engine == "http" and fallback is None:
+        async with FallbackBrowser(concurrency, recycle_after) as fallback:
+            return await scrape_google_scholar_playwright(
+                author_name_or_url, concurrency=concurrency, rate=rate, cache=cache, incremental=incremental,
+                state_dir=state_dir, browser=browser, pool=pool, rate_limiter=rate_limiter,
+                http_client=http_client, scopus_client=scopus_client, scopus_mode=scopus_mode, resume=resume,
+                engine=engine, recycle_after=recycle_after, store=store, dedup=dedup, affiliation=affiliation,
+                topics=topics, refresh_author=refresh_author, fallback=fallback
+            )
+    
+    print(f"\n{'='*60}")
+    print(f"🔍 Starting scrape for: {author_name_or_url}")
+    print(f"{'='*60}\n")
+    
+    with open_store(store, state_dir) as store:
+        # Steps 1-2: Scholar profile and Scopus author ID, from the cached mapping when possible
+        author_link, author_name, scopus_author_id = await resolve_author(
+            author_name_or_url, store, engine=engine, browser=browser, rate_limiter=rate_limiter,
+            http_client=http_client, scopus_client=scopus_client, affiliation=affiliation, topics=topics,
+            refresh=refresh_author, fallback=fallback
+        )
+        
+        # Previous results of this author, used to skip unchanged publications
+        key = author_state_key(author_link, author_name)
+        results_path = state_path(state_dir, author_link, author_name)
+        previous = None
+        if incremental:
+            # State files of runs before the store existed are still picked up
+            previous = store.publications(key) if store.has_author(key) else load_previous_results(results_path)
+            print(f"♻️  Incremental mode: {len(previous)} publications from previous run\n")
+        
+        # Checkpoint journal; with --resume its finished publications are skipped
+        journal = CheckpointJournal(checkpoint_path(state_dir, author_link, author_name), resume)
+        if resume:
+            print(f"⏯️  Resuming: {len(journal.completed)} publications already finished\n")
+            previous = (previous or []) + journal.completed
+        
+        # Step 3: Scrape publications
+        try:
+            if engine == "http":
+                print("🌐 Step 3: Scraping publications over plain HTTP...")
+                publications = await scrape_publications_http(
+                    author_link, http_client, concurrency, rate, cache, previous, rate_limiter, journal,
+                    recycle_after, dedup, pool, fallback
+                )
+            else:
+                print("🌐 Step 3: Scraping publications with Playwright...")
+                publications = await scrape_publications_with_playwright(
+                    author_link, concurrency, rate, cache, previous, browser, pool, rate_limiter, http_client,
+                    journal, recycle_after, dedup
+                )
+        finally:
+            journal.close()
+        
+        # Step 4: Enrich with Scopus data
+        if scopus_client and scopus_author_id:
+            print(f"\n🔬 Step 4: Enriching {len(publications)} publications with Scopus data...")
+            await enrich_with_scopus_data(publications, scopus_author_id, scopus_client, scopus_mode, dedup, key)
+        
+        # Step 5: Save to the store and export the author's rows to Excel
+        print(f"\n💾 Step 5: Saving to the publication store and Excel...")
+        author = Author(author_name, author_link, scopus_author_id, publications)
+        # A listing cut off at the row limit keeps the stored publications it did not reach
+        store.save_author(author, complete=listing_complete(publications))
+        filename = store.export_excel([key], author.name)
+        save_results(results_path, author)
+        journal.finish()
+        
+        print(f"\n{'='*60}")
+        print(f"✅ SUCCESS! Scraped {len(publications)} publications")
+        print(f"📁 Saved to: {filename}")
+        print_author_metrics(publications)
+        if cache:
+            stats = cache.stats()
+            print(f"🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        print(f"{'='*60}\n")
+        
+        return author
+
+
+async def resolve_author(author_name_or_url, store, *, engine="browser", browser=None, rate_limiter=None,
+                         http_client=None, scopus_client=None, affiliation=None, topics=(), refresh=False,
+                         fallback=None):
+    """
+    Steps 1-2: (profile link, author name, Scopus author ID) of a name or profile URL.
+    
+    Name searches rank every candidate profile (see author_resolver), and
+    the chosen Scholar profile and Scopus ID are cached in `store`, so later
+    runs skip the searches unless `refresh` is set. The Scopus ID is only
+    looked up (and returned) with a `scopus_client`.
+    """
+    # Check if input is a URL or author name
+    if author_name_or_url.startswith("http"):
+        author_link = author_name_or_url
+        print(f"✅ Using direct profile URL: {author_link}\n")
+        # Name the author after the Scholar user id in the URL
+        return author_link, author_state_key(author_link, "Scholar_Author"), None
+    
+    author_name = author_name_or_url
+    query = mapping_key(author_name, affiliation)
+    mapping = None if refresh else store.author_mapping(query)
+    if mapping:
+        author_link = mapping["scholar_link"]
+        print(f"♻️  Step 1: Using the profile chosen for '{author_name}' before: {author_link}")
+        print(f"   (pass --refresh-author to search again)\n")
+    else:
+        # Step 1: Search for author profile
+        print("📡 Step 1: Searching for author on Google Scholar...")
+        chosen = None
+        if engine == "http":
+            scraper_api_key = get_key("key")
+            serp_client = SerpClient(scraper_api_key, http_client) if scraper_api_key else None
+            chosen = await search_author_http(
+                http_client, author_name, serp_client, pacer=rate_limiter, affiliation=affiliation, topics=topics
+            )
+        if not chosen:
+            if browser is None and fallback is not None:
+                browser = await fallback.browser()
+            chosen = await search_author_with_playwright(author_name, browser, rate_limiter, affiliation, topics)
+        
+        if not chosen:
+            raise SystemExit("❌ Could not find author profile link.")
+        
+        author_link = chosen.href
+        print(f"✅ Found author profile: {chosen.name} ({chosen.affiliation or 'no affiliation'}) {author_link}\n")
+        mapping = store.save_author_mapping(
+            query, author_name, author_link, chosen.name, chosen.affiliation, chosen.interests
+        )
+    
+    # Step 2: Get Scopus Author ID (only with --scopus)
+    if not scopus_client:
+        return author_link, author_name, None
+    scopus_author_id = mapping["scopus_author_id"]
+    if scopus_author_id:
+        print(f"♻️  Step 2: Using the Scopus author ID chosen before: {scopus_author_id}")
+    else:
+        print("🔎 Step 2: Looking up Scopus author ID...")
+        # Without hints of its own, the Scopus search is steered by the chosen Scholar profile
+        scopus_author_id = await scopus_client.find_author_id(
+            author_name, affiliation or mapping["scholar_affiliation"], topics or mapping["interests"]
+        )
+        if scopus_author_id:
+            store.set_mapping_scopus_id(query, scopus_author_id)
+    return author_link, author_name, scopus_author_id
+
+
+def print_author_metrics(publications):
+    """One-line bibliometric summary of the scraped publications"""
+    from metrics import author_metrics
+    
+    m = author_metrics(publications)
+    m_quotient = f"{m['m_quotient']:.2f}" if m["m_quotient"] is not None else "N/A"
+    print(
+        f"📈 {m['citations']} citations, h-index {m['h_index']}, g-index {m['g_index']}, "
+        f"i10-index {m['i10_index']}, m-quotient {m_quotient}"
+    )
+
+
+def configure_browser(headless=False, resource_blocker=None):
+    """Choose headless mode and the ResourceBlocker installed on every browser context"""
+    global HEADLESS, RESOURCE_BLOCKER
+    HEADLESS = headless
+    RESOURCE_BLOCKER = resource_blocker
+
+
+async def prepare_context(context):
+    """Install the run's request interception (if any) on a new browser context"""
+    if RESOURCE_BLOCKER:
+        await RESOURCE_BLOCKER.install(context)
+
+
+async def launch_browser(p):
+    """Launch Chromium with anti-detection flags"""
+    return await p.chromium.launch(
+        headless=HEADLESS,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox'
+        ]
+    )
+
+
+@asynccontextmanager
+async def scholar_browser_context(browser=None):
+    """Yield (browser, context), launching a private browser unless a shared one is given"""
+    if browser is None:
+        # Playwright is only imported once a browser is really needed
+        from playwright.async_api import async_playwright
+        
+        async with async_playwright() as p:
+            own_browser = await launch_browser(p)
+            try:
+                async with scholar_browser_context(own_browser) as opened:
+                    yield opened
+            finally:
+                await own_browser.close()
+        return
+    
+    context = await browser.new_context(
+        user_agent=random.choice(USER_AGENTS),
+        viewport={'width': 1920, 'height': 1080},
+        locale='en-US'
+    )
+    await context.add_init_script("""Object.defineProperty(navigator, 'webdriver', {get: () => undefined})""")
+    await prepare_context(context)
+    try:
+        yield browser, context
+    finally:
+        await context.close()
+
+
+class FallbackBrowser:
+    """
+    Chromium for the parts of an `--engine http` run that Scholar blocks.
+
+    It is launched on first use only and shared by every author of a run,
+    together with one pool of at most `concurrency` stealth pages for
+    blocked publication pages.
+    """
+
+    def __init__(self, concurrency=3, recycle_after=50):
+        self.concurrency = concurrency
+        self.recycle_after = recycle_after
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._pool = None
+
+    async def browser(self):
+        async with self._lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+                
+                print("🌐 Launching the fallback browser...")
+                self._playwright = await async_playwright().start()
+                self._browser = await launch_browser(self._playwright)
+        return self._browser
+
+    async def pool(self):
+        """The shared PagePool of stealth pages"""
+        browser = await self.browser()
+        if self._pool is None:
+            self._pool = PagePool(lambda: new_stealth_page(browser), self.concurrency, self.recycle_after)
+        return self._pool
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.report()
+            await self._pool.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._pool = self._browser = self._playwright = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+async def paced_goto(page, url, pacer, **kwargs):
+    """Navigate once the host has a request token and report the response latency"""
+    await pacer.wait(url)
+    start = time.monotonic()
+    try:
+        await page.goto(url, **kwargs)
+    except Exception:
+        pacer.record(url, outcome="error")
+        raise
+    pacer.record(url, time.monotonic() - start)
+
+
+async def search_author_with_playwright(author_name, browser=None, rate_limiter=None, affiliation=None, topics=()):
+    """
+    Search Google Scholar's author profiles in the browser; returns the
+    AuthorCandidate that best matches the name and hints (see author_resolver), or None
+    """
+    pacer = rate_limiter or AdaptiveRateController()
+    scholar_url = "https://scholar.google.com"
+    
+    async with scholar_browser_context(browser) as (browser, context):
+        page = await context.new_page()
+        
+        try:
+            # Navigate to Google Scholar
+            await paced_goto(page, scholar_url, pacer, wait_until="domcontentloaded")
+            await pacer.pause(2, 4, scholar_url)
+            
+            # Simulate mouse movement
+            await page.mouse.move(100, 100)
+            await pacer.pause(0.5, 1, scholar_url)
+            
+            # The author search lists every profile with the name, affiliation and interests
+            await paced_goto(page, author_search_url(author_name, scholar_url), pacer, wait_until="domcontentloaded")
+            await pacer.pause(3, 5, scholar_url)
+            candidates = parse_author_search(await page.content())
+            
+            # Alternative: bare profile links, named by their link text
+            if not candidates:
+                for link in await page.locator('a[href*="/citations?user="]').all():
+                    href = await link.get_attribute("href")
+                    if href:
+                        candidates.append(AuthorCandidate((await link.inner_text()).strip(), href, "", 0, []))
+            
+            chosen = choose_candidate(author_name, candidates, affiliation, topics)
+            return chosen and chosen._replace(href=urljoin(scholar_url, chosen.href))
+            
+        except Exception as e:
+            print(f"⚠️  Error searching for author: {e}")
+            return None
+
+
+async def load_profile_with_playwright(context, author_link, rate_limiter=None):
+    """Load the whole profile in a browser by clicking "Show more" and parse its rows"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+    
+    pacer = rate_limiter or AdaptiveRateController()
+    page = await context.new_page()
+    
+    try:
+        # Navigate to author profile
+        await paced_goto(page, author_link, pacer, wait_until="domcontentloaded")
+        await pacer.pause(2, 4, author_link)
+        
+        # Simulate human behavior
+        await page.mouse.move(random.randint(100, 300), random.randint(100, 300))
+        
+        # Wait for publications table
+        await page.wait_for_selector(".gsc_a_at", timeout=10000)
+        
+        # Click "Show more" with human-like behavior
+        click_count = 0
+        while True:
+            try:
+                # Gradual scrolling
+                for i in range(3):
+                    await page.evaluate(f"window.scrollBy(0, {random.randint(200, 400)})")
+                    await pacer.pause(0.3, 0.7, author_link)
+                
+                await pacer.pause(1, 2, author_link)
+                
+                show_more = page.locator("button:has-text('Show more')")
+                
+                if await show_more.count() > 0 and await show_more.is_enabled():
+                    await show_more.hover()
+                    await pacer.pause(0.3, 0.6, author_link)
+                    # Every click loads the next rows from the server
+                    await pacer.wait(author_link)
+                    await show_more.click()
+                    click_count += 1
+                    print(f"  📄 Clicked 'Show more' ({click_count} times)...")
+                    await pacer.pause(2, 4, author_link)
+                else:
+                    break
+                    
+            except PlaywrightTimeout:
+                break
+            except Exception:
+                print(f"  ⚠️  No more publications to load.")
+                break
+        
+        # Parse every row from one HTML snapshot instead of per-cell locator calls
+        return parse_profile_rows(await page.content())
+        
+    finally:
+        await page.close()
+
+
+async def list_profile_rows_http(http_client, author_link, rate_limiter=None):
+    """
+    Load profile rows over plain HTTP (cstart/pagesize), then through the
+    ScraperAPI SERP endpoint. Returns None if both fail.
+    """
+    try:
+        return await fetch_profile_rows(http_client, author_link, pacer=rate_limiter)
+    except ProfileFetchError as e:
+        print(f"  ⚠️  Plain HTTP profile loading failed ({e}).")
+    
+    author_id = author_state_key(author_link, "")
+    scraper_api_key = get_key("key")
+    if scraper_api_key and author_id:
+        try:
+            print("  🔁 Listing publications through ScraperAPI...")
+            rows = await SerpClient(scraper_api_key, http_client).list_author_publications(author_id)
+            if rows:
+                return rows
+        except SerpError as e:
+            print(f"  ⚠️  ScraperAPI listing failed ({e}).")
+    
+    return None
+
+
+async def load_profile_rows(context, author_link, http_client=None, rate_limiter=None):
+    """Load profile rows without the browser if possible, otherwise click through it"""
+    if http_client is None:
+        async with HttpClient() as client:
+            return await load_profile_rows(context, author_link, client, rate_limiter)
+    
+    rows = await list_profile_rows_http(http_client, author_link, rate_limiter)
+    if rows is not None:
+        return rows
+    
+    print("  🌐 Falling back to the browser...")
+    return await load_profile_with_playwright(context, author_link, rate_limiter)
+
+
+async def collect_publications(rows, author_link, pool, extract, rate_limiter, cache=None, previous=None,
+                               journal=None, dedup=None):
+    """
+    Build the publication list for the profile rows, fetching abstracts of
+    new or changed rows through `pool` (browser pages or HTTP slots).
+    Every finished publication is appended to the checkpoint `journal`.
+    With a DedupIndex `dedup`, pages that a co-author already fetched are
+    reused and pages a co-author is fetching right now are waited for.
+    """
+    publications = []
+    
+    print(f"✅ All publications loaded.\n")
+    print(f"📚 Found {len(rows)} publications. Extracting details...\n")
+    
+    for i, (title, href, year, citations) in enumerate(rows, 1):
+        print(f"{i}. {title[:60]}... (Year: {year or 'N/A'}, Citations: {citations})")
+    
+    # Only new or changed rows need their publication page
+    plan = IncrementalPlan(rows, previous or [])
+    if previous is not None:
+        plan.report()
+    
+    fetched = {}
+    author = author_state_key(author_link, author_link)
+    
+    def record(i, abstract):
+        fetched[i] = abstract
+        if journal:
+            journal.append(Publication.from_row(rows[i], abstract))
+    
+    def checkpoint(indexes, claimed, n, abstract):
+        i = indexes[n]
+        if i in claimed:
+            dedup.resolve(claimed[i], abstract)
+        if journal:
+            journal.append(Publication.from_row(rows[i], abstract))
+    
+    # The per-host rate budget replaces the old fixed 5-8 second wait before every row.
+    # Rows whose co-author fetch failed come back for a second round.
+    remaining = plan.to_fetch
+    while remaining:
+        to_fetch, claimed, waiting = remaining, {}, {}
+        if dedup is not None:
+            to_fetch = []
+            for i in remaining:
+                outcome, value = dedup.claim(rows[i].title, rows[i].year, author)
+                if outcome == "shared":
+                    record(i, value)
+                elif outcome == "wait":
+                    waiting[i] = value
+                else:
+                    claimed[i] = value
+                    to_fetch.append(i)
+            if len(to_fetch) < len(remaining):
+                print(f"\n🔗 {len(remaining) - len(to_fetch)} publication pages are shared with co-authors")
+        
+        try:
+            if to_fetch:
+                print(f"\n📖 Fetching {len(to_fetch)} abstracts ({pool.size} in parallel)...")
+                abstracts = await fetch_abstracts(
+                    pool,
+                    [rows[i].href for i in to_fetch],
+                    extract,
+                    author_link,
+                    rate_limiter,
+                    cache,
+                    on_result=partial(checkpoint, to_fetch, claimed),
+                )
+                fetched.update(zip(to_fetch, abstracts))
+        finally:
+            # Failed and blocked pages wake their waiters empty-handed
+            for paper in claimed.values():
+                dedup.resolve(paper, None)
+        
+        remaining = []
+        for i, future in waiting.items():
+            abstract = await future
+            if abstract is None:
+                remaining.append(i)
+            else:
+                dedup.abstracts_shared += 1
+                record(i, abstract)
+    
+    for i, row in enumerate(rows):
+        if i in plan.reused:
+            # Unchanged publication: keep its details, refresh the citation count
+            pub = plan.reused[i]
+            pub.citations = row.citations
+            publications.append(pub)
+            continue
+        
+        publications.append(Publication.from_row(row, fetched[i]))
+    
+    return publications
+
+
+async def scrape_publications_with_playwright(author_link, concurrency=3, rate=0.5, cache=None, previous=None,
+                                              browser=None, pool=None, rate_limiter=None, http_client=None,
+                                              journal=None, recycle_after=50, dedup=None):
+    """
+    Scrape all publications from Google Scholar profile with anti-CAPTCHA measures.
+    
+    A batch run passes its shared `browser`, page `pool`, `rate_limiter` and
+    `http_client`; otherwise a private browser is launched for this profile only.
+    Pooled pages are recycled after `recycle_after` publications.
+    """
+    rate_limiter = rate_limiter or AdaptiveRateController(rate)
+    
+    async with scholar_browser_context(browser) as (browser, context):
+        rows = await load_profile_rows(context, author_link, http_client, rate_limiter)
+        
+        # Get abstracts through a pool of stealth pages
+        own_pool = pool is None
+        if own_pool:
+            pool = PagePool(lambda: new_stealth_page(browser), concurrency, recycle_after)
+        try:
+            return await collect_publications(
+                rows, author_link, pool, partial(get_abstract_from_publication_page, pacer=rate_limiter),
+                rate_limiter, cache, previous, journal, dedup
+            )
+        finally:
+            if own_pool:
+                pool.report()
+                await pool.close()
+
+
+async def scrape_publications_http(author_link, http_client, concurrency=3, rate=0.5, cache=None, previous=None,
+                                   rate_limiter=None, journal=None, recycle_after=50, dedup=None, slots=None,
+                                   fallback=None):
+    """
+    Scrape all publications without a browser (`--engine http`).
+    
+    Publication pages are fetched through the HttpSlots `slots` (a batch
+    shares one set between all authors). Chromium, the FallbackBrowser
+    `fallback`, is only started if the profile listing or some publication
+    pages are blocked over plain HTTP.
+    """
+    rate_limiter = rate_limiter or AdaptiveRateController(rate)
+    if fallback is None:
+        async with FallbackBrowser(concurrency, recycle_after) as fallback:
+            return await scrape_publications_http(
+                author_link, http_client, concurrency=concurrency, rate=rate, cache=cache, previous=previous,
+                rate_limiter=rate_limiter, journal=journal, recycle_after=recycle_after, dedup=dedup,
+                slots=slots, fallback=fallback
+            )
+    
+    rows = await list_profile_rows_http(http_client, author_link, rate_limiter)
+    if rows is None:
+        print("  🌐 Falling back to the browser for the profile listing...")
+        async with scholar_browser_context(await fallback.browser()) as (browser, context):
+            rows = await load_profile_with_playwright(context, author_link, rate_limiter)
+    
+    publications = await collect_publications(
+        rows, author_link, slots or HttpSlots(http_client, concurrency),
+        partial(get_abstract_over_http, pacer=rate_limiter), rate_limiter, cache, previous, journal, dedup
+    )
+    
+    blocked = [pub for pub in publications if pub.abstract_status == "blocked"]
+    if blocked:
+        print(f"\n🌐 {len(blocked)} publication pages were blocked over HTTP. Retrying them in the browser...")
+        
+        # Called for pages that were actually read, so failed retries are not offered to co-authors
+        def checkpoint(n, abstract):
+            blocked[n].set_abstract(abstract)
+            if dedup is not None:
+                dedup.resolve(dedup.paper_for(blocked[n]), abstract)
+            if journal:
+                journal.append(blocked[n])
+        
+        abstracts = await fetch_abstracts(
+            await fallback.pool(),
+            [pub.link for pub in blocked],
+            partial(get_abstract_from_publication_page, pacer=rate_limiter),
+            author_link,
+            rate_limiter,
+            cache,
+            on_result=checkpoint,
+        )
+        for pub, abstract in zip(blocked, abstracts):
+            pub.set_abstract(abstract)
+    
+    return publications
+
+
+async def new_stealth_page(browser):
+    """Create a page in its own context with realistic settings and stealth scripts"""
+    context = await browser.new_context(
+        user_agent=random.choice(USER_AGENTS),
+        viewport={'width': 1920, 'height': 1080},
+        locale='en-US',
+        timezone_id='America/New_York',
+        geolocation={'longitude': -74.0060, 'latitude': 40.7128},
+        permissions=['geolocation']
+    )
+    
+    # Advanced stealth
+    await context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+        Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+        window.chrome = {runtime: {}};
+    """)
+    await prepare_context(context)
+    
+    page = await context.new_page()
+    
+    # Add extra headers to look more realistic
+    await page.set_extra_http_headers({
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+    })
+    
+    return page
+
+
+# Abstract containers on a publication page, in order of preference
+ABSTRACT_PAGE_SELECTORS = [
+    ".gsh_csp",                  # Main abstract container
+    ".gsh_csp_ab",               # Abstract text
+    ".gsh_small",                # Small text
+    "#gsc_oci_merged",           # Merged info section
+    ".gs_scl",                   # Scholar content
+    "div.gsh_csp",               # Div with class
+    "div[style*='text-align']",  # Generic text divs
+    ".gsc_vcd_value",            # Value container
+    ".gsc_oci_value",            # OCI value
+    "div#gsc_vcd_table div",     # Table divs
+    ".gs_rs",                    # Result snippet
+]
+
+# Returns {text, selector} for the first selector whose first match has more
+# than 20 characters, else the first of the first 20 divs that looks like an
+# abstract (long text, not navigation), else null
+EXTRACT_ABSTRACT_JS = """
+(selectors) => {
+    const textOf = (el) => (el && el.innerText || "").trim();
+    for (const selector of selectors) {
+        const text = textOf(document.querySelector(selector));
+        if (text.length > 20) return {text, selector};
+    }
+    const skip = ["citation", "export", "copyright", "menu"];
+    for (const div of Array.from(document.querySelectorAll("div")).slice(0, 20)) {
+        const text = textOf(div);
+        const lowered = text.toLowerCase();
+        if (text.length > 100 && text.length < 3000 && !skip.some((word) => lowered.includes(word))) {
+            return {text, selector: "div scan"};
+        }
+    }
+    return null;
+}
+"""
+
+# Selector (or "div scan") -> number of abstracts it produced in this run
+ABSTRACT_SELECTOR_WINS = Counter()
+
+
+def report_abstract_selectors():
+    if ABSTRACT_SELECTOR_WINS:
+        wins = ", ".join(f"{selector} {count}" for selector, count in ABSTRACT_SELECTOR_WINS.most_common())
+        print(f"🔎 Abstracts found via: {wins}")
+
+
+async def get_abstract_from_publication_page(page, full_url, pub_num, pacer=None):
+    """
+    Navigate a pooled stealth page to the publication and extract abstract with anti-CAPTCHA measures.
+    fetch_abstracts has already waited for the request token; `pacer` gets the latency and sets the dwells.
+    """
+    abstract_text = NO_ABSTRACT
+    pacer = pacer or AdaptiveRateController()
+    
+    # Navigate with extended timeout
+    start = time.monotonic()
+    await page.goto(full_url, wait_until="domcontentloaded", timeout=20000)
+    latency = time.monotonic() - start
+    await pacer.pause(3, 5, full_url)  # Longer initial wait
+    
+    # Check for CAPTCHA
+    async def captcha_gone():
+        return await page.locator("#gs_captcha_f").count() == 0
+    
+    if not await captcha_gone():
+        print(f"    🚫 CAPTCHA detected on publication {pub_num}! Manual intervention may be needed.")
+        print(f"    ⏸️  Waiting up to 30 seconds for manual solve...")
+        # Continue as soon as it is solved instead of always waiting the full 30 seconds
+        if not await pacer.wait_until(captcha_gone, timeout=30):
+            return CAPTCHA_BLOCKED  # reported to the pacer by fetch_abstracts
+        pacer.record(full_url, outcome="blocked")
+    else:
+        pacer.record(full_url, latency)
+    
+    # More realistic human reading behavior
+    # Random mouse movements
+    for _ in range(3):
+        await page.mouse.move(
+            random.randint(200, 800),
+            random.randint(200, 600)
+        )
+        await pacer.pause(0.3, 0.7, full_url)
+    
+    # Gradual scrolling like a human reading
+    for _ in range(4):
+        await page.evaluate(f"window.scrollBy(0, {random.randint(100, 250)})")
+        await pacer.pause(0.8, 1.5, full_url)
+    
+    # One round-trip: ordered selector list first, then the heuristic div scan
+    found = await page.evaluate(EXTRACT_ABSTRACT_JS, ABSTRACT_PAGE_SELECTORS)
+    if found:
+        abstract_text = found["text"]
+        ABSTRACT_SELECTOR_WINS[found["selector"]] += 1
+        print(f"    ✅ [{pub_num}] Abstract extracted via {found['selector']} ({len(abstract_text)} chars)")
+    
+    return abstract_text
+
+
+async def enrich_with_scopus_data(publications, scopus_author_id, scopus_client, mode="index", dedup=None,
+                                  author=None):
+    """
+    Enrich publications with Scopus data.
+    
+    "index" fetches the author's whole Scopus document list once and matches
+    titles locally; "batch" sends batched, concurrent title queries instead.
+    With a DedupIndex `dedup`, a publication whose copy a related co-author
+    (see DedupIndex.scopus_for) was already matched for is not looked up again;
+    `author` is the store key of the scraped author.
+    """
+    known = [None] * len(publications)
+    if dedup is not None:
+        # Link every publication first, so co-authors are recognised by all papers they share
+        for pub in publications:
+            dedup.paper_for(pub, author)
+        known = [dedup.scopus_for(pub, author) for pub in publications]
+    lookup = [pub for pub, details in zip(publications, known) if details is None]
+    if len(lookup) < len(publications):
+        print(f"  🔗 {len(publications) - len(lookup)} Scopus matches reused from co-authors")
+    
+    found = []
+    if lookup and mode == "index":
+        index = await scopus_client.fetch_author_documents(scopus_author_id)
+        found = [index.match(pub.title, pub.year) for pub in lookup]
+        if dedup is not None:
+            # Co-authors' matches that turn out to be among this author's own documents
+            found = [details or dedup.scopus_for(pub, author, index) for pub, details in zip(lookup, found)]
+    elif lookup:
+        found = await scopus_client.match_publications(
+            scopus_author_id, [pub.title for pub in lookup]
+        )
+    found = dict(zip(map(id, lookup), found))
+    
+    for i, (pub, reused) in enumerate(zip(publications, known), 1):
+        print(f"  {i}/{len(publications)} Checking Scopus for: {pub.title[:50]}...")
+        scopus_data = reused or found[id(pub)]
+        
+        if scopus_data:
+            pub.apply_scopus(scopus_data)
+            if dedup is not None:
+                # Only this author's own lookups vouch for the match to their co-authors
+                dedup.add_scopus(pub, scopus_data, None if reused else author)
+            print(f"    ✅ Found in Scopus (Year: {pub.scopus_year or 'N/A'})")
+        else:
+            print(f"    ⚠️  Not found in Scopus")
+    
+    return publications
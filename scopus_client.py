@@ -0,0 +1,269 @@
+"""
+Async Scopus (Elsevier) API client.
+
+Requests go through the shared pooled HttpClient with a bounded number in
+flight, and the client waits when the `X-RateLimit-*` headers say the quota
+is used up. Publication lookups are batched: several Scholar titles are
+combined into one `AU-ID(...) AND (TITLE(..) OR TITLE(..))` query and the
+results are matched back to the titles locally.
+
+Alternatively the author's whole Scopus document list is fetched once with
+a paged `AU-ID(...)` sweep into an `AuthorDocumentIndex`, and every Scholar
+title is matched against it in memory.
+"""
+import asyncio
+import re
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from author_resolver import choose_candidate, name_tokens
+from http_client import HTTP_ERRORS
+from scholar_parser import AuthorCandidate
+
+
+SCOPUS_BASE_URL = "https://api.elsevier.com"
+
+
+def normalize_title(title):
+    """Lowercase a title and reduce it to plain words for comparison"""
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def title_similarity(a, b):
+    return SequenceMatcher(None, normalize_title(a), normalize_title(b)).ratio()
+
+
+def title_clause(title, max_words=10):
+    """Scopus TITLE() phrase built from the first words of a title"""
+    words = normalize_title(title).split()[:max_words]
+    return f'TITLE("{" ".join(words)}")'
+
+
+def title_tokens(title):
+    """Significant words of a title (used to find fuzzy-match candidates)"""
+    return {word for word in normalize_title(title).split() if len(word) > 3}
+
+
+def entry_details(entry):
+    """Convert a Scopus search entry to the dict applied by Publication.apply_scopus"""
+    cover_year = (entry.get("prism:coverDate") or "")[:4]
+    return {
+        "scopus_id": entry.get("dc:identifier", "").replace("SCOPUS_ID:", "") or None,
+        "eid": entry.get("eid"),
+        "doi": entry.get("prism:doi"),
+        "publication_year": int(cover_year) if cover_year.isdigit() else None,
+        "title": entry.get("dc:title", ""),
+    }
+
+
+def author_candidate(entry):
+    """AuthorCandidate of a Scopus author search entry (`href` holds the author ID)"""
+    preferred = entry.get("preferred-name") or {}
+    affiliation = entry.get("affiliation-current") or {}
+    if isinstance(affiliation, list):
+        affiliation = affiliation[0] if affiliation else {}
+    subjects = entry.get("subject-area") or []
+    if isinstance(subjects, dict):
+        subjects = [subjects]
+    return AuthorCandidate(
+        name=f"{preferred.get('given-name') or ''} {preferred.get('surname') or ''}".strip(),
+        href=entry.get("dc:identifier", "").replace("AUTHOR_ID:", ""),
+        affiliation=", ".join(filter(None, (affiliation.get(key) for key in (
+            "affiliation-name", "affiliation-city", "affiliation-country"
+        )))),
+        cited_by=int(entry.get("document-count") or 0),
+        interests=[subject.get("$", "") for subject in subjects],
+    )
+
+
+def search_entries(data):
+    """Entries of a search response, without the 'Result set was empty' placeholder"""
+    entries = (data or {}).get("search-results", {}).get("entry", [])
+    return [entry for entry in entries if "error" not in entry]
+
+
+class AuthorDocumentIndex:
+    """In-memory index of one author's Scopus documents by title, DOI and year"""
+
+    def __init__(self, documents, match_threshold=0.85):
+        self.documents = documents
+        self.match_threshold = match_threshold
+        self.by_title = {}
+        self.by_doi = {}
+        self.by_eid = {}
+        self.by_token = defaultdict(set)
+
+        for i, doc in enumerate(documents):
+            self.by_title.setdefault(normalize_title(doc["title"]), doc)
+            if doc["doi"]:
+                self.by_doi[doc["doi"].lower()] = doc
+            if doc["eid"]:
+                self.by_eid[doc["eid"]] = doc
+            for token in title_tokens(doc["title"]):
+                self.by_token[token].add(i)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def find(self, details):
+        """The indexed document with the same EID or DOI as Scopus `details`, or None"""
+        if details.get("eid") and details["eid"] in self.by_eid:
+            return self.by_eid[details["eid"]]
+        doi = details.get("doi")
+        return self.by_doi.get(doi.lower()) if doi else None
+
+    def match(self, title, year=None, doi=None):
+        """Best matching document for a Scholar publication, or None"""
+        if doi and doi.lower() in self.by_doi:
+            return self.by_doi[doi.lower()]
+
+        exact = self.by_title.get(normalize_title(title))
+        if exact:
+            return exact
+
+        # Only compare against documents sharing at least one significant word
+        votes = defaultdict(int)
+        for token in title_tokens(title):
+            for i in self.by_token.get(token, ()):
+                votes[i] += 1
+
+        best, best_score = None, 0.0
+        for i in sorted(votes, key=votes.get, reverse=True)[:50]:
+            doc = self.documents[i]
+            score = title_similarity(title, doc["title"])
+            # Prefer candidates from the same year when titles are equally close
+            if year and year == doc["publication_year"]:
+                score += 0.02
+            if score > best_score:
+                best, best_score = doc, score
+
+        return best if best_score >= self.match_threshold else None
+
+
+class ScopusClient:
+    """Rate-limit aware Scopus search client with batched title matching"""
+
+    def __init__(self, api_key, http_client, base_url=SCOPUS_BASE_URL, concurrency=4,
+                 batch_size=5, match_threshold=0.85, max_retries=3):
+        self.http = http_client
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"X-ELS-APIKey": api_key, "Accept": "application/json"}
+        self.batch_size = max(1, batch_size)
+        self.match_threshold = match_threshold
+        self.max_retries = max_retries
+        self.requests_made = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._remaining = None
+        self._reset_at = 0.0
+
+    def _update_rate_limit(self, headers):
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                self._remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                self._reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+    async def _wait_for_quota(self):
+        if self._remaining is not None and self._remaining <= 0:
+            delay = self._reset_at - time.time()
+            if delay > 0:
+                print(f"  ⏳ Scopus quota exhausted, waiting {delay:.0f}s for reset...")
+                await asyncio.sleep(delay)
+            self._remaining = None
+
+    async def _get(self, path, params):
+        """GET a Scopus API path, retrying on 429 / network errors; returns JSON or None"""
+        url = f"{self.base_url}{path}"
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_for_quota()
+                try:
+                    self.requests_made += 1
+                    status, headers, data = await self.http.get_json(url, params=params, headers=self.headers)
+                except HTTP_ERRORS as e:
+                    print(f"  ⚠️  Scopus request failed: {e}")
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+
+                self._update_rate_limit(headers)
+                if status == 200:
+                    return data
+                if status == 429 or status >= 500:
+                    wait = max(self._reset_at - time.time(), 2 ** attempt) if status == 429 else 2 ** attempt
+                    await asyncio.sleep(min(wait, 60))
+                    continue
+
+                print(f"  ⚠️  Scopus API returned status {status}")
+                return None
+        return None
+
+    async def find_author_candidates(self, author_name, count=25):
+        """Every Scopus author matching the surname and first name (or initial) of `author_name`"""
+        tokens = name_tokens(author_name)
+        if not tokens:
+            return []
+        query = f"AUTHLAST({tokens[-1]})"
+        if len(tokens) > 1:
+            query += f" AND AUTHFIRST({tokens[0]})"
+        data = await self._get("/content/search/author", {"query": query, "count": count})
+        return [candidate for candidate in map(author_candidate, search_entries(data)) if candidate.href]
+
+    async def find_author_id(self, author_name, affiliation=None, topics=()):
+        """
+        Search for author in Scopus and return the Scopus ID of the candidate
+        that best matches the name, `affiliation` and `topics` (see author_resolver)
+        """
+        candidates = await self.find_author_candidates(author_name)
+        chosen = choose_candidate(author_name, candidates, affiliation, topics, label="Scopus")
+        if chosen is None:
+            return None
+
+        print(f"✅ Found Scopus Author: {chosen.name} (ID: {chosen.href})")
+        return chosen.href
+
+    def best_match(self, title, candidates):
+        """Return the candidate whose title is closest to `title`, if close enough"""
+        best, best_score = None, 0.0
+        for candidate in candidates:
+            score = title_similarity(title, candidate["title"])
+            if score > best_score:
+                best, best_score = candidate, score
+        return best if best_score >= self.match_threshold else None
+
+    async def _match_batch(self, author_id, titles):
+        clauses = " OR ".join(title_clause(title) for title in titles)
+        data = await self._get("/content/search/scopus", {
+            "query": f"AU-ID({author_id}) AND ({clauses})",
+            "count": max(25, 2 * len(titles)),
+        })
+        candidates = [entry_details(entry) for entry in search_entries(data)]
+        return [self.best_match(title, candidates) for title in titles]
+
+    async def fetch_author_documents(self, author_id, page_size=25):
+        """Page through AU-ID(author_id) once and index all of the author's documents"""
+        params = {"query": f"AU-ID({author_id})", "count": page_size, "start": 0}
+        first = await self._get("/content/search/scopus", params)
+        total = int((first or {}).get("search-results", {}).get("opensearch:totalResults", 0) or 0)
+
+        # Remaining pages are independent, so request them concurrently
+        pages = await asyncio.gather(*(
+            self._get("/content/search/scopus", dict(params, start=start))
+            for start in range(page_size, total, page_size)
+        ))
+
+        documents = [
+            entry_details(entry)
+            for data in (first, *pages)
+            for entry in search_entries(data)
+        ]
+        print(f"  📚 Indexed {len(documents)}/{total} Scopus documents of author {author_id}")
+        return AuthorDocumentIndex(documents, self.match_threshold)
+
+    async def match_publications(self, author_id, titles):
+        """Scopus details for every title (None where not found), in input order"""
+        batches = [titles[i:i + self.batch_size] for i in range(0, len(titles), self.batch_size)]
+        results = await asyncio.gather(*(self._match_batch(author_id, batch) for batch in batches))
+        return [match for batch in results for match in batch]
@@ -0,0 +1,137 @@
+"""
+Async client for the ScraperAPI (thordata) Google Scholar SERP endpoint.
+
+Requests reuse the pooled keep-alive HttpClient instead of opening a new
+TLS connection per call, time out, and are retried with exponential backoff
+on network errors, 429 and 5xx responses. Publication listings are paged
+with `start=` and several pages are requested in parallel.
+"""
+import asyncio
+import json
+from urllib.parse import urlencode
+
+from http_client import HTTP_ERRORS
+from models import parse_int
+from scholar_parser import AuthorCandidate, ProfileRow
+
+
+SERP_BASE_URL = "https://scraperapi.thordata.com"
+
+
+class SerpError(Exception):
+    """The SERP API could not be reached or returned an unusable response"""
+
+
+def parse_serp_json(raw):
+    """Decode a SERP response (the API sometimes double-encodes the JSON)"""
+    data = json.loads(raw)
+    if isinstance(data, str):
+        data = json.loads(data)
+    return data
+
+
+class SerpClient:
+    """Google Scholar SERP lookups over one pooled connection"""
+
+    def __init__(self, api_key, http_client, base_url=SERP_BASE_URL, retries=3, backoff=1.0,
+                 parallel_pages=3):
+        self.http = http_client
+        self.url = f"{base_url.rstrip('/')}/request"
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+        self.retries = retries
+        self.backoff = backoff
+        self.parallel_pages = max(1, parallel_pages)
+
+    async def request(self, params):
+        """POST one SERP request and return the decoded JSON"""
+        payload = urlencode(dict(params, json="1"))
+        last_error = None
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                status, raw = await self.http.post_text(self.url, data=payload, headers=self.headers)
+            except HTTP_ERRORS as e:
+                last_error = f"request failed: {e}"
+                continue
+
+            if status == 429 or status >= 500:
+                last_error = f"HTTP {status}"
+                continue
+            if status != 200:
+                raise SerpError(f"HTTP {status}: {raw[:200]}")
+            try:
+                return parse_serp_json(raw)
+            except ValueError as e:
+                raise SerpError(f"invalid JSON response: {e}") from e
+
+        raise SerpError(f"giving up after {self.retries + 1} attempts ({last_error})")
+
+    async def find_author_profile_link(self, author_name):
+        """Scholar profile link of the first author found for a name search, or None"""
+        data = await self.request({"engine": "google_scholar", "q": author_name, "start": "0"})
+
+        for result in data.get("organic_results", []):
+            authors = result.get("publication_info", {}).get("authors", [])
+            if authors and authors[0].get("link"):
+                return "https://scholar.google.com" + authors[0]["link"]
+        return None
+
+    async def find_author_candidates(self, author_name):
+        """AuthorCandidates of the profile links in a name search (names only, no affiliations)"""
+        data = await self.request({"engine": "google_scholar", "q": author_name, "start": "0"})
+
+        candidates = {}
+        for result in data.get("organic_results", []):
+            for author in result.get("publication_info", {}).get("authors", []):
+                link = author.get("link")
+                if link and link not in candidates:
+                    candidates[link] = AuthorCandidate(
+                        name=author.get("name", ""),
+                        href="https://scholar.google.com" + link,
+                        affiliation="",
+                        cited_by=0,
+                        interests=[],
+                    )
+        return list(candidates.values())
+
+    async def _author_page(self, author_id, start, num):
+        data = await self.request({
+            "engine": "google_scholar_author",
+            "author_id": author_id,
+            "start": str(start),
+            "num": str(num),
+        })
+        rows = []
+        for article in data.get("articles", []):
+            citation_id = article.get("citation_id")
+            href = (
+                f"/citations?view_op=view_citation&hl=en&user={author_id}&citation_for_view={citation_id}"
+                if citation_id else article.get("link")
+            )
+            cited_by = (article.get("cited_by") or {}).get("value")
+            rows.append(ProfileRow(
+                title=article.get("title", "").strip(),
+                href=href,
+                year=parse_int(article.get("year")),
+                citations=parse_int(cited_by) or 0,
+            ))
+        return rows
+
+    async def list_author_publications(self, author_id, num=100, max_pages=50):
+        """All publication rows of a Scholar profile, fetching pages in parallel waves"""
+        rows = []
+        for first_page in range(0, max_pages, self.parallel_pages):
+            pages = await asyncio.gather(*(
+                self._author_page(author_id, page * num, num)
+                for page in range(first_page, min(first_page + self.parallel_pages, max_pages))
+            ))
+            for page_rows in pages:
+                rows.extend(page_rows)
+                if len(page_rows) < num:
+                    return rows
+        return rows
@@ -0,0 +1,279 @@
+"""
+Sharded batch scraping of very large author lists over several processes.
+
+One batch_scrape process is bound to one event loop and one CPU core for
+HTML parsing and driving Chromium. This runner splits the author list into
+shards and scrapes them in `--workers` worker processes, each with its own
+browser (or HTTP engine), page cache connection and rate controller, all
+saving to the same SQLite publication store.
+
+The coordinator (this process) hands out one shard per idle worker, records
+the status of every author in `<state-dir>/sharded_progress.json` and gives
+failed work to the next free worker: authors that failed inside a shard
+are retried as a new shard, and the whole shard is retried if its worker
+crashed. A crash breaks every worker, so the shards running at the time are
+rerun one at a time without using up an attempt, and only the shard whose
+worker then dies again is charged one. With `--resume`, authors already
+finished are skipped. At the end the combined workbook is exported from the
+store.
+
+Every worker paces its own requests, so Scholar sees up to --workers times
+--rate requests per second from this machine.
+
+Usage:
+    python sharded_scrape.py faculty.txt --workers 4 --engine http --headless
+"""
+import json
+import os
+
+from batch_scrape import build_parser, read_author_list
+from config import get_key
+
+
+PROGRESS_FILENAME = "sharded_progress.json"
+
+
+def progress_path(state_dir):
+    return os.path.join(state_dir, PROGRESS_FILENAME)
+
+
+def split_shards(entries, shard_size):
+    return [entries[i:i + shard_size] for i in range(0, len(entries), shard_size)]
+
+
+class ShardProgress:
+    """Status of every author of the run, saved to a JSON file after each update"""
+
+    def __init__(self, path, entries, resume=False):
+        self.path = path
+        previous = {}
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                previous = json.load(f).get("entries", {})
+        self.entries = {}
+        for entry in entries:
+            status = previous.get(entry)
+            if not status or status["status"] != "done":
+                status = {"status": "pending", "attempts": 0}
+            self.entries[entry] = status
+        self.save()
+
+    def pending(self):
+        return [entry for entry, status in self.entries.items() if status["status"] != "done"]
+
+    def mark(self, entries, status, **fields):
+        for entry in entries:
+            self.entries[entry].update(status=status, **fields)
+        self.save()
+
+    def mark_done(self, keys):
+        """Mark finished entries with their store keys {entry: key}, saving once"""
+        for entry, key in keys.items():
+            self.entries[entry].update(status="done", key=key, error=None)
+        self.save()
+
+    def counts(self):
+        counts = {}
+        for status in self.entries.values():
+            counts[status["status"]] = counts.get(status["status"], 0) + 1
+        return counts
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+
+def scrape_shard(shard_id, entries, args):
+    """
+    Worker process: scrape one shard into the shared store like batch_scrape.
+    Returns ({entry: store key}, failed entries, publications scraped).
+    """
+    import asyncio
+
+    from batch_scrape import scrape_into_store
+    from store import PublicationStore, author_key, store_path
+
+    print(f"🧩 Worker {os.getpid()}: shard {shard_id} with {len(entries)} authors")
+
+    async def scrape():
+        store = PublicationStore(args.db or store_path(args.state_dir))
+        try:
+            results, failed = await scrape_into_store(entries, args, store)
+        finally:
+            store.close()
+        keys = {entry: author_key(author) for entry, author in results.items()}
+        return keys, failed, sum(len(author.publications) for author in results.values())
+
+    return asyncio.run(scrape())
+
+
+def run_shards(entries, args, worker=scrape_shard):
+    """
+    Coordinator: scrape `entries` in shards over `args.workers` processes,
+    reassigning failed shards. Returns the ShardProgress of the run.
+    """
+    import itertools
+    import math
+    import multiprocessing
+    import time
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    progress = ShardProgress(progress_path(args.state_dir), entries, args.resume)
+    todo = progress.pending()
+    if len(todo) < len(entries):
+        print(f"⏯️  Resuming: {len(entries) - len(todo)} authors already finished")
+    shard_size = args.shard_size or max(1, math.ceil(len(todo) / (args.workers * 4)))
+    # (shard id, attempt, entries) of the shards waiting for a worker
+    shard_ids = itertools.count(1)
+    queue = deque((next(shard_ids), 1, shard) for shard in split_shards(todo, shard_size))
+    print(f"🧩 {len(todo)} authors in {len(queue)} shards over {args.workers} worker processes")
+
+    finished, publications = 0, 0
+    start = time.monotonic()
+    # Shards that were running when a worker died, rerun one at a time to find the one that crashed it
+    suspects = deque()
+
+    def retry(entries, attempt, error):
+        if attempt < args.max_attempts:
+            progress.mark(entries, "pending", error=error)
+            queue.append((next(shard_ids), attempt + 1, entries))
+        else:
+            progress.mark(entries, "failed", error=error)
+
+    def collect(future, shard_id, attempt, shard):
+        """Record the result of a finished shard; returns False if its worker process died"""
+        nonlocal finished, publications
+        try:
+            keys, failed, count = future.result()
+        except BrokenProcessPool:
+            return False
+        except Exception as e:
+            print(f"❌ Shard {shard_id} failed: {e}")
+            retry(shard, attempt, str(e))
+            return True
+
+        finished += len(keys)
+        publications += count
+        progress.mark_done(keys)
+        if failed:
+            retry(failed, attempt, "scrape failed")
+        rate = finished * 60 / max(time.monotonic() - start, 1e-9)
+        print(
+            f"📊 Shard {shard_id} finished: {progress.counts().get('done', 0)}/{len(entries)} authors "
+            f"done, {len(failed)} failed in this shard ({rate:.1f} authors/min)"
+        )
+        return True
+
+    # A crashed worker breaks the whole pool, so it is replaced and the unfinished shards are reassigned
+    while queue or suspects:
+        source, workers = (suspects, 1) if suspects else (queue, args.workers)
+        died = []
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            running = {}
+            broken = False
+            while (source or running) and not (died or broken):
+                while source and len(running) < workers:
+                    shard_id, attempt, shard = source[0]
+                    try:
+                        future = pool.submit(worker, shard_id, shard, args)
+                    except BrokenProcessPool:
+                        # A worker died while its shard's result was not collected yet; the shard stays queued
+                        broken = True
+                        break
+                    source.popleft()
+                    progress.mark(shard, "running", attempts=attempt)
+                    running[future] = (shard_id, attempt, shard)
+                if broken:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    if not collect(future, *job):
+                        died.append(job)
+
+            if running:
+                # Every shard still running fails with the broken pool too
+                wait(running)
+                died += [job for future, job in running.items() if not collect(future, *job)]
+
+        if len(died) == 1:
+            # The shard ran alone (or was the only one left), so it crashed its worker
+            shard_id, attempt, shard = died[0]
+            print(f"⚠️  The worker of shard {shard_id} died; restarting the workers...")
+            retry(shard, attempt, "worker process died")
+        elif died:
+            # Any of them may have crashed the worker: rerun them alone, without charging an attempt
+            print(f"⚠️  A worker process died; rerunning its {len(died)} shards one at a time...")
+            for shard_id, attempt, shard in died:
+                progress.mark(shard, "pending", error="worker process died")
+                suspects.append((shard_id, attempt, shard))
+
+    print(f"⏱️  {finished} authors, {publications} publications in {time.monotonic() - start:.0f} s")
+    return progress
+
+
+def build_sharded_parser():
+    parser = build_parser("Scrape a very large author list in several worker processes")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes, each with its own browser or HTTP engine (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=0,
+        help="Authors per shard (default: about four shards per worker)"
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=2,
+        help="Times an author or a crashed shard is tried before it counts as failed (default: 2)"
+    )
+    return parser
+
+
+# ---------------- Main Entry Point ----------------
+def main(argv=None):
+    args = build_sharded_parser().parse_args(argv)
+    args.workers = max(1, args.workers)
+
+    if args.scopus:
+        get_key("scopus_key", required=True)
+
+    entries = read_author_list(args.author_file)
+    if not entries:
+        raise SystemExit(f"❌ No authors found in {args.author_file}")
+
+    progress = run_shards(entries, args)
+
+    from store import PublicationStore, store_path
+
+    # Stream every finished author's rows from the store into the combined workbook
+    keys = [progress.entries[entry]["key"] for entry in entries if progress.entries[entry]["status"] == "done"]
+    failed = [entry for entry in entries if progress.entries[entry]["status"] == "failed"]
+    store = PublicationStore(args.db or store_path(args.state_dir))
+    try:
+        filename = store.export_excel(keys, "batch")
+    finally:
+        store.close()
+
+    print(f"\n{'='*60}")
+    print(f"✅ Sharded batch finished: {len(keys)}/{len(entries)} authors")
+    print(f"📁 Combined results saved to: {filename}")
+    if failed:
+        print(f"⚠️  Failed authors: {', '.join(failed)}")
+    print(f"📋 Progress: {progress.path}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { Line } from 'react-chartjs-2';
 import {
   Chart as ChartJS,
@@ -12,6 +12,25 @@ import {
 } from 'chart.js';
 import './DataExplorer.css';
 
+// Base URL of api_server.py
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8080';
+const PAGE_SIZE = 10;
+const EXPORT_PAGE_SIZE = 200;
+
+// GET a JSON endpoint of the API. Responses carry an ETag and
+// "Cache-Control: no-cache", so the browser revalidates repeated queries
+// with If-None-Match and reuses its cached copy on 304.
+const apiGet = async (path, params = {}) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== '' && value !== null && value !== undefined)
+  );
+  const response = await fetch(`${API_URL}${path}?${query}`);
+  if (!response.ok) {
+    throw new Error(await response.text());
+  }
+  return response.json();
+};
+
 // Register ChartJS components
 ChartJS.register(
   CategoryScale,
@@ -24,31 +43,82 @@ ChartJS.register(
 );
 
 const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings, onNavigateToAbout, onNavigateToProfile, onLogout, hasSearchedAuthor, onResetSearch, onNavigateToExplorer }) => {
-  // State for filters
-  const [selectedField, setSelectedField] = useState('');
+  // State for filters (applied by the API, not in the browser)
+  const [keywordInput, setKeywordInput] = useState('');
+  const [keyword, setKeyword] = useState('');
   const [selectedYear, setSelectedYear] = useState('');
-  const [selectedHIndex, setSelectedHIndex] = useState('');
-  const [selectedNmIndex, setSelectedNmIndex] = useState('');
+  const [sortBy, setSortBy] = useState('-citations');
+  const [page, setPage] = useState(1);
+
+  // Data loaded from the API
+  const [author, setAuthor] = useState(null);
+  const [publications, setPublications] = useState([]);
+  const [totalPages, setTotalPages] = useState(0);
+  const [totalMatches, setTotalMatches] = useState(0);
+  const [error, setError] = useState('');
+
+  // Author profile, totals and per-year counts
+  useEffect(() => {
+    let cancelled = false;
+    setAuthor(null);
+    apiGet(`/api/authors/${encodeURIComponent(authorName)}`)
+      .then((data) => { if (!cancelled) setAuthor(data); })
+      .catch((e) => { if (!cancelled) setError(e.message); });
+    return () => { cancelled = true; };
+  }, [authorName]);
+
+  // Wait for a pause in typing before searching
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setKeyword(keywordInput.trim());
+      setPage(1);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [keywordInput]);
+
+  // Only the displayed page of publications is requested
+  useEffect(() => {
+    let cancelled = false;
+    apiGet('/api/publications', {
+      author: authorName,
+      q: keyword,
+      year: selectedYear,
+      sort: sortBy,
+      page,
+      page_size: PAGE_SIZE
+    })
+      .then((data) => {
+        if (cancelled) return;
+        setPublications(data.items);
+        setTotalPages(data.pages);
+        setTotalMatches(data.total);
+        setError('');
+      })
+      .catch((e) => { if (!cancelled) setError(e.message); });
+    return () => { cancelled = true; };
+  }, [authorName, keyword, selectedYear, sortBy, page]);
+
+  const years = author ? author.years : [];
+  const citedYears = years.filter((entry) => entry.publications > 0);
 
-  // Sample author data
   const authorData = {
-    name: authorName,
-    email: 'researcher@university.edu',
-    totalPublications: 250,
-    totalCitations: 250,
-    totalSelfCitations: 250,
-    nmIndex: 250,
-    hIndex: 250,
-    cScore: 250
+    name: author ? author.name : authorName,
+    email: author && author.scholar_id ? `Scholar ID: ${author.scholar_id}` : '',
+    totalPublications: author ? author.publications : '—',
+    totalCitations: author ? author.citations : '—',
+    hIndex: author ? author.h_index : '—',
+    gIndex: author ? author.g_index : '—',
+    i10Index: author ? author.i10_index : '—',
+    mQuotient: author && author.m_quotient !== null ? author.m_quotient.toFixed(2) : '—'
   };
 
-  // Sample chart data - Citations vs Publication Year
+  // Citations and publications per publication year
   const chartData = {
-    labels: ['P', 'Q', 'R', 'S', 'T'],
+    labels: years.map((entry) => entry.year),
     datasets: [
       {
         label: 'Citations',
-        data: [220, 180, 240, 280, 260],
+        data: years.map((entry) => entry.citations),
         borderColor: '#d32f2f',
         backgroundColor: 'rgba(211, 47, 47, 0.1)',
         tension: 0.4,
@@ -57,7 +127,7 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
       },
       {
         label: 'Publications',
-        data: [200, 240, 190, 230, 270],
+        data: years.map((entry) => entry.publications),
         borderColor: '#034078',
         backgroundColor: 'rgba(3, 64, 120, 0.1)',
         tension: 0.4,
@@ -81,10 +151,6 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
     scales: {
       y: {
         beginAtZero: true,
-        max: 300,
-        ticks: {
-          stepSize: 50
-        },
         grid: {
           color: '#e0e0e0'
         }
@@ -97,49 +163,38 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
     }
   };
 
-  // Sample publications data
-  const publications = [
-    {
-      id: 1,
-      title: 'Title of Publication',
-      fields: ['Field 01', 'Field 02', 'Field 03', 'Field 04', 'Field 05'],
-      authors: ['Mr. XXXX', 'Mr. YYYY', 'Mr. ZZZZ'],
-      totalSelfCitations: 250,
-      publishedYear: 250,
-      totalCitations: 250
-    },
-    {
-      id: 2,
-      title: 'Title of Publication',
-      fields: ['Field 01', 'Field 02', 'Field 03', 'Field 04', 'Field 05'],
-      authors: ['Mr. XXXX', 'Mr. YYYY', 'Mr. ZZZZ'],
-      totalSelfCitations: 250,
-      publishedYear: 250,
-      totalCitations: 250
-    },
-    {
-      id: 3,
-      title: 'Title of Publication',
-      fields: ['Field 01', 'Field 02', 'Field 03', 'Field 04', 'Field 05'],
-      authors: ['Mr. XXXX', 'Mr. YYYY', 'Mr. ZZZZ'],
-      totalSelfCitations: 250,
-      publishedYear: 250,
-      totalCitations: 250
+  const handleExportCSV = async () => {
+    // Export every publication matching the filters, page by page
+    const rows = [];
+    try {
+      for (let exportPage = 1; ; exportPage++) {
+        const data = await apiGet('/api/publications', {
+          author: authorName,
+          q: keyword,
+          year: selectedYear,
+          sort: sortBy,
+          page: exportPage,
+          page_size: EXPORT_PAGE_SIZE
+        });
+        rows.push(...data.items);
+        if (exportPage >= data.pages) break;
+      }
+    } catch (e) {
+      setError(e.message);
+      return;
     }
-  ];
 
-  const handleExportCSV = () => {
     // Create CSV content
-    const headers = ['Title', 'Fields', 'Authors', 'Total Self Citations', 'Published Year', 'Total Citations'];
+    const quote = (value) => `"${String(value ?? '').replace(/"/g, '""')}"`;
+    const headers = ['Title', 'Author', 'Published Year', 'Total Citations', 'DOI'];
     const csvContent = [
       headers.join(','),
-      ...publications.map(pub => [
-        `"${pub.title}"`,
-        `"${pub.fields.join('; ')}"`,
-        `"${pub.authors.join('; ')}"`,
-        pub.totalSelfCitations,
-        pub.publishedYear,
-        pub.totalCitations
+      ...rows.map(pub => [
+        quote(pub.title),
+        quote(pub.author_name),
+        pub.year ?? '',
+        pub.citations ?? 0,
+        quote(pub.scopus_doi)
       ].join(','))
     ].join('\n');
 
@@ -232,20 +287,20 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
                 <div className="stat-value">{authorData.totalCitations}</div>
               </div>
               <div className="stat-item">
-                <div className="stat-label">Total Self Citations</div>
-                <div className="stat-value">{authorData.totalSelfCitations}</div>
+                <div className="stat-label">H Index</div>
+                <div className="stat-value">{authorData.hIndex}</div>
               </div>
               <div className="stat-item">
-                <div className="stat-label">Nm Index</div>
-                <div className="stat-value">{authorData.nmIndex}</div>
+                <div className="stat-label">G Index</div>
+                <div className="stat-value">{authorData.gIndex}</div>
               </div>
               <div className="stat-item">
-                <div className="stat-label">H Index</div>
-                <div className="stat-value">{authorData.hIndex}</div>
+                <div className="stat-label">i10 Index</div>
+                <div className="stat-value">{authorData.i10Index}</div>
               </div>
               <div className="stat-item">
-                <div className="stat-label">C Score</div>
-                <div className="stat-value">{authorData.cScore}</div>
+                <div className="stat-label">M Quotient</div>
+                <div className="stat-value">{authorData.mQuotient}</div>
               </div>
             </div>
           </div>
@@ -264,51 +319,36 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
           </div>
           <div className="filter-controls">
             <div className="filter-item">
-              <label>Field</label>
-              <select 
-                value={selectedField} 
-                onChange={(e) => setSelectedField(e.target.value)}
-              >
-                <option value="">Select Field</option>
-                <option value="medicine">Medicine</option>
-                <option value="engineering">Engineering</option>
-                <option value="psychology">Psychology</option>
-              </select>
+              <label>Keyword</label>
+              <input
+                type="text"
+                placeholder="Search titles and abstracts"
+                value={keywordInput}
+                onChange={(e) => setKeywordInput(e.target.value)}
+              />
             </div>
             <div className="filter-item">
               <label>Year</label>
               <select 
                 value={selectedYear} 
-                onChange={(e) => setSelectedYear(e.target.value)}
-              >
-                <option value="">Select Year</option>
-                <option value="2024">2024</option>
-                <option value="2023">2023</option>
-                <option value="2022">2022</option>
-              </select>
-            </div>
-            <div className="filter-item">
-              <label>H-Index</label>
-              <select 
-                value={selectedHIndex} 
-                onChange={(e) => setSelectedHIndex(e.target.value)}
+                onChange={(e) => { setSelectedYear(e.target.value); setPage(1); }}
               >
-                <option value="">Nm-Index</option>
-                <option value="high">High (&gt;100)</option>
-                <option value="medium">Medium (50-100)</option>
-                <option value="low">Low (&lt;50)</option>
+                <option value="">All Years</option>
+                {[...citedYears].reverse().map((entry) => (
+                  <option key={entry.year} value={entry.year}>{entry.year}</option>
+                ))}
               </select>
             </div>
             <div className="filter-item">
-              <label>Nm-Index</label>
+              <label>Sort By</label>
               <select 
-                value={selectedNmIndex} 
-                onChange={(e) => setSelectedNmIndex(e.target.value)}
+                value={sortBy} 
+                onChange={(e) => { setSortBy(e.target.value); setPage(1); }}
               >
-                <option value="">Nm-Index</option>
-                <option value="high">High (&gt;100)</option>
-                <option value="medium">Medium (50-100)</option>
-                <option value="low">Low (&lt;50)</option>
+                <option value="-citations">Most Cited</option>
+                <option value="-year">Newest</option>
+                <option value="year">Oldest</option>
+                <option value="title">Title</option>
               </select>
             </div>
           </div>
@@ -316,40 +356,47 @@ const DataExplorer = ({ authorName = "Jone Mickel", onBack, onNavigateToSettings
 
         {/* Publications List */}
         <section className="publications-section">
+          {error && <p className="explorer-error">{error}</p>}
+          {!error && publications.length === 0 && (
+            <p className="explorer-empty">No publications match the filters.</p>
+          )}
           {publications.map((pub) => (
             <div key={pub.id} className="publication-card">
               <div className="publication-main">
                 <h3 className="publication-title">{pub.title}</h3>
-                <div className="publication-fields">
-                  {pub.fields.map((field, index) => (
-                    <span key={index} className="field-tag">{field}</span>
-                  ))}
-                </div>
+                {pub.abstract && <p className="publication-abstract">{pub.abstract}</p>}
                 <div className="authors-section">
-                  <h4>Authors Contribution</h4>
-                  {pub.authors.map((author, index) => (
-                    <p key={index}>{author}</p>
-                  ))}
+                  <h4>Author</h4>
+                  <p>{pub.author_name}</p>
                 </div>
               </div>
               <div className="publication-stats">
-                <div className="pub-stat">
-                  <div className="pub-stat-label">Total Self Citations</div>
-                  <div className="pub-stat-value">{pub.totalSelfCitations}</div>
-                </div>
                 <div className="pub-stat">
                   <div className="pub-stat-label">Published Year</div>
-                  <div className="pub-stat-value">{pub.publishedYear}</div>
+                  <div className="pub-stat-value">{pub.year ?? '—'}</div>
                 </div>
                 <div className="pub-stat">
                   <div className="pub-stat-label">Total Citations</div>
-                  <div className="pub-stat-value">{pub.totalCitations}</div>
+                  <div className="pub-stat-value">{pub.citations ?? 0}</div>
+                </div>
+                <div className="pub-stat">
+                  <div className="pub-stat-label">DOI</div>
+                  <div className="pub-stat-value pub-stat-doi">{pub.scopus_doi || '—'}</div>
                 </div>
               </div>
             </div>
           ))}
         </section>
 
+        {/* Pagination */}
+        {totalPages > 1 && (
+          <div className="pagination">
+            <button disabled={page <= 1} onClick={() => setPage(page - 1)}>Previous</button>
+            <span>Page {page} of {totalPages} ({totalMatches} publications)</span>
+            <button disabled={page >= totalPages} onClick={() => setPage(page + 1)}>Next</button>
+          </div>
+        )}
+
         {/* Export Button */}
         <div className="export-section">
           <button className="export-btn" onClick={handleExportCSV}>
@@ -0,0 +1,568 @@
+"""
+SQLite publication store, the system of record of every scrape.
+
+Each finished author is written to one database (by default
+`<state_dir>/publications.sqlite3`):
+
+- authors: one row per Scholar profile, keyed like the state files
+  (Scholar user id, or the author name)
+- publications: the author's current profile rows, keyed by Publication.pub_id
+- citation_series: the citation history of every publication, delta
+  encoded (see snapshots.py)
+- scopus_mappings: the Scopus document a publication was matched to
+- author_mappings: the Scholar profile and Scopus author ID chosen for a
+  searched name (see author_resolver.py), so later runs skip the search
+
+Publications are indexed by author, year and normalized title, Scopus
+mappings by DOI, and titles and abstracts are full-text indexed (FTS5).
+Excel files are exported from queries over the store.
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from incremental import author_state_key
+from models import Publication
+from scopus_client import normalize_title
+from snapshots import day_number, decode_points, encode_points, next_point, values_at
+
+
+STORE_FILENAME = "publications.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    scholar_link TEXT,
+    scholar_id TEXT,
+    scopus_author_id TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    author_id INTEGER NOT NULL REFERENCES authors(id) ON DELETE CASCADE,
+    pub_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    title_norm TEXT NOT NULL,
+    year INTEGER,
+    citations INTEGER NOT NULL DEFAULT 0,
+    abstract TEXT,
+    link TEXT,
+    abstract_status TEXT NOT NULL DEFAULT 'none',
+    updated_at REAL NOT NULL,
+    UNIQUE (author_id, pub_id)
+);
+CREATE TABLE IF NOT EXISTS citation_series (
+    publication_id INTEGER PRIMARY KEY REFERENCES publications(id) ON DELETE CASCADE,
+    points BLOB NOT NULL,
+    last_day INTEGER NOT NULL,
+    last_citations INTEGER NOT NULL,
+    checked_day INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scopus_mappings (
+    publication_id INTEGER PRIMARY KEY REFERENCES publications(id) ON DELETE CASCADE,
+    scopus_id TEXT,
+    eid TEXT,
+    doi TEXT,
+    year INTEGER
+);
+CREATE TABLE IF NOT EXISTS author_mappings (
+    query TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    scholar_link TEXT NOT NULL,
+    scholar_name TEXT,
+    scholar_affiliation TEXT,
+    interests TEXT,
+    scopus_author_id TEXT,
+    updated_at REAL NOT NULL
+);
+-- UNIQUE (author_id, pub_id) already serves lookups by author
+CREATE INDEX IF NOT EXISTS idx_publications_year ON publications(year);
+CREATE INDEX IF NOT EXISTS idx_publications_title_norm ON publications(title_norm);
+CREATE INDEX IF NOT EXISTS idx_scopus_mappings_doi ON scopus_mappings(doi);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+    title, abstract, content='publications', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS publications_fts_insert AFTER INSERT ON publications BEGIN
+    INSERT INTO publications_fts(rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS publications_fts_delete AFTER DELETE ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, title, abstract)
+    VALUES ('delete', old.id, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS publications_fts_update AFTER UPDATE OF title, abstract ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, title, abstract)
+    VALUES ('delete', old.id, old.title, old.abstract);
+    INSERT INTO publications_fts(rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+END;
+"""
+
+# Sort keys accepted by query_publications ("-" prefix for descending)
+SORT_COLUMNS = {
+    "citations": "p.citations",
+    "year": "p.year",
+    "title": "p.title_norm",
+    "position": "p.position",
+}
+
+PUBLICATION_COLUMNS = """
+    p.title, p.year, p.citations, p.abstract, p.link, p.abstract_status,
+    s.scopus_id, s.eid, s.doi, s.year
+"""
+
+
+def fts_phrase_query(text):
+    """
+    FTS5 query matching every whitespace-separated term of plain search text.
+    Each term is quoted as a phrase, so "covid-19", "C++", "O'Brien" or "AND"
+    are searched for as text instead of being parsed as FTS5 syntax.
+    """
+    terms = [term for term in text.split() if any(ch.isalnum() for ch in term)]
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def author_key(author):
+    """Store key of an Author: its Scholar user id, falling back to the name"""
+    return author_state_key(author.scholar_link, author.name)
+
+
+def store_path(state_dir):
+    return os.path.join(state_dir, STORE_FILENAME)
+
+
+def _publication(row):
+    title, year, citations, abstract, link, status, scopus_id, eid, doi, scopus_year = row
+    return Publication(
+        title=title,
+        year=year,
+        citations=citations,
+        abstract=abstract,
+        link=link,
+        abstract_status=status,
+        scopus_id=scopus_id,
+        scopus_eid=eid,
+        scopus_doi=doi,
+        scopus_year=scopus_year,
+    )
+
+
+class PublicationStore:
+    """SQLite database of authors, publications, citation snapshots and Scopus mappings"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        # Generous busy timeout: sharded_scrape.py workers write to the same database
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _record_citations(self, publication_id, day, citations):
+        """Add today's citation count to a publication's series (nothing is stored if unchanged)"""
+        row = self.conn.execute(
+            "SELECT last_day, last_citations, points FROM citation_series WHERE publication_id = ?",
+            (publication_id,),
+        ).fetchone()
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO citation_series (publication_id, points, last_day, last_citations, checked_day) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (publication_id, encode_points([(day, citations)]), day, citations, day),
+            )
+            return
+        last_day, last_citations, points = row
+        if citations == last_citations:
+            self.conn.execute(
+                "UPDATE citation_series SET checked_day = ? WHERE publication_id = ?", (day, publication_id)
+            )
+        elif day > last_day:
+            self.conn.execute(
+                "UPDATE citation_series SET points = ?, last_day = ?, last_citations = ?, "
+                "checked_day = ? WHERE publication_id = ?",
+                (points + next_point(last_day, last_citations, day, citations), day, citations, day,
+                 publication_id),
+            )
+        else:
+            # A second run on the same day replaces that day's count
+            history = decode_points(points)[:-1]
+            if not history or history[-1][1] != citations:
+                history.append((day, citations))
+            self.conn.execute(
+                "UPDATE citation_series SET points = ?, last_day = ?, last_citations = ?, checked_day = ? "
+                "WHERE publication_id = ?",
+                (encode_points(history), history[-1][0], citations, day, publication_id),
+            )
+
+    def save_author(self, author, complete=True):
+        """
+        Write an Author and its publications in one transaction.
+
+        Publications that are no longer on the profile are removed, unless the
+        listing is not `complete` (cut short, see profile_loader.listing_complete),
+        so a truncated listing never loses citation histories. The citation
+        count of every current publication is added to its series.
+        """
+        now = time.time()
+        today = day_number(now)
+        with self.conn:
+            author_id = self.conn.execute(
+                "INSERT INTO authors (key, name, scholar_link, scholar_id, scopus_author_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET name = excluded.name, scholar_link = excluded.scholar_link, "
+                "scholar_id = excluded.scholar_id, "
+                "scopus_author_id = COALESCE(excluded.scopus_author_id, authors.scopus_author_id), "
+                "updated_at = excluded.updated_at "
+                "RETURNING id",
+                (author_key(author), author.name, author.scholar_link, author.scholar_id,
+                 author.scopus_author_id, now),
+            ).fetchone()[0]
+
+            for position, pub in enumerate(author.publications):
+                # Title and abstract are left out of the upsert: any update of them reindexes the row in FTS
+                publication_id, title, abstract = self.conn.execute(
+                    "INSERT INTO publications (author_id, pub_id, position, title, title_norm, year, citations, "
+                    "abstract, link, abstract_status, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(author_id, pub_id) DO UPDATE SET position = excluded.position, "
+                    "year = excluded.year, citations = excluded.citations, link = excluded.link, "
+                    "abstract_status = excluded.abstract_status, updated_at = excluded.updated_at "
+                    "RETURNING id, title, abstract",
+                    (author_id, pub.pub_id, position, pub.title, normalize_title(pub.title), pub.year,
+                     pub.citations, pub.abstract, pub.link, pub.abstract_status, now),
+                ).fetchone()
+                if (title, abstract) != (pub.title, pub.abstract):
+                    self.conn.execute(
+                        "UPDATE publications SET title = ?, title_norm = ?, abstract = ? WHERE id = ?",
+                        (pub.title, normalize_title(pub.title), pub.abstract, publication_id),
+                    )
+
+                self._record_citations(publication_id, today, pub.citations)
+                if pub.scopus_id or pub.scopus_eid:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO scopus_mappings (publication_id, scopus_id, eid, doi, year) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (publication_id, pub.scopus_id, pub.scopus_eid, pub.scopus_doi, pub.scopus_year),
+                    )
+
+            # Rows that disappeared from the profile (their citation series go with them)
+            if complete:
+                self.conn.execute(
+                    "DELETE FROM publications WHERE author_id = ? AND updated_at < ?", (author_id, now)
+                )
+        return author_id
+
+    def author_mapping(self, query):
+        """Mapping saved for an author_resolver.mapping_key, or None"""
+        row = self.conn.execute(
+            "SELECT name, scholar_link, scholar_name, scholar_affiliation, interests, scopus_author_id "
+            "FROM author_mappings WHERE query = ?",
+            (query,),
+        ).fetchone()
+        if row is None:
+            return None
+        name, scholar_link, scholar_name, scholar_affiliation, interests, scopus_author_id = row
+        return {
+            "name": name,
+            "scholar_link": scholar_link,
+            "scholar_name": scholar_name,
+            "scholar_affiliation": scholar_affiliation,
+            "interests": json.loads(interests or "[]"),
+            "scopus_author_id": scopus_author_id,
+        }
+
+    def save_author_mapping(self, query, name, scholar_link, scholar_name=None, scholar_affiliation=None,
+                            interests=()):
+        """Remember the Scholar profile chosen for a search (a new choice forgets the Scopus ID)"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO author_mappings (query, name, scholar_link, scholar_name, "
+                "scholar_affiliation, interests, scopus_author_id, updated_at) VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                (query, name, scholar_link, scholar_name, scholar_affiliation, json.dumps(list(interests)),
+                 time.time()),
+            )
+        return self.author_mapping(query)
+
+    def set_mapping_scopus_id(self, query, scopus_author_id):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE author_mappings SET scopus_author_id = ?, updated_at = ? WHERE query = ?",
+                (scopus_author_id, time.time(), query),
+            )
+
+    def has_author(self, key):
+        return self.conn.execute("SELECT 1 FROM authors WHERE key = ?", (key,)).fetchone() is not None
+
+    def publications(self, key):
+        """Publications of one author in profile order, as saved by the last run"""
+        rows = self.conn.execute(
+            f"SELECT {PUBLICATION_COLUMNS} FROM publications p "
+            "JOIN authors a ON a.id = p.author_id "
+            "LEFT JOIN scopus_mappings s ON s.publication_id = p.id "
+            "WHERE a.key = ? ORDER BY p.position",
+            (key,),
+        )
+        return [_publication(row) for row in rows]
+
+    def dedup_rows(self, title_norm, year=None, doi=None):
+        """
+        (author key, title, year, abstract, abstract_status, Scopus details or None)
+        of every stored copy of a publication: the same normalized title and
+        year (by idx_publications_title_norm), or the same DOI
+        """
+        query = (
+            "SELECT a.key, p.title, p.year, p.abstract, p.abstract_status, s.scopus_id, s.eid, s.doi, s.year "
+            "FROM publications p JOIN authors a ON a.id = p.author_id "
+            "LEFT JOIN scopus_mappings s ON s.publication_id = p.id "
+        )
+        rows = self.conn.execute(query + "WHERE p.title_norm = ? AND p.year IS ?", (title_norm, year)).fetchall()
+        if doi:
+            rows += self.conn.execute(query + "WHERE s.doi = ?", (doi,)).fetchall()
+        seen = set()
+        for key, title, year, abstract, status, scopus_id, eid, doi, scopus_year in rows:
+            if (key, title, year) in seen:
+                continue
+            seen.add((key, title, year))
+            scopus = None
+            if scopus_id or eid or doi:
+                scopus = {"scopus_id": scopus_id, "eid": eid, "doi": doi, "publication_year": scopus_year}
+            yield key, title, year, abstract, status, scopus
+
+    def rows_for_export(self, keys):
+        """Yield (publication, author name, Scopus author id) for the authors, in order"""
+        for key in keys:
+            author = self.conn.execute(
+                "SELECT name, scopus_author_id FROM authors WHERE key = ?", (key,)
+            ).fetchone()
+            if author is None:
+                continue
+            for pub in self.publications(key):
+                yield pub, author[0], author[1]
+
+    def search(self, text, limit=20):
+        """Publications whose title or abstract match an FTS5 query, best matches first"""
+        rows = self.conn.execute(
+            f"SELECT a.name, {PUBLICATION_COLUMNS} FROM publications_fts "
+            "JOIN publications p ON p.id = publications_fts.rowid "
+            "JOIN authors a ON a.id = p.author_id "
+            "LEFT JOIN scopus_mappings s ON s.publication_id = p.id "
+            "WHERE publications_fts MATCH ? ORDER BY rank LIMIT ?",
+            (text, limit),
+        )
+        results = []
+        for row in rows:
+            pub = _publication(row[1:])
+            pub.author_name = row[0]
+            results.append(pub)
+        return results
+
+    def _author_id(self, author):
+        """Row id of the author with this key or (case-insensitive) name, or None"""
+        row = self.conn.execute(
+            "SELECT id FROM authors WHERE key = ? OR name = ? COLLATE NOCASE ORDER BY key = ? DESC LIMIT 1",
+            (author, author, author),
+        ).fetchone()
+        return row[0] if row else None
+
+    def version(self):
+        """Changes whenever an author is saved; used for ETags"""
+        return self.conn.execute(
+            "SELECT COALESCE(MAX(updated_at), 0), COUNT(*) FROM authors"
+        ).fetchone()
+
+    def metric_arrays(self):
+        """(author rows, author indexes, citations, years) of every publication for metrics.compute_metrics"""
+        import numpy as np
+
+        authors = self.conn.execute(
+            "SELECT id, key, name, scholar_id, scopus_author_id, updated_at FROM authors ORDER BY id"
+        ).fetchall()
+        rows = self.conn.execute("SELECT author_id, citations, COALESCE(year, 0) FROM publications").fetchall()
+        columns = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        # Row ids are sorted, so their position is the dense author index
+        author_ids = np.searchsorted(np.array([row[0] for row in authors], dtype=np.int64), columns[:, 0])
+        return authors, author_ids, columns[:, 1], columns[:, 2]
+
+    def authors(self):
+        """Every author with totals and h-, g- and i10-index, m-quotient (computed in one call)"""
+        from metrics import compute_metrics, metric_values
+
+        authors, author_ids, citations, years = self.metric_arrays()
+        metrics = compute_metrics(author_ids, citations, years, len(authors))
+        summaries = [
+            dict({"key": key, "name": name, "scholar_id": scholar_id, "scopus_author_id": scopus_author_id,
+                  "updated_at": updated_at}, **metric_values(metrics, i))
+            for i, (_, key, name, scholar_id, scopus_author_id, updated_at) in enumerate(authors)
+        ]
+        return sorted(summaries, key=lambda summary: summary["name"].lower())
+
+    def author_summary(self, author):
+        """Profile, metrics and per-year counts of an author (key or name), or None"""
+        from metrics import compute_metrics, metric_values
+
+        author_id = self._author_id(author)
+        if author_id is None:
+            return None
+        key, name, scholar_link, scholar_id, scopus_author_id, updated_at = self.conn.execute(
+            "SELECT key, name, scholar_link, scholar_id, scopus_author_id, updated_at FROM authors WHERE id = ?",
+            (author_id,),
+        ).fetchone()
+        rows = self.conn.execute(
+            "SELECT citations, COALESCE(year, 0) FROM publications WHERE author_id = ?", (author_id,)
+        ).fetchall()
+        metrics = compute_metrics([0] * len(rows), [row[0] for row in rows], [row[1] for row in rows], 1)
+        years = self.conn.execute(
+            "SELECT year, COUNT(*), SUM(citations) FROM publications "
+            "WHERE author_id = ? AND year IS NOT NULL GROUP BY year ORDER BY year",
+            (author_id,),
+        ).fetchall()
+        return dict(
+            {
+                "key": key,
+                "name": name,
+                "scholar_link": scholar_link,
+                "scholar_id": scholar_id,
+                "scopus_author_id": scopus_author_id,
+                "updated_at": updated_at,
+                "years": [{"year": year, "publications": count, "citations": total} for year, count, total in years],
+            },
+            **metric_values(metrics, 0),
+        )
+
+    def query_publications(self, author=None, year=None, year_from=None, year_to=None, search=None,
+                           sort="-citations", limit=20, offset=0, raw_search=False):
+        """
+        One page of publications matching the filters: (total matches, Publications).
+
+        `author` is an author key or name, `search` words that must all occur
+        in the title or abstract (an FTS5 query with `raw_search`), `sort` one
+        of SORT_COLUMNS with an optional "-" for descending order.
+        Publications without a year always sort last.
+        """
+        column = SORT_COLUMNS.get(sort.lstrip("-"))
+        if column is None:
+            raise ValueError(f"Unknown sort key {sort!r}")
+        direction = "DESC" if sort.startswith("-") else "ASC"
+
+        joins = ["JOIN authors a ON a.id = p.author_id",
+                 "LEFT JOIN scopus_mappings s ON s.publication_id = p.id"]
+        where, params = [], []
+        if author is not None:
+            where.append("p.author_id = ?")
+            params.append(self._author_id(author))
+        if year is not None:
+            where.append("p.year = ?")
+            params.append(year)
+        if year_from is not None:
+            where.append("p.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            where.append("p.year <= ?")
+            params.append(year_to)
+        if search and not raw_search:
+            search = fts_phrase_query(search)
+        if search:
+            joins.append("JOIN publications_fts ON publications_fts.rowid = p.id")
+            where.append("publications_fts MATCH ?")
+            params.append(search)
+
+        sql_from = "FROM publications p " + " ".join(joins)
+        if where:
+            sql_from += " WHERE " + " AND ".join(where)
+        total = self.conn.execute(f"SELECT COUNT(*) {sql_from}", params).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT a.name, {PUBLICATION_COLUMNS} {sql_from} "
+            f"ORDER BY {column} IS NULL, {column} {direction}, p.id LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        publications = []
+        for row in rows:
+            pub = _publication(row[1:])
+            pub.author_name = row[0]
+            publications.append(pub)
+        return total, publications
+
+    def citation_history(self, key, pub_id):
+        """(day number, citations) change points of one publication of an author"""
+        row = self.conn.execute(
+            "SELECT s.points FROM citation_series s JOIN publications p ON p.id = s.publication_id "
+            "JOIN authors a ON a.id = p.author_id WHERE a.key = ? AND p.pub_id = ?",
+            (key, pub_id),
+        ).fetchone()
+        return decode_points(row[0]) if row else []
+
+    def _gain_rows(self, weeks, author=None, today=None):
+        """Series rows of the matching publications and the citations each gained in `weeks`"""
+        where, params = "", []
+        if author is not None:
+            where, params = "WHERE p.author_id = ?", [self._author_id(author)]
+        rows = self.conn.execute(
+            "SELECT a.key, a.name, p.pub_id, p.title, s.last_citations, s.points "
+            "FROM citation_series s JOIN publications p ON p.id = s.publication_id "
+            f"JOIN authors a ON a.id = p.author_id {where}",
+            params,
+        ).fetchall()
+        cutoff = (day_number() if today is None else today) - 7 * weeks
+        baseline = values_at([row[5] for row in rows], cutoff)
+        return rows, [row[4] - int(before) for row, before in zip(rows, baseline)]
+
+    def citation_gains(self, weeks, author=None, today=None):
+        """
+        Citations each author gained in the last `weeks` weeks, most first.
+
+        Publications first seen within the window count from their first
+        recorded count.
+        """
+        rows, gains = self._gain_rows(weeks, author, today)
+        totals = {}
+        for row, gained in zip(rows, gains):
+            entry = totals.setdefault(row[0], {"key": row[0], "name": row[1], "citations": 0, "gained": 0})
+            entry["citations"] += row[4]
+            entry["gained"] += gained
+        return sorted(totals.values(), key=lambda entry: -entry["gained"])
+
+    def publication_gains(self, weeks, author=None, limit=10, today=None):
+        """The `limit` publications that gained the most citations in the last `weeks` weeks"""
+        rows, gains = self._gain_rows(weeks, author, today)
+        ranked = sorted(zip(rows, gains), key=lambda item: -item[1])[:limit]
+        return [
+            {"key": row[0], "name": row[1], "id": row[2], "title": row[3], "citations": row[4], "gained": gained}
+            for row, gained in ranked
+        ]
+
+    def export_excel(self, keys, label, filename=None):
+        """Write the publications of the authors with these keys to an Excel file"""
+        from excel_export import StreamingExcelWriter, excel_filename
+
+        with StreamingExcelWriter(filename or excel_filename(label)) as writer:
+            for pub, author_name, scopus_author_id in self.rows_for_export(keys):
+                writer.write(pub, author_name, scopus_author_id)
+        return writer.filename
+
+    def stats(self):
+        authors, publications, series_bytes = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM authors), (SELECT COUNT(*) FROM publications), "
+            "(SELECT COALESCE(SUM(LENGTH(points)), 0) FROM citation_series)"
+        ).fetchone()
+        return {"authors": authors, "publications": publications, "series_bytes": series_bytes}
+
+    def close(self):
+        self.conn.close()
+
+
+@contextmanager
+def open_store(store=None, state_dir="results"):
+    """Use `store` if given, otherwise open (and finally close) the one in `state_dir`"""
+    if store is not None:
+        yield store
+        return
+    store = PublicationStore(store_path(state_dir))
+    try:
+        yield store
+    finally:
+        store.close()
@@ -1,39 +1,42 @@
+"""
+Manual check of the live ScraperAPI SERP endpoint (needs `key` in .env).
+
+Run it directly: python test_api.py. The pytest suite in tests/ covers the
+client against saved responses, so nothing here runs on import.
+"""
+import asyncio
 import json
-import http.client
-from urllib.parse import urlencode
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-KEY = os.getenv("key")
-
-conn = http.client.HTTPSConnection("scraperapi.thordata.com")
-params = {
-    "engine": "google_scholar",
-    "q": "Andrew Ng",
-    "json": "1",
-    "start": "0"
-}
-payload = urlencode(params)
-headers = {
-    'Authorization': f'Bearer {KEY}',
-    'Content-Type': 'application/x-www-form-urlencoded'
-}
-
-conn.request("POST", "/request", payload, headers)
-res = conn.getresponse()
-raw = res.read().decode("utf-8")
-
-print("Raw response:")
-print(raw[:500])
-print("\n" + "="*60 + "\n")
-
-try:
-    data = json.loads(raw)
-    if isinstance(data, str):
-        data = json.loads(data)
-    
-    print("Parsed JSON structure:")
-    print(json.dumps(data, indent=2)[:2000])
-except Exception as e:
-    print(f"Error: {e}")
+
+from http_client import HttpClient
+from serp_client import SerpClient, SerpError
+
+
+async def main(key):
+    async with HttpClient() as client:
+        serp = SerpClient(key, client)
+
+        try:
+            data = await serp.request({
+                "engine": "google_scholar",
+                "q": "Andrew Ng",
+                "start": "0"
+            })
+        except SerpError as e:
+            print(f"Error: {e}")
+            return
+
+        print("Parsed JSON structure:")
+        print(json.dumps(data, indent=2)[:2000])
+        print("\n" + "="*60 + "\n")
+
+        # Second call reuses the same keep-alive connection
+        link = await serp.find_author_profile_link("Andrew Ng")
+        print(f"Author profile link: {link}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    asyncio.run(main(os.getenv("key")))
@@ -0,0 +1,51 @@
+"""
+Shared pytest fixtures.
+
+The tools are flat top-level modules, so the repository root is put on
+sys.path. Saved Scholar pages and API responses live in `fixtures/`;
+`serve` runs an aiohttp app on a local port, so the HTTP clients are
+tested against real requests without touching the network.
+"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+
+@pytest.fixture
+def fixture_text():
+    """Contents of a saved fixture file"""
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            return f.read()
+    return read
+
+
+@pytest.fixture
+def fixture_json(fixture_text):
+    return lambda name: json.loads(fixture_text(name))
+
+
+@pytest.fixture
+def serve():
+    """
+    `serve(app, test)` starts `app` (an aiohttp web.Application) on a local
+    port and returns the result of `await test(http_client, base_url)`.
+    """
+    from aiohttp.test_utils import TestServer
+
+    from http_client import HttpClient
+
+    def run(app, test):
+        async def main():
+            async with TestServer(app) as server, HttpClient() as client:
+                return await test(client, str(server.make_url("")).rstrip("/"))
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,166 @@
+import asyncio
+
+from aiohttp import web
+
+from abstract_fetcher import CAPTCHA_BLOCKED, FETCH_FAILED, PagePool, fetch_abstracts
+from http_engine import HttpSlots, get_abstract_over_http
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    """Stands in for a Playwright page: open until its context is closed, `healthy` decides the probe"""
+
+    def __init__(self):
+        self.context = FakeContext()
+        self.healthy = True
+
+    def is_closed(self):
+        return self.context.closed
+
+    async def evaluate(self, script):
+        if not self.healthy:
+            raise RuntimeError("Target crashed")
+        return 1
+
+
+def make_pool(size=2, max_uses=50):
+    pages = []
+
+    async def factory():
+        pages.append(FakePage())
+        return pages[-1]
+
+    return PagePool(factory, size, max_uses), pages
+
+
+# ---------------- PagePool ----------------
+def test_pool_never_lends_more_than_size_pages():
+    pool, pages = make_pool(size=2)
+    borrowed = set()
+    peak = 0
+
+    async def fetch():
+        nonlocal peak
+        async with pool.page() as page:
+            assert page not in borrowed
+            borrowed.add(page)
+            peak = max(peak, len(borrowed))
+            await asyncio.sleep(0.01)
+            borrowed.discard(page)
+
+    async def main():
+        await asyncio.gather(*(fetch() for _ in range(6)))
+
+    asyncio.run(main())
+
+    assert peak == 2
+    assert len(pages) == 2
+    assert pool.stats()["acquires"] == 6
+
+
+def test_pool_recycles_pages_after_max_uses():
+    pool, pages = make_pool(size=1, max_uses=2)
+
+    async def main():
+        for _ in range(5):
+            async with pool.page():
+                pass
+
+    asyncio.run(main())
+
+    assert len(pages) == 3
+    assert [page.context.closed for page in pages] == [True, True, False]
+    assert pool.stats()["recycled"] == 2
+
+
+def test_pool_replaces_suspect_pages_that_fail_the_health_check():
+    pool, pages = make_pool(size=1)
+
+    async def borrow(fail=False):
+        async with pool.page() as page:
+            if fail:
+                raise RuntimeError("navigation failed")
+            return page
+
+    async def main():
+        try:
+            await borrow(fail=True)
+        except RuntimeError:
+            pass
+        # A suspect page that still answers is reused
+        assert await borrow() is pages[0]
+
+        try:
+            await borrow(fail=True)
+        except RuntimeError:
+            pass
+        pages[0].healthy = False
+        return await borrow()
+
+    replacement = asyncio.run(main())
+
+    assert replacement is pages[1]
+    assert pages[0].context.closed
+    assert pool.stats()["unhealthy"] == 1
+
+
+def test_pool_closes_every_page_on_exit():
+    pool, pages = make_pool(size=3)
+
+    async def main():
+        async with pool:
+            await asyncio.gather(*(pool.page().__aenter__() for _ in range(3)))
+
+    asyncio.run(main())
+
+    assert len(pages) == 3
+    assert all(page.context.closed for page in pages)
+
+
+# ---------------- fetch_abstracts ----------------
+def test_fetch_abstracts_over_http_slots(serve, fixture_text):
+    in_flight, peak = 0, 0
+
+    async def handle(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        name = request.match_info["name"]
+        if name == "blocked":
+            return web.Response(text=fixture_text("captcha_page.html"), content_type="text/html")
+        if name == "broken":
+            return web.Response(status=500)
+        return web.Response(text=fixture_text("publication_page.html"), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/citations/{name}", handle)
+    hrefs = ["/citations/a", "/citations/blocked", "/citations/b", "/citations/broken", "/citations/c"]
+    results = []
+
+    async def test(client, base):
+        async def extract(session, url, pub_num):
+            return await get_abstract_over_http(session, url, pub_num)
+
+        return await fetch_abstracts(
+            HttpSlots(client, 2), hrefs, extract, base + "/citations?user=X",
+            on_result=lambda index, abstract: results.append(index)
+        )
+
+    abstracts = serve(app, test)
+
+    assert abstracts[0] == abstracts[2] == abstracts[4]
+    assert abstracts[0].startswith("We present a deep learning method")
+    assert abstracts[1] == CAPTCHA_BLOCKED
+    assert abstracts[3] == FETCH_FAILED
+    # Only pages that were actually read are reported, e.g. for checkpointing
+    assert sorted(results) == [0, 2, 4]
+    assert peak == 2
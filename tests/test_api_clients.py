@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from scholar_parser import AuthorCandidate, ProfileRow
+from scopus_client import ScopusClient
+from serp_client import SerpClient, SerpError
+
+
+# ---------------- ScraperAPI SERP ----------------
+def serp_app(responses, requests):
+    """App answering POST /request with the next (status, body) of `responses`"""
+    async def handle(request):
+        form = dict(await request.post())
+        requests.append((request.headers.get("Authorization"), form))
+        status, body = responses.pop(0)
+        return web.Response(text=body, status=status)
+
+    app = web.Application()
+    app.router.add_post("/request", handle)
+    return app
+
+
+def test_serp_find_author_candidates(serve, fixture_text):
+    requests = []
+    app = serp_app([(200, fixture_text("serp_search.json"))], requests)
+
+    candidates = serve(app, lambda client, base: SerpClient("KEY", client, base).find_author_candidates("Jane Doe"))
+
+    assert [(c.name, c.href) for c in candidates] == [
+        ("J Doe", "https://scholar.google.com/citations?user=JD0e8AAAAAJ&hl=en"),
+        ("R Roe", "https://scholar.google.com/citations?user=RRoe1xAAAAJ&hl=en"),
+    ]
+    assert requests == [("Bearer KEY", {"engine": "google_scholar", "q": "Jane Doe", "start": "0", "json": "1"})]
+
+
+def test_serp_list_author_publications(serve, fixture_text):
+    requests = []
+    app = serp_app([(200, fixture_text("serp_author_articles.json"))], requests)
+
+    rows = serve(app, lambda client, base: SerpClient("KEY", client, base, parallel_pages=1)
+                 .list_author_publications("JD0e8AAAAAJ"))
+
+    assert rows == [
+        ProfileRow(
+            title="Deep learning for protein structure prediction",
+            href="/citations?view_op=view_citation&hl=en&user=JD0e8AAAAAJ&citation_for_view=JD0e8AAAAAJ:u5HHmVD_uO8C",
+            year=2020,
+            citations=1234,
+        ),
+        ProfileRow(
+            title="COVID-19 & the C++ toolchain",
+            href="https://scholar.google.com/citations?view_op=view_citation&citation_for_view=JD0e8AAAAAJ:d1gkVwhDpl0C",
+            year=None,
+            citations=0,
+        ),
+    ]
+    assert requests[0][1]["engine"] == "google_scholar_author"
+    assert (requests[0][1]["start"], requests[0][1]["num"]) == ("0", "100")
+
+
+def test_serp_retries_server_errors_and_decodes_double_encoded_json(serve, fixture_text):
+    requests = []
+    body = json.dumps(fixture_text("serp_search.json"))
+    app = serp_app([(503, "busy"), (429, "slow down"), (200, body)], requests)
+
+    link = serve(app, lambda client, base: SerpClient("KEY", client, base, backoff=0).find_author_profile_link("Jane"))
+
+    assert link == "https://scholar.google.com/citations?user=JD0e8AAAAAJ&hl=en"
+    assert len(requests) == 3
+
+
+def test_serp_client_error_is_not_retried(serve):
+    requests = []
+    app = serp_app([(401, "invalid token")], requests)
+
+    with pytest.raises(SerpError, match="HTTP 401"):
+        serve(app, lambda client, base: SerpClient("KEY", client, base, backoff=0).request({"q": "x"}))
+    assert len(requests) == 1
+
+
+# ---------------- Scopus ----------------
+def scopus_app(fixture_json, requests):
+    """App serving the author search and a document search that pages through scopus_documents.json"""
+    documents = fixture_json("scopus_documents.json")
+
+    async def authors(request):
+        requests.append(("author", dict(request.query), request.headers.get("X-ELS-APIKey")))
+        return web.json_response(fixture_json("scopus_authors.json"), headers={"X-RateLimit-Remaining": "99"})
+
+    async def search(request):
+        requests.append(("scopus", dict(request.query), request.headers.get("X-ELS-APIKey")))
+        if request.query["query"].endswith('(TITLE("nonexistent paper"))'):
+            return web.json_response(fixture_json("scopus_empty.json"))
+        start, count = int(request.query.get("start", 0)), int(request.query["count"])
+        page = dict(documents["search-results"], entry=documents["search-results"]["entry"][start:start + count])
+        return web.json_response({"search-results": page})
+
+    app = web.Application()
+    app.router.add_get("/content/search/author", authors)
+    app.router.add_get("/content/search/scopus", search)
+    return app
+
+
+def test_scopus_find_author_candidates(serve, fixture_json):
+    requests = []
+
+    async def test(client, base):
+        scopus = ScopusClient("KEY", client, base)
+        return await scopus.find_author_candidates("Jane Doe"), scopus._remaining
+
+    candidates, remaining = serve(scopus_app(fixture_json, requests), test)
+
+    assert candidates == [
+        AuthorCandidate(
+            name="Jane Doe",
+            href="57000000001",
+            affiliation="Example University, Springfield, United States",
+            cited_by=87,
+            interests=["Computer Science", "Biochemistry"],
+        ),
+        AuthorCandidate(
+            name="John Doe",
+            href="57000000002",
+            affiliation="Other Institute, Canada",
+            cited_by=3,
+            interests=["Physics"],
+        ),
+    ]
+    assert requests[0][1]["query"] == "AUTHLAST(doe) AND AUTHFIRST(jane)"
+    assert requests[0][2] == "KEY"
+    assert remaining == 99
+
+
+def test_scopus_find_author_id_ranks_candidates(serve, fixture_json):
+    app = scopus_app(fixture_json, [])
+
+    author_id = serve(app, lambda client, base: ScopusClient("KEY", client, base).find_author_id(
+        "John Doe", affiliation="Other Institute"))
+
+    assert author_id == "57000000002"
+
+
+def test_scopus_fetch_author_documents_pages_concurrently(serve, fixture_json):
+    requests = []
+
+    async def test(client, base):
+        return await ScopusClient("KEY", client, base).fetch_author_documents("57000000001", page_size=2)
+
+    index = serve(scopus_app(fixture_json, requests), test)
+
+    assert len(index) == 3
+    assert sorted(request[1]["start"] for request in requests) == ["0", "2"]
+    assert all(request[1]["query"] == "AU-ID(57000000001)" for request in requests)
+    assert index.match("Deep Learning for Protein Structure Prediction.")["scopus_id"] == "85080000001"
+    assert index.match("COVID-19 & the C++ toolchain", 2021)["eid"] == "2-s2.0-85100000002"
+    assert index.match("Anything", doi="10.1000/PF.2019.003")["publication_year"] == 2019
+    assert index.match("An uncited workshop note") is None
+
+
+def test_scopus_match_publications_in_batches(serve, fixture_json):
+    requests = []
+    titles = ["Deep learning for protein structure prediction", "Protein folding at scale", "Nonexistent paper"]
+
+    async def test(client, base):
+        return await ScopusClient("KEY", client, base, batch_size=2).match_publications("57000000001", titles)
+
+    matches = serve(scopus_app(fixture_json, requests), test)
+
+    assert [match and match["scopus_id"] for match in matches] == ["85080000001", "85060000003", None]
+    assert len(requests) == 2
+    assert all(request[1]["query"].startswith("AU-ID(57000000001) AND (TITLE(") for request in requests)
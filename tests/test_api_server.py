@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import store as store_module
+from api_server import create_app
+from models import Author, Publication
+from store import PublicationStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PublicationStore(str(tmp_path / "publications.sqlite3"))
+    publications = [Publication(f"Paper {i}", 2015 + i % 5, i * 3, link=f"/c?citation_for_view=U:{i}")
+                    for i in range(25)]
+    store.save_author(Author("Ann Lee", "https://scholar.google.com/citations?user=U", None, publications))
+    yield store
+    store.close()
+
+
+def call(store, test):
+    """Run `await test(client)` against the API served from `store`"""
+    async def main():
+        async with TestClient(TestServer(create_app(store))) as client:
+            return await test(client)
+    return asyncio.run(main())
+
+
+def test_publications_are_paginated(store):
+    async def test(client):
+        response = await client.get("/api/publications", params={"page": "2", "page_size": "10"})
+        return response.status, await response.json()
+
+    status, body = call(store, test)
+
+    assert status == 200
+    assert (body["total"], body["pages"], len(body["items"])) == (25, 3, 10)
+    assert body["items"][0]["citations"] == 42
+
+
+def test_matching_etag_gets_304(store):
+    async def test(client):
+        first = await client.get("/api/authors")
+        again = await client.get("/api/authors", headers={"If-None-Match": first.headers["ETag"]})
+        other = await client.get("/api/authors/U", headers={"If-None-Match": first.headers["ETag"]})
+        return first.status, again.status, other.status
+
+    assert call(store, test) == (200, 304, 200)
+
+
+def test_errors_are_client_errors(store):
+    async def test(client):
+        unknown = await client.get("/api/authors/nobody")
+        bad_sort = await client.get("/api/publications", params={"sort": "bogus"})
+        bad_year = await client.get("/api/publications", params={"year": "x"})
+        return unknown.status, bad_sort.status, bad_year.status
+
+    assert call(store, test) == (404, 400, 400)
+
+
+def test_queries_run_off_the_event_loop(store, monkeypatch):
+    threads = set()
+    authors = PublicationStore.authors
+
+    def slow_authors(self):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.5)
+        return authors(self)
+
+    monkeypatch.setattr(store_module.PublicationStore, "authors", slow_authors)
+
+    async def test(client):
+        slow = asyncio.ensure_future(client.get("/api/authors"))
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        fast = await client.get("/api/publications", params={"page_size": "1"})
+        elapsed = time.monotonic() - start
+        return elapsed, fast.status, (await slow).status
+
+    elapsed, fast_status, slow_status = call(store, test)
+
+    # The publication page is answered while the slow metrics query is still running
+    assert elapsed < 0.4
+    assert (fast_status, slow_status) == (200, 200)
+    assert all(name.startswith("store") for name in threads)
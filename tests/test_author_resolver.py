@@ -0,0 +1,49 @@
+from author_resolver import choose_candidate, name_similarity
+from scholar_parser import AuthorCandidate
+
+
+def candidate(name, affiliation="", cited_by=0, interests=(), href=None):
+    return AuthorCandidate(name, href or f"/citations?user={name.split()[-1]}", affiliation, cited_by, list(interests))
+
+
+def test_initials_and_word_order_are_tolerated_but_the_surname_must_match():
+    assert name_similarity("J. A. Smith", "John Smith") >= 0.8
+    assert name_similarity("Smith, John", "John Smith") >= 0.8
+    assert name_similarity("John Smith", "John Smyth-Jones") < 0.8
+
+
+def test_affiliation_decides_between_namesakes():
+    candidates = [
+        candidate("John Smith", "Professor, University of Oxford", cited_by=50000, href="oxford"),
+        candidate("John Smith", "Department of Physics, ETH Zurich", cited_by=300, href="eth"),
+    ]
+
+    assert choose_candidate("John Smith", candidates).href == "oxford"
+    assert choose_candidate("John Smith", candidates, affiliation="ETH Zürich").href == "eth"
+
+
+def test_topics_decide_between_namesakes():
+    candidates = [
+        candidate("Maria Garcia", "Universidad de Sevilla", 900, ["Organic chemistry", "Catalysis"], href="chem"),
+        candidate("Maria Garcia", "Universidad de Sevilla", 800, ["Machine learning", "Computer vision"], href="ml"),
+    ]
+
+    assert choose_candidate("Maria Garcia", candidates, topics=["machine learning"]).href == "ml"
+    assert choose_candidate("Maria Garcia", candidates, topics=["catalysis"]).href == "chem"
+
+
+def test_ties_go_to_the_more_cited_profile_with_a_warning(capsys):
+    candidates = [
+        candidate("Wei Zhang", "Tsinghua University", cited_by=120, href="less"),
+        candidate("Wei Zhang", "Tsinghua University", cited_by=4000, href="more"),
+    ]
+
+    chosen = choose_candidate("Wei Zhang", candidates, affiliation="Tsinghua")
+
+    assert chosen.href == "more"
+    assert "are close" in capsys.readouterr().out
+
+
+def test_no_candidate_with_a_similar_name():
+    assert choose_candidate("John Smith", []) is None
+    assert choose_candidate("John Smith", [candidate("Jane Doe", "University of Oxford", 10000)]) is None
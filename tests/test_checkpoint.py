@@ -0,0 +1,80 @@
+from checkpoint import CheckpointJournal, checkpoint_path
+from incremental import IncrementalPlan
+from models import Publication
+
+
+LINK = "/citations?view_op=view_citation&citation_for_view=U:{}"
+
+
+def publication(i, **fields):
+    return Publication(title=f"Paper {i}", year=2020, citations=i, abstract=f"Abstract {i}",
+                       link=LINK.format(i), abstract_status="ok", **fields)
+
+
+def test_checkpoint_path_uses_the_scholar_user_id(tmp_path):
+    path = checkpoint_path(tmp_path, "https://scholar.google.com/citations?user=AbC123&hl=en", "Jane Doe")
+
+    assert path == str(tmp_path / "AbC123.checkpoint.jsonl")
+
+
+def test_resume_reads_back_finished_publications(tmp_path):
+    path = str(tmp_path / "a.checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append(publication(1))
+    journal.append(publication(2, scopus_id="85000000002"))
+    journal.close()
+
+    resumed = CheckpointJournal(path, resume=True)
+    resumed.close()
+
+    assert [pub.to_dict() for pub in resumed.completed] == [publication(1).to_dict(),
+                                                           publication(2, scopus_id="85000000002").to_dict()]
+
+
+def test_resume_skips_checkpointed_rows(tmp_path):
+    path = str(tmp_path / "a.checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append(publication(1))
+    journal.append(Publication(title="Paper 2", year=2020, citations=2, abstract=None, link=LINK.format(2),
+                               abstract_status="blocked"))
+    journal.close()
+
+    resumed = CheckpointJournal(path, resume=True)
+    resumed.close()
+    rows = [(f"Paper {i}", LINK.format(i), 2020, i) for i in (1, 2, 3)]
+    plan = IncrementalPlan(rows, resumed.completed)
+
+    # Only the finished page is reused; the blocked one and the new row are fetched
+    assert list(plan.reused) == [0]
+    assert plan.to_fetch == [1, 2]
+
+
+def test_torn_last_line_is_ignored_and_appends_continue_on_a_new_line(tmp_path):
+    path = str(tmp_path / "a.checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append(publication(1))
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "t:broken", "title": "Paper 2", "ye')
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert [pub.title for pub in resumed.completed] == ["Paper 1"]
+    resumed.append(publication(3))
+    resumed.close()
+
+    again = CheckpointJournal(path, resume=True)
+    again.close()
+    assert [pub.title for pub in again.completed] == ["Paper 1", "Paper 3"]
+
+
+def test_run_without_resume_starts_a_fresh_journal_and_finish_removes_it(tmp_path):
+    path = str(tmp_path / "a.checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append(publication(1))
+    journal.close()
+
+    fresh = CheckpointJournal(path)
+    assert fresh.completed == []
+    fresh.finish()
+
+    assert not (tmp_path / "a.checkpoint.jsonl").exists()
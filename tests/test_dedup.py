@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from abstract_fetcher import FETCH_FAILED
+from dedup import DedupIndex, is_generic_title
+from models import Author, Publication
+from scopus_client import AuthorDocumentIndex
+from store import PublicationStore
+
+
+TITLE = "Deep learning for protein folding"
+DETAILS = {"eid": "2-s2.0-2", "doi": "10.1/y", "scopus_id": "2", "title": TITLE, "publication_year": 2021}
+
+
+def test_waiter_gets_the_claimers_abstract():
+    index = DedupIndex()
+
+    async def main():
+        action, paper = index.claim(TITLE, 2021, "A")
+        waited, future = index.claim(TITLE, 2021, "B")
+        index.resolve(paper, "An abstract")
+        return action, waited, await future, index.claim(TITLE, 2021, "C")
+
+    action, waited, abstract, later = asyncio.run(main())
+
+    assert (action, waited, abstract) == ("fetch", "wait", "An abstract")
+    assert later == ("shared", "An abstract")
+    assert index.abstracts_shared == 1
+
+
+@pytest.mark.parametrize("failure", [None, FETCH_FAILED])
+def test_failed_claim_releases_waiters_and_is_fetched_again(failure):
+    index = DedupIndex()
+
+    async def main():
+        _, paper = index.claim(TITLE, 2021, "A")
+        _, future = index.claim(TITLE, 2021, "B")
+        index.resolve(paper, failure)
+        return await future, index.claim(TITLE, 2021, "B")[0]
+
+    assert asyncio.run(main()) == (None, "fetch")
+
+
+def test_near_duplicate_titles_match_but_numbers_must_agree():
+    index = DedupIndex()
+    paper = index.add("Deep learning for protein folding: a survey", 2021)
+
+    assert index.match("Deep learning for protein-folding - a survey.", 2021) is paper
+    assert index.match("Deep learning for protein folding: a survey", 2019) is None
+    part = index.add("Graph neural networks for chemistry, part 1", 2020)
+    assert index.match("Graph neural networks for chemistry, part 2", 2020) is None
+    assert index.match("Graph neural networks for chemistry, part 1", 2020) is part
+
+
+def test_generic_titles_are_not_merged():
+    index = DedupIndex()
+
+    async def main():
+        first = index.claim("Editorial", 2020, "A")
+        second = index.claim("Editorial", 2020, "B")
+        return first[0], second[0]
+
+    assert is_generic_title("Editorial") and is_generic_title("Short title")
+    assert not is_generic_title(TITLE)
+    assert asyncio.run(main()) == ("fetch", "fetch")
+    preface = index.paper_for(Publication("Preface", 2020), "A")
+    assert index.paper_for(Publication("Preface", 2020), "B") is not preface
+    assert index.shared_papers() == []
+
+
+def test_scopus_match_is_reused_only_by_related_authors_or_the_own_index():
+    index = DedupIndex()
+    own = Publication(TITLE, 2021)
+    index.paper_for(own, "A")
+    index.add_scopus(own, DETAILS, "A")
+    copy = Publication(TITLE, 2021)
+    index.paper_for(copy, "C")
+
+    # One shared title does not make C a co-author of A
+    assert index.scopus_for(copy, "C") is None
+    assert index.scopus_for(copy, "C", AuthorDocumentIndex([DETAILS])) == DETAILS
+
+    index.paper_for(Publication("Another shared paper on graphs", 2019), "A")
+    index.paper_for(Publication("Another shared paper on graphs", 2019), "C")
+
+    assert index.scopus_for(copy, "C") == DETAILS
+
+
+def test_generic_titles_do_not_share_scopus_matches():
+    index = DedupIndex()
+    editorial = Publication("Editorial", 2020)
+    index.add_scopus(editorial, dict(DETAILS, title="Editorial"), "A")
+
+    assert index.scopus_for(Publication("Editorial", 2020), "A") is None
+
+
+def test_stored_copies_are_looked_up_in_sql(tmp_path):
+    store = PublicationStore(str(tmp_path / "publications.sqlite3"))
+    stored = Publication(TITLE, 2021, 4, "A stored abstract", "/c?citation_for_view=A:1", abstract_status="ok")
+    stored.apply_scopus(DETAILS)
+    blocked = Publication("Graph neural networks for chemistry", 2020, 1, None, "/c?citation_for_view=A:2",
+                          abstract_status="blocked")
+    store.save_author(Author("Ann Lee", "https://scholar.google.com/citations?user=A", None, [stored, blocked]))
+    index = DedupIndex.from_store(store)
+
+    async def main():
+        return index.claim(TITLE.upper(), 2021, "B"), index.claim(blocked.title, 2020, "B")[0]
+
+    try:
+        shared, blocked_action = asyncio.run(main())
+        paper = index.match(TITLE, 2021)
+        unrelated = index.match("An unrelated title about compilers", 2021)
+    finally:
+        store.close()
+
+    assert shared == ("shared", "A stored abstract")
+    # Blocked pages of the stored copy are fetched again
+    assert blocked_action == "fetch"
+    assert paper.authors == {"A", "B"} and paper.scopus["doi"] == "10.1/y"
+    assert unrelated is None
@@ -0,0 +1,33 @@
+import pytest
+
+from excel_export import save_to_excel
+from models import Publication
+
+
+def read_rows(filename):
+    from openpyxl import load_workbook
+
+    return list(load_workbook(filename).active.iter_rows(min_row=2, max_col=5, values_only=True))
+
+
+def test_save_to_excel(tmp_path):
+    publications = [Publication("A", 2020, 3, "An abstract"), Publication("B", abstract_status="failed")]
+
+    filename = save_to_excel(publications, "Jane Doe", "57000000001", str(tmp_path / "out.xlsx"))
+
+    assert read_rows(filename) == [
+        (1, "Jane Doe", "57000000001", "A", "An abstract"),
+        (2, "Jane Doe", "57000000001", "B", "(Abstract fetch failed)"),
+    ]
+
+
+def test_save_to_excel_keeps_rows_written_before_an_error(tmp_path):
+    def publications():
+        yield Publication("A", 2020)
+        raise RuntimeError("scrape died")
+
+    filename = str(tmp_path / "out.xlsx")
+    with pytest.raises(RuntimeError):
+        save_to_excel(publications(), "Jane Doe", None, filename)
+
+    assert read_rows(filename) == [(1, "Jane Doe", "N/A", "A", "(No abstract found)")]
@@ -0,0 +1,75 @@
+import itertools
+
+import pytest
+
+import page_cache
+from page_cache import PageCache, normalize_citation_url
+
+
+URL = "https://scholar.google.com/citations?view_op=view_citation&hl=en&user=U&citation_for_view=U:{}"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.time() that advances one second per call unless set"""
+    now = {"t": 1000.0}
+    ticks = itertools.count()
+
+    def time():
+        return now["t"] + next(ticks)
+
+    monkeypatch.setattr(page_cache.time, "time", time)
+    return now
+
+
+def test_normalize_citation_url_ignores_host_and_ui_params():
+    assert normalize_citation_url(URL.format("abc")) == "citation_for_view=U:abc"
+    assert normalize_citation_url("/citations?view_op=view_citation&citation_for_view=U:abc&hl=de") == \
+        "citation_for_view=U:abc"
+
+
+def test_get_returns_what_was_put(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put(URL.format(1), "An abstract")
+
+    assert cache.get(URL.format(1).replace("hl=en", "hl=fr")) == "An abstract"
+    assert cache.get(URL.format(2)) is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+    cache.close()
+
+
+def test_expired_entries_are_dropped(tmp_path, clock):
+    cache = PageCache(tmp_path, ttl_days=1)
+    cache.put(URL.format(1), "old")
+
+    clock["t"] += 2 * 24 * 3600
+    assert cache.get(URL.format(1)) is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    cache = PageCache(tmp_path, max_bytes=350)
+    for i in range(3):
+        cache.put(URL.format(i), "x" * 100)
+    assert cache.get(URL.format(0)) == "x" * 100
+
+    cache.put(URL.format(3), "x" * 100)
+
+    assert cache.get(URL.format(1)) is None
+    assert all(cache.get(URL.format(i)) for i in (0, 2, 3))
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+def test_size_is_tracked_across_replacements_and_reopening(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put(URL.format(1), "x" * 10)
+    cache.put(URL.format(1), "x" * 30)
+    cache.put(URL.format(2), "é" * 5)
+    assert cache.size() == 40
+    cache.close()
+
+    reopened = PageCache(tmp_path)
+    assert reopened.stats()["bytes"] == 40
+    reopened.close()
@@ -0,0 +1,100 @@
+import pytest
+from aiohttp import web
+
+import profile_loader
+from profile_loader import ProfileFetchError, fetch_profile_rows, listing_complete, looks_blocked, profile_page_url
+from scholar_parser import parse_publication_abstract
+
+
+AUTHOR_LINK = "/citations?user=JD0e8AAAAAJ&hl=en"
+
+
+def profile_app(pages, requests, status=200):
+    """App answering the profile URL with `pages[cstart]`"""
+    async def profile(request):
+        requests.append(dict(request.query))
+        return web.Response(text=pages[int(request.query["cstart"])], status=status, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/citations", profile)
+    return app
+
+
+def test_profile_page_url_keeps_user_and_adds_paging():
+    url = profile_page_url("https://scholar.google.com/citations?user=JD0e8AAAAAJ&hl=de", 200)
+
+    assert url == "https://scholar.google.com/citations?user=JD0e8AAAAAJ&hl=de&cstart=200&pagesize=100"
+
+
+def test_fetch_profile_rows_single_page(serve, fixture_text):
+    requests = []
+    app = profile_app({0: fixture_text("profile_page.html")}, requests)
+
+    rows = serve(app, lambda client, base: fetch_profile_rows(client, base + AUTHOR_LINK))
+
+    assert [row.title for row in rows] == [
+        "Deep learning for protein structure prediction",
+        "COVID-19 & the C++ toolchain",
+        "An uncited workshop note",
+    ]
+    assert requests == [{"user": "JD0e8AAAAAJ", "hl": "en", "cstart": "0", "pagesize": "100"}]
+
+
+def test_fetch_profile_rows_pages_until_short_page(serve, fixture_text, monkeypatch):
+    monkeypatch.setattr(profile_loader, "PAGE_SIZE", 3)
+    requests = []
+    app = profile_app({0: fixture_text("profile_page.html"), 3: fixture_text("profile_page_empty.html")}, requests)
+
+    rows = serve(app, lambda client, base: fetch_profile_rows(client, base + AUTHOR_LINK))
+
+    assert len(rows) == 3
+    assert [request["cstart"] for request in requests] == ["0", "3"]
+
+
+def test_listing_that_reached_the_row_limit_may_be_cut_short():
+    assert listing_complete([None] * (profile_loader.MAX_ROWS - 1))
+    assert not listing_complete([None] * profile_loader.MAX_ROWS)
+
+
+def test_fetch_profile_rows_blocked(serve, fixture_text):
+    app = profile_app({0: fixture_text("captcha_page.html")}, [])
+
+    with pytest.raises(ProfileFetchError, match="CAPTCHA"):
+        serve(app, lambda client, base: fetch_profile_rows(client, base + AUTHOR_LINK))
+
+
+def test_fetch_profile_rows_redirected_to_sorry_page(serve, fixture_text):
+    async def profile(request):
+        raise web.HTTPFound("/sorry/index?continue=" + request.path_qs)
+
+    async def sorry(request):
+        return web.Response(text=fixture_text("google_sorry_page.html"), status=200, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/citations", profile)
+    app.router.add_get("/sorry/index", sorry)
+
+    with pytest.raises(ProfileFetchError, match="CAPTCHA"):
+        serve(app, lambda client, base: fetch_profile_rows(client, base + AUTHOR_LINK))
+
+
+def test_looks_blocked_on_captcha_pages(fixture_text):
+    assert looks_blocked(fixture_text("captcha_page.html"))
+    # Google's own page only shows it is blocked by where the request ended up
+    assert looks_blocked(fixture_text("google_sorry_page.html"), "https://www.google.com/sorry/index?continue=x")
+    assert looks_blocked('<form method="post" action="https://www.google.com/sorry/index">')
+
+
+def test_looks_blocked_ignores_pages_that_only_mention_captchas(fixture_text):
+    html = fixture_text("publication_page_mentions_captcha.html")
+
+    assert not looks_blocked(html, "https://scholar.google.com/citations?view_op=view_citation")
+    assert not looks_blocked(fixture_text("profile_page.html"))
+    assert "reCAPTCHA v2" in parse_publication_abstract(html)
+
+
+def test_fetch_profile_rows_server_error(serve, fixture_text):
+    app = profile_app({0: fixture_text("profile_page.html")}, [], status=503)
+
+    with pytest.raises(ProfileFetchError, match="HTTP 503"):
+        serve(app, lambda client, base: fetch_profile_rows(client, base + AUTHOR_LINK))
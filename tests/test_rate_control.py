@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from rate_control import AdaptiveRateController
+
+
+URL = "https://scholar.google.com/citations?user=X"
+
+
+def interval(controller):
+    return controller.hosts["scholar.google.com"].interval
+
+
+def controller(**kwargs):
+    kwargs.setdefault("verbose", False)
+    pacer = AdaptiveRateController(**kwargs)
+    pacer._host(URL)
+    return pacer
+
+
+def test_block_doubles_the_interval_and_empties_the_bucket():
+    pacer = controller(rate=1.0)
+
+    pacer.record(URL, outcome="blocked")
+
+    assert interval(pacer) == 2.0
+    assert pacer.hosts["scholar.google.com"].tokens == 0.0
+    assert pacer.hosts["scholar.google.com"].blocks == 1
+
+
+def test_error_grows_the_interval_by_half():
+    pacer = controller(rate=1.0)
+
+    pacer.record(URL, outcome="error")
+
+    assert interval(pacer) == 1.5
+
+
+def test_slow_responses_grow_the_interval():
+    pacer = controller(rate=1.0, target_latency=1.0)
+
+    pacer.record(URL, 1.5)
+    assert interval(pacer) == 1.0      # below twice the target
+    pacer.record(URL, 6.0)             # EWMA 0.7 * 1.5 + 0.3 * 6 = 2.85
+
+    assert interval(pacer) == 1.25
+
+
+def test_fast_success_streaks_shrink_the_interval():
+    pacer = controller(rate=1.0, speedup_after=3)
+
+    for _ in range(2):
+        pacer.record(URL, 0.1)
+    assert interval(pacer) == 1.0
+    pacer.record(URL, 0.1)
+
+    assert interval(pacer) == pytest.approx(0.8)
+    # The streak starts over after every change
+    pacer.record(URL, 0.1)
+    assert interval(pacer) == pytest.approx(0.8)
+
+
+def test_interval_stays_within_bounds():
+    pacer = controller(rate=1.0, max_rate=2.0, max_interval=5.0, speedup_after=1)
+
+    for _ in range(20):
+        pacer.record(URL, 0.1)
+    assert interval(pacer) == 0.5
+
+    for _ in range(10):
+        pacer.record(URL, outcome="blocked")
+    assert interval(pacer) == 5.0
+
+
+def test_max_rate_defaults_to_four_times_the_starting_rate():
+    pacer = controller(rate=1.0, speedup_after=1)
+
+    for _ in range(20):
+        pacer.record(URL, 0.1)
+
+    assert interval(pacer) == 0.25
+
+
+def test_hosts_are_paced_separately():
+    pacer = controller(rate=1.0)
+
+    pacer.record("https://api.elsevier.com/content/search/scopus", outcome="blocked")
+
+    assert interval(pacer) == 1.0
+    assert pacer.hosts["api.elsevier.com"].interval == 2.0
+
+
+def test_dwells_shrink_with_the_interval():
+    pacer = controller(rate=1.0, speedup_after=1)
+    assert pacer.dwell_scale(URL) == 1.0
+
+    pacer.record(URL, 0.1)
+
+    assert pacer.dwell_scale(URL) == pytest.approx(0.8)
+    assert pacer.dwell_scale() == 1.0
+
+
+def test_interval_changes_are_logged(tmp_path):
+    log = tmp_path / "pacing.jsonl"
+    pacer = controller(rate=1.0, log_path=str(log))
+
+    pacer.record(URL, outcome="blocked")
+    pacer.record(URL, 0.5, outcome="error")
+
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [(e["host"], e["reason"], e["old_interval"], e["interval"]) for e in entries] == [
+        ("scholar.google.com", "blocked", 1.0, 2.0),
+        ("scholar.google.com", "error", 2.0, 3.0),
+    ]
+
+
+def test_wait_spends_one_token_per_request():
+    pacer = controller(rate=20.0)
+
+    async def main():
+        start = time.monotonic()
+        for _ in range(3):
+            await pacer.wait(URL)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+
+    # The first token is in the bucket, the next two take an interval (0.05 s) each
+    assert 0.09 <= elapsed < 0.5
+    assert pacer.hosts["scholar.google.com"].requests == 3
+
+
+def test_zero_rate_disables_pacing():
+    pacer = controller(rate=0)
+
+    pacer.record(URL, outcome="blocked")
+
+    assert interval(pacer) == 0.0
+    asyncio.run(pacer.wait(URL))
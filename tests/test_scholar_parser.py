@@ -0,0 +1,73 @@
+from scholar_parser import AuthorCandidate, ProfileRow, parse_author_search, parse_profile_rows, \
+    parse_publication_abstract
+
+
+def test_parse_profile_rows(fixture_text):
+    rows = parse_profile_rows(fixture_text("profile_page.html"))
+
+    assert rows == [
+        ProfileRow(
+            title="Deep learning for protein structure prediction",
+            href="/citations?view_op=view_citation&hl=en&user=JD0e8AAAAAJ&citation_for_view=JD0e8AAAAAJ:u5HHmVD_uO8C",
+            year=2020,
+            citations=1234,
+        ),
+        ProfileRow(
+            title="COVID-19 & the C++ toolchain",
+            href="/citations?view_op=view_citation&hl=en&user=JD0e8AAAAAJ&citation_for_view=JD0e8AAAAAJ:d1gkVwhDpl0C",
+            year=2021,
+            citations=42,
+        ),
+        ProfileRow(
+            title="An uncited workshop note",
+            href="/citations?view_op=view_citation&hl=en&user=JD0e8AAAAAJ&citation_for_view=JD0e8AAAAAJ:9yKSN-GCB0IC",
+            year=None,
+            citations=0,
+        ),
+    ]
+
+
+def test_parse_profile_rows_without_publications(fixture_text):
+    assert parse_profile_rows(fixture_text("profile_page_empty.html")) == []
+    assert parse_profile_rows(fixture_text("captcha_page.html")) == []
+
+
+def test_parse_author_search(fixture_text):
+    candidates = parse_author_search(fixture_text("author_search.html"))
+
+    assert candidates == [
+        AuthorCandidate(
+            name="Jane Doe",
+            href="/citations?hl=en&user=JD0e8AAAAAJ",
+            affiliation="Professor of Computer Science, Example University",
+            cited_by=12345,
+            interests=["Machine Learning", "Bioinformatics"],
+        ),
+        AuthorCandidate(
+            name="J. Doe",
+            href="/citations?hl=en&user=JDoe2xAAAAJ",
+            affiliation="Other Institute",
+            cited_by=0,
+            interests=[],
+        ),
+    ]
+
+
+def test_parse_publication_abstract(fixture_text):
+    abstract = parse_publication_abstract(fixture_text("publication_page.html"))
+
+    assert abstract == (
+        "We present a deep learning method that predicts protein structures "
+        "from sequence alone & reaches near-experimental accuracy."
+    )
+
+
+def test_parse_publication_abstract_from_description_field(fixture_text):
+    abstract = parse_publication_abstract(fixture_text("publication_page_description.html"))
+
+    assert abstract == "A short description that is only found in the details table."
+
+
+def test_parse_publication_abstract_missing(fixture_text):
+    assert parse_publication_abstract(fixture_text("publication_page_no_abstract.html")) is None
+    assert parse_publication_abstract(fixture_text("captcha_page.html")) is None
@@ -0,0 +1,50 @@
+import argparse
+import json
+import os
+import time
+
+from sharded_scrape import progress_path, run_shards
+
+
+def worker(shard_id, entries, args):
+    """Stand-in for scrape_shard: logs its entries; the shard holding "bad" kills its process"""
+    with open(os.path.join(args.state_dir, "calls.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entries) + "\n")
+    if "bad" in entries:
+        time.sleep(0.2)
+        os._exit(1)
+    time.sleep(0.5)
+    return {entry: f"key:{entry}" for entry in entries}, [], len(entries)
+
+
+def shard_args(tmp_path, **kwargs):
+    kwargs = {"state_dir": str(tmp_path), "resume": False, "shard_size": 1, "workers": 3, "max_attempts": 2,
+              **kwargs}
+    return argparse.Namespace(**kwargs)
+
+
+def calls(tmp_path):
+    with open(tmp_path / "calls.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_crashed_shard_is_requeued_without_charging_co_running_shards(tmp_path):
+    progress = run_shards(["a", "b", "bad", "c", "d"], shard_args(tmp_path), worker=worker)
+
+    status = {entry: (s["status"], s["attempts"]) for entry, s in progress.entries.items()}
+    assert status == {"a": ("done", 1), "b": ("done", 1), "bad": ("failed", 2), "c": ("done", 1), "d": ("done", 1)}
+    assert progress.entries["bad"]["error"] == "worker process died"
+    # Tried with the first workers, alone as a suspect and as its charged retry (which may crash co-running
+    # shards again and be rerun as a suspect once more)
+    assert calls(tmp_path).count(["bad"]) >= 3
+    with open(progress_path(str(tmp_path)), encoding="utf-8") as f:
+        assert json.load(f)["entries"]["a"] == {"status": "done", "attempts": 1, "key": "key:a", "error": None}
+
+
+def test_resume_skips_finished_authors(tmp_path):
+    run_shards(["a", "b"], shard_args(tmp_path, workers=1, shard_size=2), worker=worker)
+
+    progress = run_shards(["a", "b", "c"], shard_args(tmp_path, workers=1, resume=True), worker=worker)
+
+    assert calls(tmp_path) == [["a", "b"], ["c"]]
+    assert {entry: s["key"] for entry, s in progress.entries.items()} == {"a": "key:a", "b": "key:b", "c": "key:c"}
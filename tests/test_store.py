@@ -0,0 +1,72 @@
+import pytest
+
+from models import Author, Publication
+from store import PublicationStore
+
+
+LINK = "https://scholar.google.com/citations?user=U"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PublicationStore(str(tmp_path / "publications.sqlite3"))
+    yield store
+    store.close()
+
+
+def author(*publications):
+    return Author("Ann Lee", LINK, None, list(publications))
+
+
+def paper(i, citations=0, abstract=None):
+    return Publication(f"Paper number {i}", 2020, citations, abstract, f"/c?citation_for_view=U:{i}")
+
+
+def fts_updates(store):
+    """Count the row updates that fire the FTS update trigger from now on"""
+    store.conn.executescript(
+        """CREATE TEMP TABLE IF NOT EXISTS fts_updates (n INTEGER);
+        CREATE TEMP TRIGGER IF NOT EXISTS count_fts_updates AFTER UPDATE OF title, abstract ON publications
+        BEGIN INSERT INTO fts_updates VALUES (1); END;"""
+    )
+    return lambda: store.conn.execute("SELECT COUNT(*) FROM fts_updates").fetchone()[0]
+
+
+def test_resaving_unchanged_publications_does_not_reindex_them(store):
+    store.save_author(author(paper(1, 5, "An abstract"), paper(2, 7)))
+    count = fts_updates(store)
+
+    store.save_author(author(paper(1, 6, "An abstract"), paper(2, 9)))
+
+    assert count() == 0
+    assert [pub.citations for pub in store.publications("U")] == [6, 9]
+
+
+def test_changed_abstract_is_reindexed(store):
+    store.save_author(author(paper(1, 5, "An abstract about graphs")))
+    count = fts_updates(store)
+
+    store.save_author(author(paper(1, 5, "An abstract about proteins")))
+
+    assert count() == 1
+    assert store.publications("U")[0].abstract == "An abstract about proteins"
+    assert store.query_publications(search="proteins")[0] == 1
+    assert store.query_publications(search="graphs")[0] == 0
+
+
+def test_publications_missing_from_a_complete_listing_are_removed(store):
+    store.save_author(author(paper(1, 5), paper(2, 7)))
+
+    store.save_author(author(paper(1, 5)))
+
+    assert [pub.title for pub in store.publications("U")] == ["Paper number 1"]
+    assert store.conn.execute("SELECT COUNT(*) FROM citation_series").fetchone()[0] == 1
+
+
+def test_truncated_listing_keeps_publications_and_their_history(store):
+    store.save_author(author(paper(1, 5), paper(2, 7)))
+
+    store.save_author(author(paper(1, 6)), complete=False)
+
+    assert [pub.title for pub in store.publications("U")] == ["Paper number 1", "Paper number 2"]
+    assert store.conn.execute("SELECT COUNT(*) FROM citation_series").fetchone()[0] == 2
@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from models import Author, Publication
+from store import PublicationStore, fts_phrase_query
+
+
+TITLES = [
+    "COVID-19 and deep-learning",
+    "A C++ library for e.g. sparse matrices",
+    "Essays in honour of O'Brien",
+    "Rock AND roll",
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PublicationStore(str(tmp_path / "publications.sqlite3"))
+    author = Author("Jane Doe", "https://scholar.google.com/citations?user=JD0e8AAAAAJ", None,
+                    [Publication(title, 2020) for title in TITLES])
+    store.save_author(author)
+    yield store
+    store.close()
+
+
+def titles(store, search, **kwargs):
+    return [pub.title for pub in store.query_publications(search=search, **kwargs)[1]]
+
+
+def test_fts_phrase_query_quotes_every_term():
+    assert fts_phrase_query('covid-19 say "hi + ') == '"covid-19" "say" """hi"'
+
+
+@pytest.mark.parametrize("search, expected", [
+    ("covid-19", [TITLES[0]]),
+    ("deep-learning", [TITLES[0]]),
+    ("C++", [TITLES[1]]),
+    ("e.g.", [TITLES[1]]),
+    ("O'Brien", [TITLES[2]]),
+    ("AND", [TITLES[0], TITLES[3]]),
+    ("covid learning", [TITLES[0]]),
+])
+def test_search_text_is_not_parsed_as_fts_syntax(store, search, expected):
+    assert sorted(titles(store, search)) == sorted(expected)
+
+
+def test_raw_search_accepts_fts_syntax(store):
+    assert sorted(titles(store, "covid OR rock", raw_search=True)) == [TITLES[0], TITLES[3]]
+    with pytest.raises(sqlite3.OperationalError):
+        titles(store, "covid-19", raw_search=True)